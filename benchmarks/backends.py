@@ -0,0 +1,231 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" Calls and Events through each of wampy's async backends.
+
+    $ python -m benchmarks.backends
+
+Starts the stand-in Router of ``benchmarks.router``, then benchmarks
+gevent, eventlet, asyncio and asyncio on uvloop in turn, each in a
+process of its own, as the backend is chosen (and monkey-patched) when
+wampy is imported. Reports the p50/p99 round trip time of sequential
+Calls to an echo Callee, and how many Events a second get from a
+Publisher through to a Subscriber. uvloop is skipped unless installed,
+e.g. with ``pip install wampy[uvloop]``. Pass ``--url`` to use another
+Router instead, such as Crossbar.io.
+
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from wampy.peers.clients import AsyncClient, Client
+from wampy.roles.callee import callee
+from wampy.roles.subscriber import subscribe
+
+BACKENDS = ['gevent', 'eventlet', 'asyncio', 'asyncio+uvloop']
+
+TOPIC = 'benchmarks.events'
+WARM_UP_CALLS = 100
+TIMEOUT = 60
+
+
+class EchoService(Client):
+
+    @callee
+    def echo(self, message):
+        return message
+
+
+class EventCounter(Client):
+
+    received = 0
+
+    @subscribe(topic=TOPIC)
+    def count(self, *args, **kwargs):
+        self.received += 1
+
+
+class AsyncEchoService(AsyncClient):
+
+    @callee
+    def echo(self, message):
+        return message
+
+
+def percentile(ordered, percent):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def results(latencies, events, events_seconds):
+    latencies.sort()
+    return {
+        'p50': percentile(latencies, 50) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'calls/s': len(latencies) / sum(latencies),
+        'events/s': events / events_seconds,
+    }
+
+
+def run_green(url, calls, events):
+    from wampy.backends import async_adapter
+    from wampy.testing.helpers import (
+        wait_for_registrations, wait_for_subscriptions,
+    )
+
+    with EchoService(url=url) as service, Client(url=url) as client:
+        wait_for_registrations(service, 1)
+
+        latencies = []
+        for i in range(WARM_UP_CALLS + calls):
+            started_at = time.perf_counter()
+            client.rpc.echo(message=i)
+            latencies.append(time.perf_counter() - started_at)
+
+        with EventCounter(url=url) as counter:
+            wait_for_subscriptions(counter, 1)
+
+            started_at = time.perf_counter()
+            for i in range(events):
+                client.publish(topic=TOPIC, message=i)
+
+            with async_adapter.Timeout(TIMEOUT):
+                while counter.received < events:
+                    async_adapter.sleep(0.001)
+            events_seconds = time.perf_counter() - started_at
+
+    return results(latencies[WARM_UP_CALLS:], events, events_seconds)
+
+
+async def run_asyncio(url, calls, events):
+    async with AsyncEchoService(url=url), AsyncClient(url=url) as client:
+        latencies = []
+        for i in range(WARM_UP_CALLS + calls):
+            started_at = time.perf_counter()
+            await client.rpc.echo(message=i)
+            latencies.append(time.perf_counter() - started_at)
+
+        async with AsyncClient(url=url) as counter:
+            subscription = await counter.subscribe(TOPIC)
+
+            async def count():
+                received = 0
+                async for _ in subscription:
+                    received += 1
+                    if received == events:
+                        return
+
+            counting = asyncio.ensure_future(count())
+
+            started_at = time.perf_counter()
+            for i in range(events):
+                await client.publish(topic=TOPIC, message=i)
+
+            await asyncio.wait_for(counting, TIMEOUT)
+            events_seconds = time.perf_counter() - started_at
+
+    return results(latencies[WARM_UP_CALLS:], events, events_seconds)
+
+
+def run_worker(backend, url, calls, events):
+    if backend in ('gevent', 'eventlet'):
+        return run_green(url, calls, events)
+
+    if backend == 'asyncio':
+        return asyncio.run(run_asyncio(url, calls, events))
+
+    try:
+        import uvloop
+    except ImportError:
+        return {'error': 'uvloop is not installed'}
+
+    return uvloop.run(run_asyncio(url, calls, events))
+
+
+def run_backend(backend, url, calls, events):
+    # the backend is chosen when wampy is imported, so a fresh process
+    env = dict(os.environ, WAMPY_ASYNC_NAME=backend.split('+')[0])
+    worker = subprocess.run(
+        [
+            sys.executable, '-m', 'benchmarks.backends', '--worker', backend,
+            '--url', url, '--calls', str(calls), '--events', str(events),
+        ],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    if worker.returncode != 0:
+        return {'error': worker.stderr.strip().splitlines()[-1]}
+
+    return json.loads(worker.stdout.strip().splitlines()[-1])
+
+
+def wait_for_router(host, port):
+    deadline = time.time() + 10
+    while True:
+        try:
+            socket.create_connection((host, port)).close()
+            return
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def compare(url, calls, events):
+    print('{:<16}{:>10}{:>10}{:>10}{:>10}'.format(
+        'backend', 'p50 ms', 'p99 ms', 'calls/s', 'events/s',
+    ))
+    for backend in BACKENDS:
+        result = run_backend(backend, url, calls, events)
+        if 'error' in result:
+            print('{:<16}{}'.format(backend, result['error']))
+            continue
+
+        print('{:<16}{:>10.3f}{:>10.3f}{:>10.0f}{:>10.0f}'.format(
+            backend, result['p50'], result['p99'], result['calls/s'],
+            result['events/s'],
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--worker', choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(
+            run_worker(args.worker, args.url, args.calls, args.events)
+        ))
+        return
+
+    if args.url:
+        compare(args.url, args.calls, args.events)
+        return
+
+    router = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.router', '--port', str(args.port)],
+        env=dict(os.environ, WAMPY_ASYNC_NAME='asyncio'),
+    )
+    try:
+        wait_for_router('localhost', args.port)
+        compare(
+            'ws://localhost:{}'.format(args.port), args.calls, args.events,
+        )
+    finally:
+        router.terminate()
+        router.wait()
+
+
+if __name__ == '__main__':
+    main()
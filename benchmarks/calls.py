@@ -0,0 +1,116 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" CPU burnt by idle Clients, and the latency of Calls.
+
+    $ crossbar start --config ./wampy/testing/configs/crossbar.json
+    $ python -m benchmarks.calls
+
+Connects a Caller and a Callee to the Router, then reports the CPU the
+process uses whilst both sit idle, then whilst the Caller waits on a
+slow Call, and the p50/p99 round trip time of sequential Calls between
+them. Pass ``--start-router`` to have wampy start (and stop) Crossbar.io
+itself.
+
+"""
+import argparse
+import resource
+import time
+
+from wampy.backends import async_adapter
+from wampy.peers.clients import Client
+from wampy.peers.routers import Crossbar
+from wampy.roles.callee import callee
+from wampy.testing.helpers import wait_for_registrations
+
+CONFIG_PATH = './wampy/testing/configs/crossbar.json'
+
+
+class EchoService(Client):
+
+    @callee
+    def echo(self, message):
+        return message
+
+    @callee
+    def sleep(self, seconds):
+        async_adapter.sleep(seconds)
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def cpu_percent(fn, *args, **kwargs):
+    wall_started_at = time.perf_counter()
+    cpu_started_at = cpu_seconds()
+
+    fn(*args, **kwargs)
+
+    cpu = cpu_seconds() - cpu_started_at
+    return 100 * cpu / (time.perf_counter() - wall_started_at)
+
+
+def call_latencies(client, calls):
+    latencies = []
+    for i in range(calls):
+        started_at = time.perf_counter()
+        client.rpc.echo(message=i)
+        latencies.append(time.perf_counter() - started_at)
+
+    return sorted(latencies)
+
+
+def percentile(ordered, percent):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def run(url, calls, idle_seconds):
+    with EchoService(url=url) as service:
+        wait_for_registrations(service, 2)
+
+        with Client(url=url, call_timeout=idle_seconds + 5) as client:
+            print('idle CPU: {:.1f}%'.format(
+                cpu_percent(async_adapter.sleep, idle_seconds)
+            ))
+            print('waiting on a Call CPU: {:.1f}%'.format(
+                cpu_percent(client.rpc.sleep, seconds=idle_seconds)
+            ))
+
+            # warm up, e.g. the Router's routing tables
+            call_latencies(client, 100)
+            latencies = call_latencies(client, calls)
+
+    print('{} calls: p50 {:.3f} ms, p99 {:.3f} ms'.format(
+        calls,
+        percentile(latencies, 50) * 1000,
+        percentile(latencies, 99) * 1000,
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', default='ws://localhost:8080')
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--idle-seconds', type=float, default=5)
+    parser.add_argument('--start-router', action='store_true')
+    args = parser.parse_args()
+
+    if not args.start_router:
+        run(args.url, args.calls, args.idle_seconds)
+        return
+
+    crossbar = Crossbar(
+        url=args.url, config_path=CONFIG_PATH, crossbar_directory='./',
+    )
+    crossbar.start()
+    try:
+        run(args.url, args.calls, args.idle_seconds)
+    finally:
+        crossbar.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" Throughput of WebSocket payload masking.
+
+    $ python -m benchmarks.masking
+
+Reports MB/s for the byte-by-byte loop wampy used to use, the pure
+Python path of ``FrameFactory.generate_mask`` and, when installed, the
+``wsaccel`` extension.
+
+"""
+import array
+import os
+import timeit
+from unittest.mock import patch
+
+from wampy.transports.websocket import frames
+from wampy.transports.websocket.frames import FrameFactory
+
+SIZES = [
+    ('1 KiB', 1024),
+    ('64 KiB', 64 * 1024),
+    ('8 MiB', 8 * 1024 * 1024),
+]
+
+# don't spend all day on the slow loop with the big payloads
+MIN_SECONDS = 0.5
+
+
+def loop_mask(mask_key, data):
+    _m = array.array("B", mask_key)
+    _d = array.array("B", data)
+
+    for i in range(len(_d)):
+        _d[i] ^= _m[i % 4]
+
+    return _d.tobytes()
+
+
+def int_mask(mask_key, data):
+    with patch.object(frames, 'XorMaskerSimple', None):
+        return FrameFactory.generate_mask(mask_key, data)
+
+
+def megabytes_per_second(fn, size):
+    mask_key = os.urandom(4)
+    data = os.urandom(size)
+
+    timer = timeit.Timer(lambda: fn(mask_key, data))
+    number, elapsed = timer.autorange()
+    while elapsed < MIN_SECONDS and number < 1000:
+        number *= 2
+        elapsed = timer.timeit(number)
+
+    return size * number / elapsed / 1e6
+
+
+def main():
+    implementations = [
+        ('per-byte loop', loop_mask),
+        ('int XOR', int_mask),
+    ]
+    if frames.XorMaskerSimple is not None:
+        implementations.append(('wsaccel', FrameFactory.generate_mask))
+
+    print('{:<16}'.format('MB/s') + ''.join(
+        '{:>12}'.format(label) for label, _ in SIZES
+    ))
+    for name, fn in implementations:
+        print('{:<16}'.format(name) + ''.join(
+            '{:>12.1f}'.format(megabytes_per_second(fn, size))
+            for _, size in SIZES
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" Throughput of incoming messages through the ``MessageHandler``.
+
+    $ python -m benchmarks.messages
+
+Reports messages/s for EVENT, RESULT and INVOCATION payloads handed to
+``MessageHandler.handle_message``, as the bytes of a frame, next to
+that of only deserializing them - the floor beneath it - with and
+without first decoding them to ``str``. No Router is needed: the
+Subscriber, Caller and Callee at the other end do nothing, so that only
+wampy's own handling of the messages is measured.
+
+"""
+import timeit
+
+from wampy.backends import async_adapter
+from wampy.message_handler import MessageHandler
+from wampy.roles.subscriber import subscribe
+from wampy.serializers import JsonSerializer
+from wampy.session import Session
+
+MIN_SECONDS = 1
+
+SUBSCRIPTION_ID = 1
+REGISTRATION_ID = 2
+REQUEST_ID = 3
+
+SERIALIZER = JsonSerializer()
+
+# as handed over by the ``Session``, i.e. a view over the receive buffer
+PAYLOADS = [
+    ('EVENT', memoryview(SERIALIZER.serialize(
+        [36, SUBSCRIPTION_ID, 4, {}, [], {'message': 'spam'}]
+    ))),
+    ('RESULT', memoryview(SERIALIZER.serialize(
+        [50, REQUEST_ID, {}, ['spam'], {'message': 'spam'}]
+    ))),
+    ('INVOCATION', memoryview(SERIALIZER.serialize(
+        [68, REQUEST_ID, REGISTRATION_ID, {}, [], {'message': 'spam'}]
+    ))),
+]
+
+
+class NullDispatcher(object):
+
+    def dispatch(self, *args):
+        pass
+
+
+class NullExecutor(object):
+
+    def submit(self, *args):
+        pass
+
+
+class BenchmarkSession(object):
+    # only what the ``MessageHandler`` needs of a ``Session``, which
+    # would otherwise connect to a Router
+
+    gather_result = Session.gather_result
+    resolve_request = Session.resolve_request
+
+    def __init__(self):
+        self.subscription_map = {}
+        self.registration_map = {}
+        self._pending_requests = {}
+        self._partial_results = {}
+
+
+class BenchmarkClient(object):
+
+    def __init__(self):
+        self._session = BenchmarkSession()
+        self.event_dispatcher = NullDispatcher()
+        self.invocation_executor = NullExecutor()
+        self.procedure_executors = {}
+        self.serializer = SERIALIZER
+
+    @subscribe(topic="foo")
+    def foo_handler(self, message, meta):
+        pass
+
+    def echo(self, message):
+        return message
+
+
+def make_message_handler():
+    client = BenchmarkClient()
+
+    session = client._session
+    session.subscription_map[SUBSCRIPTION_ID] = client.foo_handler, 'foo'
+    session.registration_map[REGISTRATION_ID] = 'echo'
+    # a Call that is forever waiting on its RESULT
+    session._pending_requests[REQUEST_ID] = async_adapter.Future()
+
+    return MessageHandler(client)
+
+
+def decode_then_deserialize(payload):
+    return SERIALIZER.deserialize(str(payload, 'utf-8'))
+
+
+def messages_per_second(fn, payload):
+    timer = timeit.Timer(lambda: fn(payload))
+    number, elapsed = timer.autorange()
+    while elapsed < MIN_SECONDS:
+        number *= 2
+        elapsed = timer.timeit(number)
+
+    return number / elapsed
+
+
+def main():
+    message_handler = make_message_handler()
+    implementations = [
+        ('decode, loads', decode_then_deserialize),
+        ('loads', SERIALIZER.deserialize),
+        ('handle_message', message_handler.handle_message),
+    ]
+
+    print('{:<16}'.format('messages/s') + ''.join(
+        '{:>12}'.format(label) for label, _ in PAYLOADS
+    ))
+    for name, fn in implementations:
+        print('{:<16}'.format(name) + ''.join(
+            '{:>12.0f}'.format(messages_per_second(fn, payload))
+            for _, payload in PAYLOADS
+        ))
+
+
+if __name__ == '__main__':
+    main()
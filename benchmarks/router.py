@@ -0,0 +1,246 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" A stand-in WAMP Router, with just enough of one for the benchmarks.
+
+    $ python -m benchmarks.router --port 8090
+
+Talks WAMP over JSON WebSockets, and welcomes any Client into whatever
+realm it asks for. Calls go to the last Callee to register the
+procedure, and Events to every Subscriber but the Publisher. Nothing is
+authenticated and little is checked: the point is for the benchmarks to
+measure the Clients rather than a Router. That is why it runs in a
+process of its own, on the standard asyncio event loop.
+
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import logging
+from struct import unpack
+
+from wampy.transports.websocket.frames import Frame, FrameFactory
+
+logger = logging.getLogger('benchmarks.router')
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+HELLO, WELCOME, GOODBYE, ERROR = 1, 2, 6, 8
+PUBLISH, PUBLISHED = 16, 17
+SUBSCRIBE, SUBSCRIBED, UNSUBSCRIBE, UNSUBSCRIBED, EVENT = 32, 33, 34, 35, 36
+CALL, RESULT = 48, 50
+REGISTER, REGISTERED, INVOCATION, YIELD = 64, 65, 68, 70
+
+
+class Peer(object):
+
+    def __init__(self, router, reader, writer):
+        self.router = router
+        self.reader = reader
+        self.writer = writer
+        self.session_id = next(router.ids)
+
+    def send(self, message):
+        self.send_frame(json.dumps(message).encode('utf-8'))
+
+    def send_frame(self, payload, opcode=Frame.OPCODE_TEXT):
+        self.writer.write(FrameFactory.generate_bytes(
+            payload=payload, fin_bit=1, opcode=opcode, mask_payload=False,
+        ))
+
+    async def handshake(self):
+        request = await self.reader.readuntil(b'\r\n\r\n')
+        headers = {}
+        for line in request.decode().split('\r\n')[1:]:
+            if ': ' in line:
+                name, value = line.split(': ', 1)
+                headers[name.lower()] = value
+
+        key = headers['sec-websocket-key'] + WEBSOCKET_GUID
+        accept = base64.b64encode(
+            hashlib.sha1(key.encode()).digest()
+        ).decode()
+
+        self.writer.write((
+            'HTTP/1.1 101 Switching Protocols\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            'Sec-WebSocket-Accept: {}\r\n'
+            'Sec-WebSocket-Protocol: {}\r\n\r\n'
+        ).format(accept, headers['sec-websocket-protocol']).encode())
+
+    async def receive(self):
+        """ Return the opcode and payload of the next frame. Frames from
+        Clients are always masked, and never fragmented by these ones.
+        """
+        first_byte, second_byte = await self.reader.readexactly(2)
+
+        length = second_byte & 0x7f
+        if length == 126:
+            length, = unpack('!H', await self.reader.readexactly(2))
+        elif length == 127:
+            length, = unpack('!Q', await self.reader.readexactly(8))
+
+        mask_key = await self.reader.readexactly(4)
+        payload = await self.reader.readexactly(length)
+
+        return (
+            first_byte & 0xf, FrameFactory.generate_mask(mask_key, payload),
+        )
+
+    async def serve(self):
+        await self.handshake()
+
+        while True:
+            opcode, payload = await self.receive()
+
+            if opcode == Frame.OPCODE_PING:
+                self.send_frame(payload, opcode=Frame.OPCODE_PONG)
+            elif opcode == Frame.OPCODE_CLOSE:
+                self.send_frame(payload, opcode=Frame.OPCODE_CLOSE)
+                return
+            elif opcode == Frame.OPCODE_TEXT:
+                message = json.loads(payload)
+                if message[0] == GOODBYE:
+                    self.send([GOODBYE, {}, 'wamp.close.goodbye_and_out'])
+                    return
+
+                self.router.route(self, message)
+
+
+class Router(object):
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        # procedure: (Callee, registration ID)
+        self.registrations = {}
+        # topic: subscription ID, and the Subscribers to it
+        self.subscription_ids = {}
+        self.subscribers = {}
+        # invocation request ID: (Caller, call request ID)
+        self.calls = {}
+
+    async def serve(self, reader, writer):
+        peer = Peer(self, reader, writer)
+        try:
+            await peer.serve()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.forget(peer)
+            writer.close()
+
+    def forget(self, peer):
+        for procedure, (callee, _) in list(self.registrations.items()):
+            if callee is peer:
+                del self.registrations[procedure]
+        for subscribers in self.subscribers.values():
+            subscribers.discard(peer)
+
+    def route(self, peer, message):
+        code = message[0]
+
+        if code == HELLO:
+            peer.send([WELCOME, peer.session_id, {
+                'roles': {'broker': {}, 'dealer': {}},
+            }])
+
+        elif code == REGISTER:
+            _, request_id, _, procedure = message
+            registration_id = next(self.ids)
+            self.registrations[procedure] = peer, registration_id
+            peer.send([REGISTERED, request_id, registration_id])
+
+        elif code == CALL:
+            _, request_id, options, procedure, *arguments = message
+            if procedure not in self.registrations:
+                peer.send([
+                    ERROR, CALL, request_id, {},
+                    'wamp.error.no_such_procedure',
+                ])
+                return
+
+            callee, registration_id = self.registrations[procedure]
+            details = {}
+            if options.get('receive_progress'):
+                details['receive_progress'] = True
+
+            invocation_id = next(self.ids)
+            self.calls[invocation_id] = peer, request_id
+            callee.send(
+                [INVOCATION, invocation_id, registration_id, details] +
+                arguments
+            )
+
+        elif code == YIELD:
+            _, invocation_id, options, *arguments = message
+            if options.get('progress'):
+                caller, request_id = self.calls[invocation_id]
+                details = {'progress': True}
+            else:
+                caller, request_id = self.calls.pop(invocation_id)
+                details = {}
+            caller.send([RESULT, request_id, details] + arguments)
+
+        elif code == ERROR and message[1] == INVOCATION:
+            _, _, invocation_id, details, error, *arguments = message
+            caller, request_id = self.calls.pop(invocation_id)
+            caller.send([ERROR, CALL, request_id, details, error] + arguments)
+
+        elif code == SUBSCRIBE:
+            _, request_id, _, topic = message
+            subscription_id = self.subscription_ids.setdefault(
+                topic, next(self.ids),
+            )
+            self.subscribers.setdefault(topic, set()).add(peer)
+            peer.send([SUBSCRIBED, request_id, subscription_id])
+
+        elif code == UNSUBSCRIBE:
+            _, request_id, subscription_id = message
+            for topic, subscribers in self.subscribers.items():
+                if self.subscription_ids[topic] == subscription_id:
+                    subscribers.discard(peer)
+            peer.send([UNSUBSCRIBED, request_id])
+
+        elif code == PUBLISH:
+            _, request_id, options, topic, *arguments = message
+            publication_id = next(self.ids)
+            event = [
+                EVENT, self.subscription_ids.get(topic), publication_id, {},
+            ] + arguments
+
+            for subscriber in self.subscribers.get(topic, ()):
+                if subscriber is not peer:
+                    subscriber.send(event)
+
+            if options.get('acknowledge'):
+                peer.send([PUBLISHED, request_id, publication_id])
+
+        else:
+            logger.warning('not routing %s', message)
+
+
+async def serve(host, port):
+    server = await asyncio.start_server(Router().serve, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8090)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
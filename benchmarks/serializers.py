@@ -0,0 +1,92 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" Speed and size of the serializers on typical WAMP messages.
+
+    $ python -m benchmarks.serializers
+
+Reports thousands of messages/s serialized and deserialized, and the
+payload size in bytes, for each installed JSON backend as well as
+MessagePack and CBOR.
+
+"""
+import timeit
+
+from wampy.errors import WampyError
+from wampy.serializers import (
+    CborSerializer, JSON_BACKENDS, JsonSerializer, MsgPackSerializer,
+)
+
+MIN_SECONDS = 0.5
+
+MESSAGES = [
+    ('CALL', [
+        48, 7814135, {}, 'com.example.get_user',
+        [], {'user_id': 1234, 'fields': ['name', 'email', 'last_seen']},
+    ]),
+    ('EVENT', [
+        36, 5512315355, 4429313566, {}, [], {
+            'message': {
+                'sensor': 'boiler-3', 'temperature': 63.25,
+                'pressure': 1.402, 'ok': True, 'tags': ['house', 'heating'],
+            },
+            'meta': {'topic': 'com.example.readings'},
+        },
+    ]),
+    ('RESULT', [
+        50, 7814135, {}, [[
+            {'id': i, 'name': 'user {}'.format(i), 'score': i * 1.5}
+            for i in range(100)
+        ]], {},
+    ]),
+]
+
+
+def serializers():
+    for backend in JSON_BACKENDS:
+        yield 'json ({})'.format(backend), JsonSerializer(backend=backend)
+
+    for name, serializer_cls in [
+        ('msgpack', MsgPackSerializer), ('cbor', CborSerializer),
+    ]:
+        try:
+            yield name, serializer_cls()
+        except WampyError:
+            # not installed
+            pass
+
+
+def thousands_per_second(fn, arg):
+    timer = timeit.Timer(lambda: fn(arg))
+    number, elapsed = timer.autorange()
+    while elapsed < MIN_SECONDS:
+        number *= 2
+        elapsed = timer.timeit(number)
+
+    return number / elapsed / 1000
+
+
+def main():
+    print('{:<20}'.format('k messages/s') + ''.join(
+        '{:>22}'.format(label) for label, _ in MESSAGES
+    ))
+    print('{:<20}'.format('') + ''.join(
+        '{:>8}{:>8}{:>6}'.format('dumps', 'loads', 'B')
+        for _ in MESSAGES
+    ))
+
+    for name, serializer in serializers():
+        row = '{:<20}'.format(name)
+        for _, message in MESSAGES:
+            payload = serializer.serialize(message)
+            row += '{:>8.0f}{:>8.0f}{:>6}'.format(
+                thousands_per_second(serializer.serialize, message),
+                thousands_per_second(serializer.deserialize, payload),
+                len(payload),
+            )
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
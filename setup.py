@@ -50,6 +50,18 @@ setup(
             "pytest>=4.0.2",
             "mock>=1.3.0",
         ],
+        'msgpack': [
+            "msgpack>=1.0.0",
+        ],
+        'cbor': [
+            "cbor2>=5.0.0",
+        ],
+        'fastjson': [
+            "orjson>=3.0.0",
+        ],
+        'uvloop': [
+            "uvloop>=0.18.0",
+        ],
         'docs': [
             "Sphinx==1.4.5",
             "guzzle_sphinx_theme",
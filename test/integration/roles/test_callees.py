@@ -0,0 +1,151 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import time
+
+import pytest
+
+from wampy.backends import get_async_adapter
+from wampy.errors import WampyError
+from wampy.executors import GreenExecutor, ProcessExecutor, ThreadExecutor
+from wampy.peers.clients import Client
+from wampy.roles.callee import callee
+from wampy.testing import wait_for_registrations
+
+
+class SlowAndFastService(Client):
+
+    @callee
+    def slow(self, seconds):
+        get_async_adapter().sleep(seconds)
+        return "slow"
+
+    @callee
+    def fast(self):
+        return "fast"
+
+    @callee
+    def get_pid(self):
+        return os.getpid()
+
+
+class LimitedService(Client):
+
+    @callee(max_concurrency=1, max_queued=1)
+    def heavy(self, seconds):
+        get_async_adapter().sleep(seconds)
+        return "heavy"
+
+    @callee(executor="process")
+    def get_pid(self):
+        return os.getpid()
+
+    @callee
+    def cheap(self):
+        return "cheap"
+
+
+@pytest.fixture
+def service_maker(router):
+    services = []
+
+    def maker(executor):
+        service = SlowAndFastService(
+            url=router.url, invocation_executor=executor,
+        )
+        service.start()
+        wait_for_registrations(service, 3)
+        services.append(service)
+        return service
+
+    yield maker
+
+    for service in services:
+        service.stop()
+        # which, as the executor was given to it, is left running
+        service.invocation_executor.shutdown()
+
+
+@pytest.mark.parametrize("executor_cls", [GreenExecutor, ThreadExecutor])
+def test_slow_procedure_does_not_hold_up_others(
+    router, service_maker, executor_cls,
+):
+    service_maker(executor_cls())
+
+    with Client(url=router.url) as client:
+        slow_call = client.rpc.async_.slow(seconds=1)
+        started_at = time.time()
+
+        assert client.rpc.fast() == "fast"
+        assert time.time() - started_at < 0.5
+
+        assert slow_call.get() == "slow"
+
+
+def test_max_concurrency(router, service_maker):
+    service_maker(GreenExecutor(max_concurrency=1))
+
+    with Client(url=router.url) as client:
+        started_at = time.time()
+        results = client.call_many([
+            ("slow", (), {"seconds": 0.5}),
+            ("slow", (), {"seconds": 0.5}),
+        ])
+        elapsed = time.time() - started_at
+
+    assert results == ["slow", "slow"]
+    # one at a time
+    assert elapsed >= 1
+
+
+def test_process_executor(router, service_maker):
+    service = service_maker(ProcessExecutor(max_workers=1))
+
+    with Client(url=router.url) as client:
+        callee_pid = client.rpc.get_pid()
+
+    assert callee_pid != os.getpid()
+    assert service.invocation_executor._pool is not None
+
+    # the executor may be shared with other Clients
+    service.stop()
+    assert service.invocation_executor._pool is not None
+
+
+@pytest.fixture
+def limited_service(router):
+    with LimitedService(url=router.url) as service:
+        wait_for_registrations(service, 3)
+        yield service
+
+
+def test_procedure_executors(limited_service):
+    executors = limited_service.procedure_executors
+
+    assert sorted(executors) == ["get_pid", "heavy"]
+    assert isinstance(executors["heavy"], GreenExecutor)
+    assert executors["heavy"].max_concurrency == 1
+    assert isinstance(executors["get_pid"], ProcessExecutor)
+
+
+def test_procedure_limits(router, limited_service):
+    with Client(url=router.url) as client:
+        running = client.rpc.async_.heavy(seconds=1)
+        queued = client.rpc.async_.heavy(seconds=0)
+        rejected = client.rpc.async_.heavy(seconds=0)
+
+        with pytest.raises(WampyError) as exc_info:
+            rejected.get()
+        assert "PROCEDURE_OVERLOADED" in str(exc_info.value)
+
+        # whilst other procedures are not held up
+        started_at = time.time()
+        assert client.rpc.cheap() == "cheap"
+        assert time.time() - started_at < 0.5
+
+        assert client.rpc.get_pid() != os.getpid()
+
+        assert running.get() == "heavy"
+        assert queued.get() == "heavy"
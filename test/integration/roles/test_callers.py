@@ -8,10 +8,11 @@ from datetime import date
 import pytest
 
 from wampy.backends import get_async_adapter
-from wampy.errors import WampyTimeOutError
+from wampy.errors import WampyError, WampyTimeOutError
 from wampy.peers.clients import Client
 from wampy.roles.callee import callee
 from wampy.testing import wait_for_registrations
+from wampy.testing.helpers import assert_stops_raising
 
 
 class DateService(Client):
@@ -43,6 +44,23 @@ class BinaryNumberService(Client):
         return result
 
 
+class RowService(Client):
+
+    @callee
+    def fetch_rows(self, count):
+        for i in range(count):
+            yield {'row': i}
+
+    @callee
+    def fetch_rows_then_fail(self, count):
+        yield from self.fetch_rows(count)
+        raise ValueError("no more rows")
+
+    @callee
+    def count_rows(self, count):
+        return count
+
+
 class ReallySlowService(Client):
 
     @callee
@@ -72,6 +90,13 @@ def binary_number_service(router):
         yield
 
 
+@pytest.fixture
+def row_service(router):
+    with RowService(url=router.url) as serv:
+        wait_for_registrations(serv, 3)
+        yield
+
+
 @pytest.fixture
 def really_slow_service(router):
     with ReallySlowService(url=router.url):
@@ -145,3 +170,168 @@ class TestCallerTimeout:
                 resp = None
 
         assert resp == reward
+
+
+class TestConcurrentCalls:
+
+    def test_responses_are_correlated_with_their_calls(
+        self, router, hello_service, really_slow_service,
+    ):
+        async_ = get_async_adapter()
+        results = {}
+
+        def call(key, procedure, *args, **kwargs):
+            results[key] = procedure(*args, **kwargs)
+
+        with Client(url=router.url) as client:
+            async_.spawn(
+                call, "slow", client.rpc.requires_patience, wait_in_seconds=1,
+            )
+            async_.sleep(0.1)
+            # these Results arrive while the slow Call is still in flight
+            for name in ["Alex", "Bo", "Cy"]:
+                async_.spawn(call, name, client.rpc.say_hello, name)
+
+            def all_returned():
+                assert len(results) == 4
+
+            assert_stops_raising(all_returned)
+
+        assert results == {
+            "slow": "$$$$",
+            "Alex": "Hello Alex",
+            "Bo": "Hello Bo",
+            "Cy": "Hello Cy",
+        }
+
+    def test_large_calls_from_many_green_threads(self, router, hello_service):
+        async_ = get_async_adapter()
+        # large enough that writing each Call blocks part way through
+        names = [letter * 2 * 1024 * 1024 for letter in "abcde"]
+        results = {}
+
+        def call(name):
+            results[name[0]] = client.rpc.say_hello(name)
+
+        with Client(url=router.url) as client:
+            for name in names:
+                async_.spawn(call, name)
+
+            def all_returned():
+                assert len(results) == len(names)
+
+            assert_stops_raising(all_returned)
+
+        assert results == {
+            name[0]: "Hello {}".format(name) for name in names
+        }
+
+
+class TestPipelinedCalls:
+
+    def test_call_async(self, router, hello_service):
+        with Client(url=router.url) as client:
+            pending_calls = [
+                client.call_async("say_hello", name)
+                for name in ["Alex", "Bo"]
+            ]
+            greeting = client.call_async(
+                "say_greeting", "Cy", greeting="hi",
+            )
+
+            assert [call.get() for call in pending_calls] == [
+                "Hello Alex", "Hello Bo",
+            ]
+            assert greeting.get() == "hi to Cy"
+            # the result is kept for as long as the PendingCall is
+            assert greeting.get() == "hi to Cy"
+
+            assert client.session._pending_requests == {}
+
+    def test_rpc_async(self, router, hello_service):
+        with Client(url=router.url) as client:
+            pending_call = client.rpc.async_.say_hello("Alex")
+            missing = client.rpc.async_.not_a_procedure()
+
+            assert pending_call.get() == "Hello Alex"
+            with pytest.raises(WampyError):
+                missing.get()
+
+    def test_call_many(self, router, hello_service, really_slow_service):
+        with Client(url=router.url) as client:
+            results = client.call_many([
+                ("say_hello", ("Alex", )),
+                ("say_greeting", ("Bo", ), {"greeting": "hi"}),
+                ("requires_patience", (), {"wait_in_seconds": 0.1}),
+            ])
+
+        assert results == ["Hello Alex", "hi to Bo", "$$$$"]
+
+    def test_pending_call_timeout(self, router, really_slow_service):
+        with Client(url=router.url) as client:
+            pending_call = client.rpc.async_.requires_patience(
+                wait_in_seconds=2,
+            )
+
+            with pytest.raises(WampyTimeOutError):
+                pending_call.get(timeout=0.5)
+
+            # the Call was cancelled so it is not waited on again
+            with pytest.raises(WampyTimeOutError):
+                pending_call.get()
+
+            assert client.session._pending_requests == {}
+
+
+class TestProgressiveResults:
+
+    def test_stream(self, router, row_service):
+        with Client(url=router.url) as client:
+            with client.rpc.fetch_rows.stream(count=1000) as rows:
+                assert list(rows) == [{'row': i} for i in range(1000)]
+
+            assert client.session._pending_requests == {}
+
+    def test_generator_without_progress(self, router, row_service):
+        with Client(url=router.url) as client:
+            rows = client.rpc.fetch_rows(count=3)
+
+        assert rows == [{'row': 0}, {'row': 1}, {'row': 2}]
+
+    def test_stream_without_progress(self, router, row_service):
+        # a Callee with only the one result
+        with Client(url=router.url) as client:
+            with client.rpc.count_rows.stream(count=3) as rows:
+                assert list(rows) == [3]
+
+    def test_stream_fails(self, router, row_service):
+        with Client(url=router.url) as client:
+            with client.rpc.fetch_rows_then_fail.stream(count=2) as rows:
+                assert next(rows) == {'row': 0}
+                assert next(rows) == {'row': 1}
+                with pytest.raises(WampyError):
+                    next(rows)
+
+                assert list(rows) == []
+
+    def test_stream_closed(self, router, row_service):
+        with Client(url=router.url) as client:
+            rows = client.rpc.fetch_rows.stream(count=1000)
+            assert next(rows) == {'row': 0}
+
+            rows.close()
+
+            assert list(rows) == []
+            assert client.session._pending_requests == {}
+            # and the Client carries on
+            assert client.rpc.count_rows(count=1) == 1
+
+    def test_stream_left_early(self, router, row_service):
+        with Client(url=router.url) as client:
+            with client.rpc.fetch_rows.stream(count=1000) as rows:
+                for row in rows:
+                    break
+
+            assert row == {'row': 0}
+            assert client.session._pending_requests == {}
+            assert client.rpc.count_rows(count=1) == 1
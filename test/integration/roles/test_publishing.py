@@ -6,9 +6,12 @@ import logging
 import pytest
 from mock import ANY
 
+from wampy.backends import get_async_adapter
 from wampy.errors import WampyError
 from wampy.peers.clients import Client
+from wampy.roles.callee import callee
 from wampy.roles.subscriber import subscribe
+from wampy.testing import wait_for_registrations, wait_for_subscriptions
 from wampy.testing.helpers import assert_stops_raising
 
 
@@ -93,6 +96,21 @@ def test_publish_kwargs_to_topic(foo_subscriber, router):
     client.stop()
 
 
+def test_publish_with_coalesced_writes(foo_subscriber, router):
+    client = Client(url=router.url, coalesce_writes=True)
+
+    with client:
+        for i in range(1000):
+            client.publish(topic="foo", message=i)
+
+        client.flush()
+
+        def check_call_count():
+            assert foo_subscriber.call_count == 1000
+
+        assert_stops_raising(check_call_count)
+
+
 def test_kwargs_are_received(router):
 
     class SubscribingClient(Client):
@@ -128,3 +146,61 @@ def test_kwargs_are_received(router):
                 }
 
             assert_stops_raising(check_kwargs)
+
+
+def test_slow_subscriber_does_not_hold_up_results(router):
+
+    class SlowSubscriberAndCallee(Client):
+        received = []
+
+        @subscribe(topic="foo")
+        def foo_topic_handler(self, message, meta):
+            get_async_adapter().sleep(0.1)
+            self.received.append(message)
+
+        @callee
+        def get_received(self):
+            return len(self.received)
+
+    with SlowSubscriberAndCallee(url=router.url) as slow_client:
+        wait_for_registrations(slow_client, 1)
+        wait_for_subscriptions(slow_client, 1)
+
+        with Client(url=router.url) as publisher:
+            for i in range(10):
+                publisher.publish(topic="foo", message=i)
+
+            # whilst the EVENTs are still being handled
+            assert publisher.rpc.get_received() < 10
+
+            def check_received():
+                assert slow_client.received == list(range(10))
+
+            assert_stops_raising(check_received)
+
+
+def test_batched_subscriber(router):
+
+    class BatchingSubscriber(Client):
+        batches = []
+
+        @subscribe(topic="foo", batch_size=5, batch_window_ms=50)
+        def foo_topic_handler(self, events):
+            self.batches.append(events)
+
+    with BatchingSubscriber(url=router.url) as subscriber:
+        wait_for_subscriptions(subscriber, 1)
+
+        with Client(url=router.url) as publisher:
+            for i in range(7):
+                publisher.publish(topic="foo", message=i)
+
+            def check_batches():
+                assert [len(batch) for batch in subscriber.batches] == [5, 2]
+
+            assert_stops_raising(check_batches)
+
+    args, kwargs, meta = subscriber.batches[1][-1]
+    assert args == []
+    assert kwargs == {'message': 6}
+    assert meta == {'topic': 'foo', 'subscription_id': ANY}
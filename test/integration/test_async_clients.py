@@ -0,0 +1,153 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import asyncio
+
+import pytest
+
+from wampy.errors import WampyError
+from wampy.peers.clients import AsyncClient
+from wampy.roles.callee import callee
+from wampy.roles.subscriber import subscribe
+
+
+class HelloService(AsyncClient):
+
+    @callee
+    def say_hello(self, name):
+        return "Hello {}".format(name)
+
+    @callee
+    async def say_hello_later(self, name):
+        await asyncio.sleep(0.01)
+        return "Hello {}".format(name)
+
+    @callee
+    def fetch_rows(self, count):
+        for i in range(count):
+            yield {'row': i}
+
+    @callee
+    def fail(self):
+        raise ValueError("spam")
+
+    @callee
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+def test_call(router):
+    async def main():
+        async with HelloService(url=router.url):
+            async with AsyncClient(url=router.url) as client:
+                return (
+                    await client.rpc.say_hello(name="wampy"),
+                    await client.call("say_hello_later", "wampy"),
+                )
+
+    assert asyncio.run(main()) == ("Hello wampy", "Hello wampy")
+
+
+def test_many_calls_in_flight(router):
+    async def main():
+        async with HelloService(url=router.url):
+            async with AsyncClient(url=router.url) as client:
+                return await asyncio.gather(*(
+                    client.rpc.say_hello_later(name=str(i))
+                    for i in range(20)
+                ))
+
+    assert asyncio.run(main()) == [
+        "Hello {}".format(i) for i in range(20)
+    ]
+
+
+def test_call_error(router):
+    async def main():
+        async with HelloService(url=router.url):
+            async with AsyncClient(url=router.url) as client:
+                await client.rpc.fail()
+
+    with pytest.raises(WampyError) as exc_info:
+        asyncio.run(main())
+
+    assert "spam" in str(exc_info.value)
+
+
+def test_invocations_are_cancelled_when_the_callee_stops(router):
+    async def main():
+        service = HelloService(url=router.url)
+        await service.start()
+
+        async with AsyncClient(url=router.url) as client:
+            call = asyncio.ensure_future(client.rpc.sleep(seconds=10))
+            while not service.session._invocation_tasks:
+                await asyncio.sleep(0.01)
+
+            # the task is held onto while it is running
+            task, = service.session._invocation_tasks
+            await service.stop()
+
+            with pytest.raises(WampyError):
+                await call
+
+        return task
+
+    assert asyncio.run(main()).cancelled()
+
+
+def test_stream(router):
+    async def main():
+        async with HelloService(url=router.url):
+            async with AsyncClient(url=router.url) as client:
+                async with client.rpc.fetch_rows.stream(count=3) as rows:
+                    return [row async for row in rows]
+
+    assert asyncio.run(main()) == [{'row': 0}, {'row': 1}, {'row': 2}]
+
+
+def test_publish_and_subscribe(router):
+    async def main():
+        received = []
+
+        async with AsyncClient(url=router.url) as subscriber:
+            subscription = await subscriber.subscribe("foo")
+            assert len(subscriber.subscription_map) == 1
+
+            async with AsyncClient(url=router.url) as publisher:
+                for i in range(3):
+                    await publisher.publish(topic="foo", message=i)
+
+            async for args, kwargs, meta in subscription:
+                received.append(kwargs['message'])
+                if len(received) == 3:
+                    await subscription.close()
+
+            assert meta['topic'] == "foo"
+            assert subscriber.subscription_map == {}
+
+        return received
+
+    assert asyncio.run(main()) == [0, 1, 2]
+
+
+def test_subscriptions_end_with_the_client(router):
+    async def main():
+        async with AsyncClient(url=router.url) as subscriber:
+            subscription = await subscriber.subscribe("foo")
+
+        return [event async for event in subscription]
+
+    assert asyncio.run(main()) == []
+
+
+def test_subscriber_decorator_not_supported():
+    class NewsReader(AsyncClient):
+
+        @subscribe(topic="news")
+        def news_handler(self, *args, **kwargs):
+            pass
+
+    with pytest.raises(WampyError):
+        NewsReader()
@@ -9,10 +9,13 @@ import pytest
 
 from wampy.peers.clients import Client
 from wampy.roles.callee import callee
+from wampy.roles.subscriber import subscribe
+from wampy.transports.websocket.deflate import PerMessageDeflate
 
 from wampy.testing.helpers import assert_stops_raising, wait_for_session
 from wampy.testing.helpers import (
-    CollectingMessageHandler, wait_for_messages,
+    CollectingMessageHandler, wait_for_messages, wait_for_registrations,
+    wait_for_subscriptions,
 )
 
 
@@ -177,3 +180,60 @@ def test_client_stays_alive(router):
     assert result == '0b1100100'
 
     client.stop()
+
+
+@pytest.mark.parametrize('serializer', ['cbor', 'json', 'msgpack'])
+def test_serializers(router, serializer):
+
+    class BinaryService(Client):
+        received = []
+
+        @callee
+        def reverse(self, data):
+            return data[::-1]
+
+        @subscribe(topic="blobs")
+        def blobs_handler(self, data, meta):
+            self.received.append(data)
+
+    with BinaryService(url=router.url, serializer=serializer) as service:
+        wait_for_registrations(service, 1)
+        wait_for_subscriptions(service, 1)
+
+        with Client(url=router.url, serializer=serializer) as client:
+            assert client.rpc.reverse(data=[1, 'two', 3.0]) == [
+                3.0, 'two', 1,
+            ]
+
+            client.publish(topic="blobs", data={'temperature': 21.5})
+
+            def check_received():
+                assert service.received == [{'temperature': 21.5}]
+
+            assert_stops_raising(check_received)
+
+
+@pytest.mark.parametrize('serializer', ['cbor', 'msgpack'])
+def test_binary_serializers_send_bytes(router, serializer):
+
+    class BlobService(Client):
+
+        @callee
+        def reverse(self, blob):
+            return blob[::-1]
+
+    with BlobService(url=router.url, serializer=serializer) as service:
+        wait_for_registrations(service, 1)
+
+        with Client(url=router.url, serializer=serializer) as client:
+            assert client.rpc.reverse(blob=b'\x00\x01\xff') == (
+                b'\xff\x01\x00'
+            )
+
+
+def test_router_declines_compression(router):
+    # the default Router config does not enable compression
+    with Client(url=router.url, compression=PerMessageDeflate()) as client:
+        assert client._session.connection._deflater is None
+
+        client.publish(topic="foo", message=['spam'] * 100)
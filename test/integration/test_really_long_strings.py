@@ -1,4 +1,14 @@
+import pytest
+
+from wampy.errors import WampyError
 from wampy.peers.clients import Client
+from wampy.roles.callee import callee
+from wampy.testing.helpers import wait_for_registrations
+
+# neither end will take a message as large as the payloads below, so
+# they only get through in chunks
+MAX_MESSAGE_SIZE = 64 * 1024
+CHUNK_SIZE = 16 * 1024
 
 
 def test_send_really_long_string(router, echo_service):
@@ -9,3 +19,91 @@ def test_send_really_long_string(router, echo_service):
         response = caller.rpc.echo(message=really_long_string)
 
     assert response['message'] == really_long_string
+
+
+class BlobService(Client):
+
+    @callee
+    def reverse(self, blob, suffix=None):
+        return blob[::-1] + (suffix or blob[:0])
+
+    @callee
+    def get_parts(self, blob):
+        for i in range(0, len(blob), 100000):
+            yield len(blob[i:i + 100000])
+
+
+@pytest.fixture(params=['json', 'msgpack'])
+def serializer(request):
+    if request.param == 'msgpack':
+        pytest.importorskip('msgpack')
+    return request.param
+
+
+@pytest.fixture
+def blob_service(router, serializer):
+    with BlobService(
+        url=router.url, serializer=serializer, chunk_size=CHUNK_SIZE,
+        max_message_size=MAX_MESSAGE_SIZE,
+    ) as service:
+        wait_for_registrations(service, 2)
+        yield service
+
+
+@pytest.fixture
+def client(router, serializer):
+    with Client(
+        url=router.url, serializer=serializer, chunk_size=CHUNK_SIZE,
+        max_message_size=MAX_MESSAGE_SIZE,
+    ) as client:
+        yield client
+
+
+def test_send_really_long_strings_in_chunks(client, blob_service):
+    blob = 'abcdefgh' * 100000
+
+    # in chunks both ways
+    assert client.rpc.reverse(blob, suffix='!' * 70000) == (
+        blob[::-1] + '!' * 70000
+    )
+    assert client.call('reverse', 'spam') == 'maps'
+
+    # nothing is left behind
+    assert blob_service.session._chunk_index == {}
+    assert client.session._partial_results == {}
+
+
+def test_send_bytes_in_chunks(client, blob_service, serializer):
+    if serializer == 'json':
+        pytest.skip('JSON cannot carry bytes')
+
+    blob = bytes(range(256)) * 4000
+
+    assert client.rpc.reverse(blob) == blob[::-1]
+
+
+def test_chunked_results_of_a_generator(client, blob_service):
+    blob = 'x' * 250000
+
+    # the Call asks for progressive results, which are listed
+    assert client.rpc.get_parts(blob) == [100000, 100000, 50000]
+    with client.rpc.get_parts.stream(blob) as parts:
+        assert list(parts) == [100000, 100000, 50000]
+
+
+def test_stream_chunked_result(client, blob_service):
+    blob = 'abcdefgh' * 100000
+
+    with client.rpc.reverse.stream(blob) as results:
+        assert list(results) == [blob[::-1]]
+
+
+def test_callee_without_chunks(router, client):
+    with BlobService(url=router.url) as service:
+        wait_for_registrations(service, 2)
+
+        # the Callee has nowhere to take chunks, so is never Called
+        with pytest.raises(WampyError):
+            client.rpc.reverse('abcdefgh' * 10000)
+
+        assert client.rpc.reverse('spam') == 'maps'
@@ -0,0 +1,60 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from wampy.peers.clients import Client
+from wampy.roles.callee import callee
+from wampy.roles.subscriber import subscribe
+from wampy.testing.helpers import (
+    assert_stops_raising, wait_for_registrations, wait_for_subscriptions,
+)
+from wampy.transports.websocket.deflate import PerMessageDeflate
+
+
+@pytest.fixture
+def config_path():
+    return './wampy/testing/configs/crossbar.deflate.json'
+
+
+@pytest.mark.parametrize('compression', [
+    PerMessageDeflate(),
+    PerMessageDeflate(
+        client_max_window_bits=10, client_no_context_takeover=True,
+        server_no_context_takeover=True,
+    ),
+])
+def test_compressed_messages(router, compression):
+
+    class ReadingsService(Client):
+        received = []
+
+        @callee
+        def get_readings(self, count):
+            return [
+                {'sensor': 'boiler-{}'.format(i), 'temperature': 63.25}
+                for i in range(count)
+            ]
+
+        @subscribe(topic="readings")
+        def readings_handler(self, reading, meta):
+            self.received.append(reading)
+
+    with ReadingsService(url=router.url, compression=compression) as service:
+        wait_for_registrations(service, 1)
+        wait_for_subscriptions(service, 1)
+        assert service._session.connection._deflater is not None
+
+        with Client(url=router.url, compression=compression) as client:
+            # large enough to be compressed both ways, and more than once
+            for _ in range(3):
+                assert len(client.rpc.get_readings(count=1000)) == 1000
+                client.publish(
+                    topic="readings", reading=['boiler-1'] * 100,
+                )
+
+            def check_received():
+                assert service.received == [['boiler-1'] * 100] * 3
+
+            assert_stops_raising(check_received)
@@ -0,0 +1,52 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from wampy.errors import WebsocktProtocolError
+from wampy.peers.clients import Client
+from wampy.roles.callee import callee
+from wampy.testing.helpers import wait_for_registrations
+
+
+@pytest.fixture
+def config_path():
+    # the Router fragments everything it sends of more than 16 KiB
+    return './wampy/testing/configs/crossbar.fragments.json'
+
+
+class BlobService(Client):
+
+    @callee
+    def get_blob(self, size):
+        return 'x' * size
+
+    @callee
+    def get_length(self, blob):
+        return len(blob)
+
+
+@pytest.mark.parametrize("fragment_size", [None, 4096])
+def test_large_messages_in_fragments(router, fragment_size):
+    # a couple of MiB, in many fragments
+    size = 2 * 1024 * 1024
+
+    with BlobService(url=router.url, fragment_size=fragment_size) as service:
+        wait_for_registrations(service, 2)
+
+        with Client(url=router.url, fragment_size=fragment_size) as client:
+            assert client.rpc.get_blob(size=size) == 'x' * size
+            assert client.rpc.get_length(blob='y' * size) == size
+
+            # and small messages still go as they are
+            assert client.rpc.get_blob(size=10) == 'x' * 10
+
+
+def test_message_too_large(router):
+    with BlobService(url=router.url) as service:
+        wait_for_registrations(service, 2)
+
+        with Client(url=router.url, max_message_size=64 * 1024) as client:
+            with pytest.raises(WebsocktProtocolError):
+                client.rpc.get_blob(size=1024 * 1024)
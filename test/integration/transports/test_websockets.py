@@ -100,8 +100,8 @@ def test_send_ping(server):
         client_handler = list(clients.values())[0]
         socket = client_handler.ws
 
-        ping_frame = Ping()
-        socket.send(ping_frame.frame)
+        # ``send`` would wrap our bytes up in a binary data frame
+        socket.send_frame(b'', socket.OPCODE_PING)
 
         with gevent.Timeout(5):
             while mock_handle.call_count != 1:
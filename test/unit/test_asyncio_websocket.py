@@ -0,0 +1,193 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import asyncio
+
+import pytest
+
+from wampy.errors import NoFrameReturnedError
+from wampy.testing.helpers import server_frame
+from wampy.transports.websocket.asyncio_ import AsyncWebSocket
+from wampy.transports.websocket.frames import Frame
+
+
+class FakeTransport(object):
+    """ The event loop's end of a connection, recording what it is asked
+    to do rather than doing it.
+    """
+
+    def __init__(self, protocol):
+        self.protocol = protocol
+        self.writes = []
+        self.reading_paused = False
+
+    def writelines(self, buffers):
+        self.writes.append(b''.join(buffers))
+
+    def pause_reading(self):
+        self.reading_paused = True
+
+    def resume_reading(self):
+        self.reading_paused = False
+
+    def close(self):
+        self.protocol.connection_lost(None)
+
+
+def connected_websocket(receive_buffer_size=64):
+    # must be made in the event loop, as a connection is
+    websocket = AsyncWebSocket(
+        server_url='ws://localhost:8080',
+        receive_buffer_size=receive_buffer_size,
+    )
+    websocket._closed = asyncio.get_running_loop().create_future()
+    websocket.connection_made(FakeTransport(websocket))
+    websocket.connected = True
+    return websocket
+
+
+def feed(websocket, raw_bytes, read_size=None):
+    # as the event loop does: read into whatever buffer it is handed
+    while raw_bytes:
+        buffer = websocket.get_buffer(-1)
+        received = min(len(buffer), len(raw_bytes), read_size or 65536)
+        buffer[:received] = raw_bytes[:received]
+        raw_bytes = raw_bytes[received:]
+        websocket.buffer_updated(received)
+
+
+@pytest.mark.parametrize("read_size", [1, 7, None])
+def test_receive(read_size):
+    messages = ['[36, 1, 2, {}, [%s]]' % i for i in range(3)]
+
+    async def receive():
+        websocket = connected_websocket()
+        feed(
+            websocket, b''.join(server_frame(m) for m in messages),
+            read_size=read_size,
+        )
+        return [(await websocket.receive()).payload for _ in messages]
+
+    assert asyncio.run(receive()) == messages
+
+
+def test_receive_waits_for_the_rest_of_a_frame():
+    raw_bytes = server_frame('x' * 1000)
+
+    async def receive():
+        websocket = connected_websocket()
+        feed(websocket, raw_bytes[:3])
+
+        asyncio.get_running_loop().call_soon(feed, websocket, raw_bytes[3:])
+        frame = await websocket.receive()
+        # the buffer grew to fit the frame
+        assert len(websocket._receive_buffer) > 64
+        return frame.payload
+
+    assert asyncio.run(receive()) == 'x' * 1000
+
+
+def test_frames_not_yet_received_are_not_overwritten():
+    # more arrives than the buffer holds before any of it is handled
+    messages = ['%02d' % i * 10 for i in range(10)]
+
+    async def receive():
+        websocket = connected_websocket(receive_buffer_size=32)
+        feed(websocket, b''.join(server_frame(m) for m in messages))
+
+        assert websocket._transport.reading_paused
+
+        return [(await websocket.receive()).payload for _ in messages]
+
+    assert asyncio.run(receive()) == messages
+
+
+def test_receive_resumes_reading_once_frames_are_handled():
+    async def receive():
+        websocket = connected_websocket(receive_buffer_size=32)
+        feed(websocket, server_frame('a' * 20) + server_frame('b' * 20))
+        assert websocket._transport.reading_paused
+
+        await websocket.receive()
+        await websocket.receive()
+
+        waiting = asyncio.ensure_future(websocket.receive())
+        await asyncio.sleep(0)
+        assert not websocket._transport.reading_paused
+
+        feed(websocket, server_frame('c'))
+        return (await waiting).payload
+
+    assert asyncio.run(receive()) == 'c'
+
+
+def test_receive_after_the_connection_is_lost():
+    async def receive():
+        websocket = connected_websocket()
+        feed(websocket, server_frame('spam'))
+        websocket.connection_lost(None)
+
+        # what arrived before is still returned
+        assert (await websocket.receive()).payload == 'spam'
+        await websocket.receive()
+
+    with pytest.raises(NoFrameReturnedError):
+        asyncio.run(receive())
+
+
+def test_sends_in_one_turn_are_written_together():
+    async def send():
+        websocket = connected_websocket()
+        for i in range(3):
+            websocket.send_frame('spam', Frame.OPCODE_TEXT, False)
+
+        transport = websocket._transport
+        assert transport.writes == []
+
+        await asyncio.sleep(0)
+        return transport.writes
+
+    assert asyncio.run(send()) == [server_frame('spam') * 3]
+
+
+def test_flush_writes_and_waits_for_the_transport():
+    async def flush():
+        websocket = connected_websocket()
+        websocket.pause_writing()
+
+        websocket.send_frame('spam', Frame.OPCODE_TEXT, False)
+        flushing = asyncio.ensure_future(websocket.flush())
+        await asyncio.sleep(0)
+
+        assert websocket._transport.writes == [server_frame('spam')]
+        assert not flushing.done()
+
+        websocket.resume_writing()
+        await asyncio.sleep(0)
+        return flushing.done()
+
+    assert asyncio.run(flush())
+
+
+def test_sends_are_written_once_enough_are_waiting():
+    async def send():
+        websocket = connected_websocket()
+        websocket.coalesce_max_bytes = 18
+
+        for i in range(4):
+            websocket.send_frame('spam', Frame.OPCODE_TEXT, False)
+
+        # the fourth is left for the end of this turn
+        return list(websocket._transport.writes)
+
+    # each frame is 6 bytes
+    assert asyncio.run(send()) == [server_frame('spam') * 3]
+
+
+def test_built_on_asyncio_primitives():
+    websocket = AsyncWebSocket(server_url='ws://localhost:8080')
+
+    # never a green thread's, which would block the event loop
+    assert isinstance(websocket._write_lock, asyncio.Lock)
+    assert isinstance(websocket._message_lock, asyncio.Lock)
@@ -1,9 +1,12 @@
+import asyncio
+
 import eventlet
 import gevent
 import pytest
-from mock import Mock, patch
+from mock import patch
 
 from wampy.backends import get_async_adapter
+from wampy.backends.asyncio_ import Asyncio as AsyncioAdapter
 from wampy.backends.eventlet_ import Eventlet as EventletAdapter
 from wampy.backends.gevent_ import Gevent as GeventAdapter
 
@@ -31,12 +34,15 @@ class TestGeventadapter:
         timeout = adapter.Timeout(timeout=10)
         assert isinstance(timeout, gevent.Timeout)
 
+        assert isinstance(adapter.Lock(), gevent.lock.Semaphore)
+        assert isinstance(adapter.Event(), gevent.event.Event)
+
     def test_receive_message_g(self):
-        mock_queue = Mock()
-        mock_queue.qsize.side_effect = [3, 2, 1]
-        mock_queue.get.side_effect = [1, 2, 3]
+        message_queue = gevent.queue.Queue()
+        for message in [1, 2, 3]:
+            message_queue.put(message)
 
-        adapter = GeventAdapter(message_queue=mock_queue)
+        adapter = GeventAdapter(message_queue=message_queue)
 
         message = adapter.receive_message(timeout=1)
         assert message == 1
@@ -48,13 +54,70 @@ class TestGeventadapter:
         assert message == 3
 
     def test_receive_message_timeout(self):
-        mock_queue = Mock()
-        mock_queue.qsize.return_value = 0
+        adapter = GeventAdapter()
+
+        with pytest.raises(WampyTimeOutError):
+            adapter.receive_message(timeout=0.1)
+
+    def test_receive_message_blocks_until_there_is_one(self):
+        adapter = GeventAdapter()
+        message_queue = adapter.queue()
+
+        def put_message():
+            adapter.sleep(0.05)
+            message_queue.put("message")
+
+        adapter.spawn(put_message)
+
+        message = adapter.receive_message(
+            timeout=1, message_queue=message_queue,
+        )
+        assert message == "message"
+
+    def test_future(self):
+        adapter = GeventAdapter()
+        future = adapter.Future()
+        assert not future.done()
+
+        adapter.spawn(future.set, "result")
+
+        assert future.get(timeout=1) == "result"
+        assert future.done()
 
-        adapter = GeventAdapter(message_queue=mock_queue)
+    def test_future_exception(self):
+        adapter = GeventAdapter()
+        future = adapter.Future()
+
+        future.set_exception(ValueError("oops"))
+
+        with pytest.raises(ValueError):
+            future.get()
+
+    def test_future_timeout(self):
+        adapter = GeventAdapter()
+        future = adapter.Future()
 
         with pytest.raises(WampyTimeOutError):
-            adapter.receive_message(timeout=1)
+            future.get(timeout=0.1)
+
+    def test_stream(self):
+        adapter = GeventAdapter()
+        stream = adapter.Stream()
+
+        def set_results():
+            for result in [1, 2]:
+                adapter.sleep(0.01)
+                stream.set(result)
+            stream.set_exception(ValueError("oops"))
+
+        adapter.spawn(set_results)
+
+        assert stream.get(timeout=1) == 1
+        assert stream.get(timeout=1) == 2
+        with pytest.raises(ValueError):
+            stream.get(timeout=1)
+        with pytest.raises(WampyTimeOutError):
+            stream.get(timeout=0.1)
 
 
 class TestEventletadapter:
@@ -75,12 +138,14 @@ class TestEventletadapter:
         timeout = adapter.Timeout(timeout=10)
         assert isinstance(timeout, eventlet.Timeout)
 
+        assert isinstance(adapter.Lock(), eventlet.semaphore.Semaphore)
+
     def test_receive_message(self):
-        mock_queue = Mock()
-        mock_queue.qsize.side_effect = [3, 2, 1]
-        mock_queue.get.side_effect = [1, 2, 3]
+        message_queue = eventlet.queue.Queue()
+        for message in [1, 2, 3]:
+            message_queue.put(message)
 
-        adapter = EventletAdapter(message_queue=mock_queue)
+        adapter = EventletAdapter(message_queue=message_queue)
 
         message = adapter.receive_message(timeout=1)
         assert message == 1
@@ -92,10 +157,199 @@ class TestEventletadapter:
         assert message == 3
 
     def test_receive_message_timeout(self):
-        mock_queue = Mock()
-        mock_queue.qsize.return_value = 0
+        adapter = EventletAdapter()
+
+        with pytest.raises(WampyTimeOutError):
+            adapter.receive_message(timeout=0.1)
 
-        adapter = EventletAdapter(message_queue=mock_queue)
+    def test_receive_message_blocks_until_there_is_one(self):
+        adapter = EventletAdapter()
+        message_queue = adapter.queue()
+
+        def put_message():
+            adapter.sleep(0.05)
+            message_queue.put("message")
+
+        adapter.spawn(put_message)
+
+        message = adapter.receive_message(
+            timeout=1, message_queue=message_queue,
+        )
+        assert message == "message"
+
+    def test_future(self):
+        adapter = EventletAdapter()
+        future = adapter.Future()
+        assert not future.done()
+
+        adapter.spawn(future.set, "result")
+
+        assert future.get(timeout=1) == "result"
+        assert future.done()
+
+    def test_future_exception(self):
+        adapter = EventletAdapter()
+        future = adapter.Future()
+
+        future.set_exception(ValueError("oops"))
+
+        with pytest.raises(ValueError):
+            future.get()
+
+    def test_future_timeout(self):
+        adapter = EventletAdapter()
+        future = adapter.Future()
 
         with pytest.raises(WampyTimeOutError):
-            adapter.receive_message(timeout=1)
+            future.get(timeout=0.1)
+
+    def test_stream(self):
+        adapter = EventletAdapter()
+        stream = adapter.Stream()
+
+        def set_results():
+            for result in [1, 2]:
+                adapter.sleep(0.01)
+                stream.set(result)
+            stream.set_exception(ValueError("oops"))
+
+        adapter.spawn(set_results)
+
+        assert stream.get(timeout=1) == 1
+        assert stream.get(timeout=1) == 2
+        with pytest.raises(ValueError):
+            stream.get(timeout=1)
+        with pytest.raises(WampyTimeOutError):
+            stream.get(timeout=0.1)
+
+
+class TestAsyncioadapter:
+
+    def test_get_asyncio_backend(self):
+        with patch('wampy.backends.async_name', 'asyncio'):
+            adapter = get_async_adapter()
+
+        assert str(adapter) == 'AsyncioAsyncAdapter'
+
+    def test_interface(self):
+        adapter = AsyncioAdapter()
+
+        async def make():
+            return adapter.queue(), adapter.Lock(), adapter.Event()
+
+        queue, lock, event = asyncio.run(make())
+        assert isinstance(queue, asyncio.Queue)
+        assert adapter.QueueEmpty is asyncio.QueueEmpty
+        assert isinstance(lock, asyncio.Lock)
+        assert isinstance(event, asyncio.Event)
+
+    def test_receive_message(self):
+        async def receive():
+            message_queue = asyncio.Queue()
+            for message in [1, 2, 3]:
+                message_queue.put_nowait(message)
+
+            adapter = AsyncioAdapter(message_queue=message_queue)
+
+            return [
+                await adapter.receive_message(timeout=1) for _ in range(3)
+            ]
+
+        assert asyncio.run(receive()) == [1, 2, 3]
+
+    def test_receive_message_timeout(self):
+        adapter = AsyncioAdapter()
+
+        with pytest.raises(WampyTimeOutError):
+            asyncio.run(adapter.receive_message(timeout=0.1))
+
+    def test_receive_message_blocks_until_there_is_one(self):
+        adapter = AsyncioAdapter()
+
+        async def receive():
+            message_queue = adapter.queue()
+
+            async def put_message():
+                await adapter.sleep(0.05)
+                message_queue.put_nowait("message")
+
+            adapter.spawn(put_message)
+
+            return await adapter.receive_message(
+                timeout=1, message_queue=message_queue,
+            )
+
+        assert asyncio.run(receive()) == "message"
+
+    def test_future(self):
+        adapter = AsyncioAdapter()
+
+        async def get():
+            future = adapter.Future()
+            assert not future.done()
+
+            asyncio.get_running_loop().call_later(0.01, future.set, "result")
+
+            result = await future.get(timeout=1)
+            assert future.done()
+            return result
+
+        assert asyncio.run(get()) == "result"
+
+    def test_future_exception(self):
+        adapter = AsyncioAdapter()
+
+        async def get():
+            future = adapter.Future()
+            future.set_exception(ValueError("oops"))
+            await future.get()
+
+        with pytest.raises(ValueError):
+            asyncio.run(get())
+
+    def test_future_timeout(self):
+        adapter = AsyncioAdapter()
+
+        async def get():
+            await adapter.Future().get(timeout=0.1)
+
+        with pytest.raises(WampyTimeOutError):
+            asyncio.run(get())
+
+    def test_stream(self):
+        adapter = AsyncioAdapter()
+
+        async def get():
+            stream = adapter.Stream()
+
+            async def set_results():
+                for result in [1, 2]:
+                    await adapter.sleep(0.01)
+                    stream.set(result)
+                stream.set_exception(ValueError("oops"))
+
+            adapter.spawn(set_results)
+
+            assert await stream.get(timeout=1) == 1
+            assert await stream.get(timeout=1) == 2
+            with pytest.raises(ValueError):
+                await stream.get(timeout=1)
+            with pytest.raises(WampyTimeOutError):
+                await stream.get(timeout=0.1)
+
+        asyncio.run(get())
+
+    def test_timeout(self):
+        adapter = AsyncioAdapter()
+
+        async def wait():
+            async with adapter.Timeout(0.05):
+                await adapter.sleep(1)
+
+        with pytest.raises(WampyTimeOutError):
+            asyncio.run(wait())
+
+    def test_run_in_thread(self):
+        adapter = AsyncioAdapter()
+
+        assert asyncio.run(adapter.run_in_thread(sum, [1, 2])) == 3
@@ -0,0 +1,84 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import asyncio
+
+import pytest
+from mock import AsyncMock, Mock
+
+from wampy.messages import Call, Cancel, Result
+from wampy.roles.caller import (
+    AsyncProgressiveCall, ProgressiveCall, RpcProxy,
+)
+
+
+def progressive_call(call_cls, recv_message_cls, last_args):
+    # the Router's side of a Call with two progressive results, and the
+    # last - which may or may not carry arguments - saying that is all
+    client = Mock()
+    message = Call(procedure='fetch_rows', options={'receive_progress': True})
+    client.session.recv_message = recv_message_cls(side_effect=[
+        Result(message.request_id, {'progress': True}, yield_args=[1]),
+        Result(message.request_id, {'progress': True}, yield_args=[2]),
+        Result(message.request_id, {}, yield_args=last_args),
+    ])
+
+    return call_cls(
+        client=client, message=message,
+        handle_response=RpcProxy(client)._handle_response,
+    )
+
+
+@pytest.mark.parametrize('last_args', [None, []])
+def test_stream_ends_with_the_last_result(last_args):
+    call = progressive_call(ProgressiveCall, Mock, last_args)
+
+    assert list(call) == [1, 2]
+    call.session.discard_request.assert_called_with(call.request_id)
+
+
+@pytest.mark.parametrize('last_args', [None, []])
+def test_async_stream_ends_with_the_last_result(last_args):
+    call = progressive_call(AsyncProgressiveCall, AsyncMock, last_args)
+
+    async def main():
+        return [result async for result in call]
+
+    assert asyncio.run(main()) == [1, 2]
+    call.session.discard_request.assert_called_with(call.request_id)
+
+
+def test_stream_left_early_is_cancelled():
+    call = progressive_call(ProgressiveCall, Mock, None)
+
+    with call as results:
+        assert next(results) == 1
+
+    cancel, = call.session.send_message.call_args[0]
+    assert isinstance(cancel, Cancel)
+    assert cancel.request_id == call.request_id
+    call.session.discard_request.assert_called_once_with(call.request_id)
+
+
+def test_async_stream_left_early_is_cancelled():
+    call = progressive_call(AsyncProgressiveCall, AsyncMock, None)
+
+    async def main():
+        async with call as results:
+            async for result in results:
+                return result
+
+    assert asyncio.run(main()) == 1
+    cancel, = call.session.send_message.call_args[0]
+    assert isinstance(cancel, Cancel)
+    call.session.discard_request.assert_called_once_with(call.request_id)
+
+
+def test_finished_stream_is_not_cancelled():
+    call = progressive_call(ProgressiveCall, Mock, None)
+
+    with call as results:
+        assert list(results) == [1, 2]
+
+    assert not call.session.send_message.called
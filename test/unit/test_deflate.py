@@ -0,0 +1,149 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import zlib
+
+import pytest
+
+from wampy.errors import WampyError, WebsocktProtocolError
+from wampy.transports.websocket.deflate import TAIL, PerMessageDeflate
+
+MESSAGE = (
+    b'[36, 1, 2, {}, [], {"sensor": "boiler-1", "temperature": 63.25}]'
+)
+
+
+@pytest.mark.parametrize("kwargs, offer", [
+    ({}, 'permessage-deflate; client_max_window_bits'),
+    (
+        {'client_max_window_bits': 10, 'server_max_window_bits': 12},
+        'permessage-deflate; client_max_window_bits=10; '
+        'server_max_window_bits=12',
+    ),
+    (
+        {
+            'client_no_context_takeover': True,
+            'server_no_context_takeover': True,
+        },
+        'permessage-deflate; client_max_window_bits; '
+        'client_no_context_takeover; server_no_context_takeover',
+    ),
+])
+def test_offer(kwargs, offer):
+    assert PerMessageDeflate(**kwargs).offer() == offer
+
+
+@pytest.mark.parametrize("bits", [7, 8, 16])
+def test_window_bits_out_of_range(bits):
+    with pytest.raises(WampyError):
+        PerMessageDeflate(client_max_window_bits=bits)
+
+
+def test_accept():
+    deflater = PerMessageDeflate(client_max_window_bits=12).accept(
+        'permessage-deflate; client_max_window_bits=10; '
+        'client_no_context_takeover; server_no_context_takeover'
+    )
+
+    assert deflater.window_bits == 10
+    assert deflater.no_context_takeover
+    assert deflater.inflate_no_context_takeover
+
+
+@pytest.mark.parametrize("response", [
+    'x-webkit-deflate-frame',
+    'permessage-deflate, permessage-deflate',
+    'permessage-deflate; client_max_window_bits=16',
+    'permessage-deflate; client_max_window_bits=ten',
+    'permessage-deflate; server_no_context_takeover; '
+    'server_no_context_takeover',
+    'permessage-deflate; spam',
+])
+def test_accept_unexpected(response):
+    with pytest.raises(WampyError):
+        PerMessageDeflate().accept(response)
+
+
+def test_accept_larger_server_window_than_asked_for():
+    compression = PerMessageDeflate(server_max_window_bits=10)
+
+    with pytest.raises(WampyError):
+        compression.accept('permessage-deflate; server_max_window_bits=12')
+
+
+def test_accept_without_server_no_context_takeover():
+    compression = PerMessageDeflate(server_no_context_takeover=True)
+
+    with pytest.raises(WampyError):
+        compression.accept('permessage-deflate')
+
+
+def test_round_trip():
+    deflater = PerMessageDeflate().accept('permessage-deflate')
+
+    compressed = deflater.compress(MESSAGE)
+
+    assert not compressed.endswith(TAIL)
+    assert deflater.decompress(compressed) == MESSAGE
+
+
+def test_context_takeover():
+    deflater = PerMessageDeflate().accept('permessage-deflate')
+
+    first = deflater.compress(MESSAGE)
+    second = deflater.compress(MESSAGE)
+
+    # the second is mostly a reference back into the first
+    assert len(second) < len(first) / 2
+    assert deflater.decompress(first) == MESSAGE
+    assert deflater.decompress(second) == MESSAGE
+
+
+def test_no_context_takeover():
+    deflater = PerMessageDeflate().accept(
+        'permessage-deflate; client_no_context_takeover; '
+        'server_no_context_takeover'
+    )
+
+    first = deflater.compress(MESSAGE)
+    second = deflater.compress(MESSAGE)
+
+    assert first == second
+    # and each can be inflated on its own, in any order
+    assert deflater.decompress(second) == MESSAGE
+    assert deflater.decompress(first) == MESSAGE
+
+
+def test_decompress_garbage():
+    deflater = PerMessageDeflate().accept('permessage-deflate')
+
+    with pytest.raises(WebsocktProtocolError):
+        deflater.decompress(b'\xff' * 10)
+
+
+def test_decompress_max_length():
+    deflater = PerMessageDeflate().accept('permessage-deflate')
+    compressed = deflater.compress(b'x' * 1000)
+
+    assert deflater.decompress(compressed, max_length=1000) == b'x' * 1000
+    with pytest.raises(WebsocktProtocolError):
+        deflater.decompress(deflater.compress(b'x' * 1001), max_length=1000)
+
+
+def test_client_window_of_8_bits():
+    # zlib cannot compress with an 8 bit window, and a larger one than
+    # agreed is not allowed, so messages go uncompressed
+    deflater = PerMessageDeflate().accept(
+        'permessage-deflate; client_max_window_bits=8'
+    )
+
+    assert deflater.window_bits is None
+    assert not deflater.worth_compressing(MESSAGE * 100)
+
+    # but still inflates whatever the Router sends
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -9)
+    compressed = compressor.compress(MESSAGE) + compressor.flush(
+        zlib.Z_SYNC_FLUSH
+    )
+    assert deflater.decompress(compressed[:-len(TAIL)]) == MESSAGE
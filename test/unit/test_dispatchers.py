@@ -0,0 +1,173 @@
+import pytest
+
+from wampy.backends import async_adapter
+from wampy.dispatchers import EventDispatcher
+from wampy.errors import WampyError
+
+
+class Subscriber(object):
+
+    def __init__(self, wait=0):
+        self.wait = wait
+        self.events = []
+
+    def __call__(self, event):
+        async_adapter.sleep(self.wait)
+        self.events.append(event)
+
+
+def dispatch_all(dispatcher, subscription_id, subscriber, events):
+    for event in events:
+        dispatcher.dispatch(subscription_id, subscriber, (event, ), {})
+
+
+def test_dispatch_does_not_wait_on_subscriber():
+    dispatcher = EventDispatcher()
+    subscriber = Subscriber(wait=0.05)
+
+    dispatch_all(dispatcher, 1, subscriber, range(3))
+    assert subscriber.events == []
+
+    async_adapter.sleep(0.2)
+    assert subscriber.events == [0, 1, 2]
+
+
+def test_ordered_per_subscription_but_subscriptions_in_parallel():
+    dispatcher = EventDispatcher(ordered=True)
+    slow_subscriber = Subscriber(wait=0.05)
+    fast_subscriber = Subscriber()
+
+    dispatch_all(dispatcher, 1, slow_subscriber, range(3))
+    dispatch_all(dispatcher, 2, fast_subscriber, range(3))
+
+    async_adapter.sleep(0.01)
+    assert fast_subscriber.events == [0, 1, 2]
+    assert slow_subscriber.events == []
+
+    async_adapter.sleep(0.2)
+    assert slow_subscriber.events == [0, 1, 2]
+
+
+def test_unordered():
+    dispatcher = EventDispatcher(ordered=False, max_concurrency=3)
+    subscriber = Subscriber(wait=0.05)
+
+    dispatch_all(dispatcher, 1, subscriber, range(3))
+
+    # all three at once
+    async_adapter.sleep(0.08)
+    assert sorted(subscriber.events) == [0, 1, 2]
+
+
+def test_drop_newest():
+    dispatcher = EventDispatcher(max_queued=2, overflow="drop_newest")
+    subscriber = Subscriber(wait=0.01)
+
+    # the worker doesn't get its first EVENT until the reader yields
+    dispatch_all(dispatcher, 1, subscriber, range(4))
+
+    async_adapter.sleep(0.1)
+    assert subscriber.events == [0, 1]
+    assert dispatcher.dropped == 2
+
+
+def test_drop_oldest():
+    dispatcher = EventDispatcher(max_queued=2, overflow="drop_oldest")
+    subscriber = Subscriber(wait=0.01)
+
+    dispatch_all(dispatcher, 1, subscriber, range(4))
+
+    async_adapter.sleep(0.1)
+    assert subscriber.events == [2, 3]
+    assert dispatcher.dropped == 2
+
+
+def test_block():
+    dispatcher = EventDispatcher(max_queued=1, overflow="block")
+    subscriber = Subscriber(wait=0.01)
+
+    dispatch_all(dispatcher, 1, subscriber, range(4))
+    # the reader was held up until there was room for the last EVENT
+    assert subscriber.events == [0, 1]
+
+    async_adapter.sleep(0.1)
+    assert subscriber.events == [0, 1, 2, 3]
+    assert dispatcher.dropped == 0
+
+
+def test_subscriber_error_does_not_stop_dispatch():
+    dispatcher = EventDispatcher()
+    events = []
+
+    def subscriber(event):
+        if event == 0:
+            raise ValueError("oops")
+        events.append(event)
+
+    dispatch_all(dispatcher, 1, subscriber, range(2))
+
+    async_adapter.sleep(0.01)
+    assert events == [1]
+
+
+def test_stop():
+    dispatcher = EventDispatcher()
+    subscriber = Subscriber(wait=0.05)
+
+    dispatch_all(dispatcher, 1, subscriber, range(3))
+    async_adapter.sleep(0.01)
+    dispatcher.stop()
+
+    async_adapter.sleep(0.2)
+    assert subscriber.events == []
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(WampyError):
+        EventDispatcher(overflow="explode")
+
+
+class BatchSubscriber(object):
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, batch):
+        self.batches.append([args[0] for args, _, _ in batch])
+
+
+def dispatch_all_to_batches(
+    dispatcher, subscriber, events, batch_size, batch_window,
+):
+    for event in events:
+        dispatcher.dispatch_to_batch(
+            1, subscriber, ((event, ), {}, {}), batch_size, batch_window,
+        )
+
+
+def test_batch_handed_over_once_full():
+    dispatcher = EventDispatcher()
+    subscriber = BatchSubscriber()
+
+    dispatch_all_to_batches(
+        dispatcher, subscriber, range(7), batch_size=3, batch_window=10,
+    )
+
+    async_adapter.sleep(0.01)
+    # the last is still waiting for its batch to fill
+    assert subscriber.batches == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_batch_handed_over_after_window():
+    dispatcher = EventDispatcher()
+    subscriber = BatchSubscriber()
+
+    dispatch_all_to_batches(
+        dispatcher, subscriber, range(2), batch_size=100, batch_window=0.05,
+    )
+
+    async_adapter.sleep(0.01)
+    assert subscriber.batches == []
+
+    async_adapter.sleep(0.1)
+    assert subscriber.batches == [[0, 1]]
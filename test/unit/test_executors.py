@@ -0,0 +1,137 @@
+import pytest
+from mock import patch
+
+from wampy.backends import async_adapter
+from wampy.constants import DEFAULT_INVOCATION_CONCURRENCY
+from wampy.errors import ExecutorSaturatedError, WampyError
+from wampy.executors import GreenExecutor, ProcessExecutor, ThreadExecutor
+from wampy.roles.callee import callee
+
+
+class Service(object):
+
+    def add(self, a, b):
+        return a + b
+
+
+@pytest.mark.parametrize("executor_cls", [GreenExecutor, ThreadExecutor])
+def test_call(executor_cls):
+    executor = executor_cls()
+    assert executor.call(Service().add, 1, b=2) == 3
+
+
+def test_process_executor_not_with_eventlet():
+    with patch('wampy.executors.async_name', 'eventlet'):
+        with pytest.raises(WampyError):
+            ProcessExecutor()
+
+
+def test_submit_does_not_wait_on_work():
+    executor = GreenExecutor(max_concurrency=2)
+    done = []
+
+    def work(name):
+        async_adapter.sleep(0.05)
+        done.append(name)
+
+    executor.submit(work, "a")
+    executor.submit(work, "b")
+    assert done == []
+
+    async_adapter.sleep(0.1)
+    assert sorted(done) == ["a", "b"]
+
+
+def test_submit_waits_for_a_free_worker():
+    executor = GreenExecutor(max_concurrency=1)
+    done = []
+
+    def work(name):
+        async_adapter.sleep(0.05)
+        done.append(name)
+
+    executor.submit(work, "a")
+    # back-pressure: blocks until "a" is done
+    executor.submit(work, "b")
+    assert done == ["a"]
+
+    async_adapter.sleep(0.1)
+    assert done == ["a", "b"]
+
+
+def test_worker_is_freed_when_work_fails():
+    executor = GreenExecutor(max_concurrency=1)
+
+    def fail():
+        raise ValueError("oops")
+
+    executor.submit(fail)
+    async_adapter.sleep(0)
+
+    with async_adapter.Timeout(1):
+        executor.submit(lambda: None)
+
+
+def test_queue_without_waiting():
+    executor = GreenExecutor(max_concurrency=1, max_queued=1)
+    done = []
+
+    def work(name):
+        async_adapter.sleep(0.05)
+        done.append(name)
+
+    executor.submit(work, "a")
+    executor.submit(work, "b")
+    assert done == []
+
+    with pytest.raises(ExecutorSaturatedError):
+        executor.submit(work, "c")
+
+    async_adapter.sleep(0.2)
+    assert done == ["a", "b"]
+
+    # and there's room again
+    executor.submit(work, "d")
+    async_adapter.sleep(0.1)
+    assert done == ["a", "b", "d"]
+
+
+def test_reject_when_saturated():
+    executor = GreenExecutor(max_concurrency=1, max_queued=0)
+
+    executor.submit(async_adapter.sleep, 0.05)
+    with pytest.raises(ExecutorSaturatedError):
+        executor.submit(async_adapter.sleep, 0.05)
+
+
+def test_callee_with_unknown_executor():
+    with pytest.raises(WampyError):
+        @callee(executor="quantum")
+        def procedure(self):
+            pass
+
+
+@pytest.mark.parametrize('max_concurrency', [0, -1, '8'])
+def test_callee_with_no_concurrency(max_concurrency):
+    with pytest.raises(ValueError):
+        @callee(max_concurrency=max_concurrency)
+        def procedure(self):
+            pass
+
+
+@pytest.mark.parametrize('max_queued', [-1, 1.5, None])
+def test_callee_with_bad_max_queued(max_queued):
+    with pytest.raises(ValueError):
+        @callee(max_concurrency=1, max_queued=max_queued)
+        def procedure(self):
+            pass
+
+
+def test_callee_with_default_concurrency():
+    @callee(executor="thread")
+    def procedure(self):
+        pass
+
+    assert procedure.executor_options['max_concurrency'] == (
+        DEFAULT_INVOCATION_CONCURRENCY
+    )
@@ -0,0 +1,196 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+from mock import PropertyMock, patch
+
+from wampy.errors import IncompleteFrameError, WebsocktProtocolError
+from wampy.testing.helpers import server_frame
+from wampy.transports.websocket import frames
+from wampy.transports.websocket.frames import (
+    Binary, Frame, FrameFactory, FrameParser, Ping,
+)
+
+
+@pytest.mark.parametrize("length, header_length", [
+    (0, 2), (125, 2), (126, 4), (40000, 4), (70000, 10),
+])
+def test_parse_length_brackets(length, header_length):
+    message = 'a' * length
+    raw_bytes = server_frame(message)
+    parser = FrameParser()
+
+    frame = parser.parse(raw_bytes + b'trailing bytes')
+
+    assert len(frame.frame) == header_length + length
+    assert frame.payload == message
+
+
+def test_parse_incrementally():
+    raw_bytes = bytearray(server_frame('b' * 300))
+    parser = FrameParser()
+
+    assert parser.parse(raw_bytes[:1]) is None
+    assert parser.required_bytes == 1
+
+    assert parser.parse(raw_bytes[:3]) is None
+    assert parser.required_bytes == 1
+
+    # the header is now known and only the payload is waited for
+    assert parser.parse(raw_bytes[:4]) is None
+    assert parser.header_length == 4
+    assert parser.payload_length == 300
+    assert parser.required_bytes == 300
+
+    frame = parser.parse(raw_bytes)
+    assert frame.payload == 'b' * 300
+    assert parser.header_length is None
+
+
+def test_data_frames_are_not_copied():
+    raw_bytes = bytearray(server_frame('c' * 1000))
+    frame = FrameParser().parse(raw_bytes)
+
+    assert isinstance(frame._payload, memoryview)
+    assert frame._payload.obj is raw_bytes
+
+
+def test_parsed_frames_are_not_inspected_again():
+    raw_bytes = server_frame('e' * 10)
+    frame = FrameParser().parse(raw_bytes)
+
+    assert frame.opcode == Frame.OPCODE_TEXT
+    assert frame.fin_bit == 1
+    assert not hasattr(frame, '__dict__')
+
+    with patch.object(
+        Frame, 'payload_length_indicator', new_callable=PropertyMock,
+    ) as indicator:
+        assert frame.payload == 'e' * 10
+    assert not indicator.called
+
+
+def test_binary_payload_is_not_decoded():
+    payload = b'\x93\xa3\xff\x00'
+    frame = FrameParser().parse(
+        server_frame(payload, opcode=Frame.OPCODE_BINARY)
+    )
+
+    assert isinstance(frame, Binary)
+    assert bytes(frame.payload) == payload
+
+
+def test_control_frames_are_copied():
+    raw_bytes = bytearray(server_frame('ping', opcode=Frame.OPCODE_PING))
+    frame = FrameParser().parse(raw_bytes)
+    raw_bytes[:] = b'\x00' * len(raw_bytes)
+
+    assert isinstance(frame, Ping)
+    assert frame.payload == 'ping'
+
+
+def test_rsv1_is_parsed():
+    raw_bytes = bytes(FrameFactory.generate_bytes(
+        payload=b'compressed', fin_bit=1, opcode=Frame.OPCODE_TEXT,
+        mask_payload=False, rsv1=1,
+    ))
+
+    assert raw_bytes[0] == 0xc1
+    assert FrameParser().parse(raw_bytes).rsv1
+
+
+@pytest.mark.parametrize("rsv_bit", [0x20, 0x10])
+def test_rsv2_and_rsv3_are_rejected(rsv_bit):
+    raw_bytes = bytearray(server_frame('spam'))
+    raw_bytes[0] |= rsv_bit
+
+    with pytest.raises(WebsocktProtocolError):
+        FrameParser().parse(raw_bytes)
+
+
+def test_fragment_is_parsed():
+    raw_bytes = bytes(FrameFactory.generate_bytes(
+        payload='spam', fin_bit=0, opcode=Frame.OPCODE_TEXT,
+        mask_payload=False,
+    ))
+
+    frame = FrameParser().parse(raw_bytes)
+
+    assert frame.fin_bit == 0
+    assert frame.payload == 'spam'
+
+
+@pytest.mark.parametrize("fin_bit, payload", [(0, 'ping'), (1, 'p' * 126)])
+def test_invalid_control_frame(fin_bit, payload):
+    raw_bytes = bytes(FrameFactory.generate_bytes(
+        payload=payload, fin_bit=fin_bit, opcode=Frame.OPCODE_PING,
+        mask_payload=False,
+    ))
+
+    with pytest.raises(WebsocktProtocolError):
+        FrameParser().parse(raw_bytes)
+
+
+def test_max_payload_length():
+    parser = FrameParser(max_payload_length=200)
+
+    assert parser.parse(server_frame('x' * 200)).payload == 'x' * 200
+    with pytest.raises(WebsocktProtocolError):
+        # the header alone is enough
+        parser.parse(server_frame('x' * 201)[:4])
+
+
+def test_from_bytes_incomplete():
+    raw_bytes = server_frame('d' * 10)
+
+    with pytest.raises(IncompleteFrameError) as exc_info:
+        FrameFactory.from_bytes(raw_bytes[:5])
+
+    assert exc_info.value.required_bytes == 7
+
+
+@pytest.mark.parametrize("data", ['', 'a', 'abcde', 'ü' * 1001, b'\x00\xff'])
+@pytest.mark.parametrize("accelerated", [True, False])
+def test_generate_mask(data, accelerated):
+    mask_key = b'\x10\xc6\xc4\x16'
+    data_bytes = data.encode('utf-8') if isinstance(data, str) else data
+    expected = bytes(
+        byte ^ mask_key[i % 4] for i, byte in enumerate(data_bytes)
+    )
+
+    if accelerated:
+        pytest.importorskip('wsaccel')
+        masked = FrameFactory.generate_mask(mask_key, data)
+    else:
+        with patch.object(frames, 'XorMaskerSimple', None):
+            masked = FrameFactory.generate_mask(mask_key, data)
+
+    assert masked == expected
+
+
+@pytest.mark.parametrize("length", [0, 125, 126, 65535, 65536])
+def test_generate_bytes_masked(length):
+    payload = 'é' * (length // 2) + 'e' * (length % 2)
+
+    frame = FrameFactory.generate_bytes(
+        payload=payload, fin_bit=1, opcode=Frame.OPCODE_TEXT,
+        mask_payload=True,
+    )
+
+    assert isinstance(frame, bytearray)
+    assert frame[0] == 0x81
+    assert frame[1] & 0x80
+
+    # a server sees the same frame once the mask is taken off
+    header_length = {126: 4, 127: 10}.get(frame[1] & 0x7f, 2)
+    mask_key = bytes(frame[header_length:header_length + 4])
+    unmasked = FrameFactory.generate_mask(
+        mask_key, bytes(frame[header_length + 4:]),
+    )
+    frame[1] &= 0x7f
+    server_view = bytes(frame[:header_length]) + unmasked
+
+    parsed = FrameParser().parse(server_view)
+    assert len(parsed.frame) == len(server_view)
+    assert parsed.payload == payload
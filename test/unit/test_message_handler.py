@@ -0,0 +1,192 @@
+import json
+
+import pytest
+from mock import Mock
+
+from wampy.message_handler import MessageHandler
+from wampy.messages import MESSAGE_TYPE_MAP, Error, Event, Invocation, Yield
+from wampy.serializers import JsonSerializer
+
+
+class EventCollectingMessageHandler(MessageHandler):
+
+    def __init__(self, client):
+        super(EventCollectingMessageHandler, self).__init__(client)
+        self.events = []
+
+    def handle_event(self, message_obj):
+        self.events.append(message_obj)
+
+
+def test_handlers_overridden_by_subclass_are_dispatched_to():
+    message_handler = EventCollectingMessageHandler(
+        client=Mock(serializer=JsonSerializer()),
+    )
+
+    message_handler.handle_message(
+        json.dumps([36, 1, 2, {}, ['spam'], {'message': 'eggs'}])
+    )
+
+    event, = message_handler.events
+    assert isinstance(event, Event)
+    assert event.subscription_id == 1
+    assert event.publish_args == ['spam']
+    assert event.publish_kwargs == {'message': 'eggs'}
+
+
+def test_handle_the_bytes_of_a_frame():
+    message_handler = EventCollectingMessageHandler(
+        client=Mock(serializer=JsonSerializer()),
+    )
+    receive_buffer = bytearray(b'[36, 1, 2, {}, ["\xc2\xa3"]]')
+
+    message_handler.handle_message(memoryview(receive_buffer))
+
+    event, = message_handler.events
+    assert event.publish_args == ['\xa3']
+
+
+def test_unexpected_wamp_code_is_ignored():
+    message_handler = EventCollectingMessageHandler(
+        client=Mock(serializer=JsonSerializer()),
+    )
+
+    # a PUBLISH is for Routers, not Clients
+    message_handler.handle_message(json.dumps([16, 1, {}, 'foo']))
+    message_handler.handle_message(json.dumps([999]))
+
+    assert message_handler.events == []
+
+
+@pytest.mark.parametrize('message_class', MESSAGE_TYPE_MAP.values())
+def test_messages_are_slotted(message_class):
+    # i.e. instances have no ``__dict__``
+    assert '__dict__' not in vars(message_class)
+
+
+def sent_messages(details, result, exc=None, chunk_size=None):
+    client = Mock(serializer=JsonSerializer())
+    session = client._session
+    session.registration_map = {2: 'fetch_rows'}
+    session.chunk_size = chunk_size
+    message_handler = MessageHandler(client=client)
+
+    message_handler.process_result(
+        Invocation(1, 2, details), result, exc=exc,
+    )
+
+    return [call[0][0] for call in session.send_message.call_args_list]
+
+
+def rows(count, fail=False):
+    for i in range(count):
+        yield {'row': i}
+    if fail:
+        raise ValueError('no more rows')
+
+
+def test_process_progressive_results():
+    messages = sent_messages({'receive_progress': True}, rows(3))
+
+    *progressive, final = messages
+    assert all(isinstance(message, Yield) for message in messages)
+    assert [message.options for message in progressive] == (
+        [{'progress': True}] * 3
+    )
+    assert [message.result_args for message in progressive] == [
+        [{'row': 0}], [{'row': 1}], [{'row': 2}],
+    ]
+    # the last is empty, and just ends the Call
+    assert final.options == {}
+    assert final.result_args == []
+
+
+def test_process_results_without_progress():
+    yield_message, = sent_messages({}, rows(3))
+
+    assert yield_message.options == {}
+    assert yield_message.result_args == [
+        [{'row': 0}, {'row': 1}, {'row': 2}],
+    ]
+
+
+@pytest.mark.parametrize('details, yields', [
+    ({'receive_progress': True}, 2), ({}, 0),
+])
+def test_process_results_which_fail(details, yields):
+    messages = sent_messages(details, rows(2, fail=True))
+
+    assert len(messages) == yields + 1
+    error = messages[-1]
+    assert isinstance(error, Error)
+    assert error.kwargs_dict['message'] == 'no more rows'
+
+
+def test_process_exception_sends_only_an_error():
+    error, = sent_messages({}, None, exc=ValueError('oops'))
+
+    assert isinstance(error, Error)
+
+
+@pytest.mark.parametrize('result', ['a' * 250, b'b' * 250])
+def test_process_result_in_chunks(result):
+    messages = sent_messages(
+        {'receive_progress': True}, result, chunk_size=100,
+    )
+
+    *chunks, final = messages
+    assert [message.result_args[0] for message in chunks] == [
+        result[:100], result[100:200], result[200:],
+    ]
+    assert all(message.options == {'progress': True} for message in chunks)
+    assert final.result_args == []
+    assert final.result_kwargs['meta']['chunked']
+
+
+@pytest.mark.parametrize('details, result', [
+    # the Caller cannot take progressive results
+    ({}, 'a' * 250),
+    # or there is no need
+    ({'receive_progress': True}, 'a' * 100),
+    ({'receive_progress': True}, ['a' * 250]),
+])
+def test_process_result_not_in_chunks(details, result):
+    yield_message, = sent_messages(details, result, chunk_size=100)
+
+    assert yield_message.result_args == [result]
+
+
+def test_chunks_are_kept_rather_than_invoked():
+    client = Mock(serializer=JsonSerializer())
+    session = client._session
+    session.chunks_registration_map = {3: 'fetch_rows._wampy_chunks'}
+    message_handler = MessageHandler(client=client)
+
+    message_handler.handle_invocation(Invocation(
+        1, 3, {}, call_args=['spam'], call_kwargs={
+            '_wampy_chunk': {'transfer': 'abc', 'argument': 0, 'index': 0},
+        },
+    ))
+
+    session.add_chunk.assert_called_once_with('abc', 0, 0, 'spam')
+    acknowledgement, = [
+        call[0][0] for call in session.send_message.call_args_list
+    ]
+    assert isinstance(acknowledgement, Yield)
+    assert not client.invocation_executor.submit.called
+
+
+def test_event_for_an_undecorated_handler():
+    def handler(*args, **kwargs):
+        pass
+
+    client = Mock(serializer=JsonSerializer())
+    client._session.subscription_map = {1: (handler, 'foo')}
+    message_handler = MessageHandler(client=client)
+
+    message_handler.handle_event(Event(1, 2, {}, publish_args=['spam']))
+
+    client.event_dispatcher.dispatch.assert_called_once_with(
+        1, handler, ['spam'],
+        {'meta': {'topic': 'foo', 'subscription_id': 1}},
+    )
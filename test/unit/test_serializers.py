@@ -0,0 +1,100 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from wampy.errors import WampProtocolError, WampyError
+from wampy.serializers import (
+    JSON_BACKENDS, JsonSerializer, MsgPackSerializer, SERIALIZERS,
+    get_serializer,
+)
+
+EVENT = [36, 1, 2, {}, ['spam'], {'message': 'eggs £', 'count': 2 ** 40}]
+
+
+@pytest.mark.parametrize('name', sorted(SERIALIZERS))
+def test_round_trip(name):
+    serializer = get_serializer(name)
+
+    payload = serializer.serialize(EVENT)
+
+    assert isinstance(payload, bytes)
+    assert serializer.deserialize(payload) == EVENT
+
+
+@pytest.mark.parametrize('name', sorted(SERIALIZERS))
+def test_cannot_serialize(name):
+    with pytest.raises(WampProtocolError):
+        get_serializer(name).serialize([36, object()])
+
+
+@pytest.mark.parametrize('name', ['cbor', 'msgpack'])
+def test_bytes_are_kept(name):
+    serializer = get_serializer(name)
+    message = [16, 1, {}, 'sensor', [b'\x00\xff' * 100], {}]
+
+    payload = serializer.serialize(message)
+
+    assert serializer.deserialize(payload) == message
+    # i.e. not base64 encoded
+    assert len(payload) < 220
+
+
+def test_json_cannot_serialize_bytes():
+    with pytest.raises(WampProtocolError):
+        JsonSerializer().serialize([16, 1, {}, 'sensor', [b'\x00\xff']])
+
+
+def test_msgpack_is_smaller_than_json():
+    assert len(MsgPackSerializer().serialize(EVENT)) < len(
+        JsonSerializer().serialize(EVENT)
+    )
+
+
+@pytest.mark.parametrize('name', ['cbor', 'msgpack'])
+def test_deserialize_a_memoryview(name):
+    serializer = get_serializer(name)
+    payload = bytearray(serializer.serialize(EVENT))
+
+    assert serializer.deserialize(memoryview(payload)) == EVENT
+
+
+@pytest.mark.parametrize('backend', list(JSON_BACKENDS))
+def test_json_backends_agree(backend):
+    serializer = JsonSerializer(backend=backend)
+    payload = serializer.serialize(EVENT)
+
+    # compact, and UTF-8 rather than escaped
+    assert payload == JsonSerializer(backend='json').serialize(EVENT)
+    assert serializer.deserialize(payload) == EVENT
+    assert serializer.deserialize(payload.decode('utf-8')) == EVENT
+
+    with pytest.raises(WampProtocolError):
+        serializer.serialize([36, object()])
+
+
+@pytest.mark.parametrize('backend', list(JSON_BACKENDS))
+def test_json_backends_read_a_memoryview(backend):
+    serializer = JsonSerializer(backend=backend)
+    payload = bytearray(serializer.serialize(EVENT))
+
+    assert serializer.deserialize(memoryview(payload)) == EVENT
+
+    # and check that it's UTF-8
+    with pytest.raises(ValueError):
+        serializer.deserialize(memoryview(b'["\xff"]'))
+
+
+def test_fastest_json_backend_is_the_default():
+    assert JsonSerializer().backend == list(JSON_BACKENDS)[0]
+
+
+def test_unknown_json_backend():
+    with pytest.raises(WampyError):
+        JsonSerializer(backend='yaml')
+
+
+def test_unknown_serializer():
+    with pytest.raises(WampyError):
+        get_serializer('xml')
@@ -0,0 +1,100 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+from mock import patch
+
+from wampy.constants import CALL_CHUNKS, CHUNKED_TRANSFER_TIMEOUT
+from wampy.errors import WampyError
+from wampy.messages import Call, Invocation
+from wampy.session import Session
+
+
+def chunking_session(chunk_size=16):
+    # only what sending Calls needs, rather than a connection to a Router
+    session = Session.__new__(Session)
+    session.chunk_size = chunk_size
+    session._pending_requests = {}
+    session._chunk_index = {}
+    return session
+
+
+def chunked_invocation(transfer, *args):
+    return Invocation(1, 1, {}, call_args=list(args), call_kwargs={
+        CALL_CHUNKS: {'transfer': transfer, 'arguments': [0]},
+    })
+
+
+def send_call(session, *args):
+    with patch.object(Session, 'send_message') as send_message:
+        with patch.object(Session, '_send_chunk') as send_chunk:
+            session.send_request(Call(procedure='foo', args=list(args)))
+
+    call, = send_message.call_args[0]
+    return call, send_chunk.call_count
+
+
+def test_small_call_is_sent_as_usual():
+    call, chunks = send_call(chunking_session(), 'spam')
+
+    assert chunks == 0
+    assert call.args == ['spam']
+    assert 'receive_progress' not in call.options
+
+
+def test_large_call_is_sent_in_chunks():
+    call, chunks = send_call(chunking_session(), 'x' * 40, 'spam')
+
+    assert chunks == 3
+    assert call.args == [None, 'spam']
+    # so that a large result may come back in chunks too
+    assert call.options['receive_progress'] is True
+
+
+def test_chunks_are_put_back_together():
+    session = chunking_session()
+    session.add_chunk('transfer', 0, 0, 'spam ')
+    session.add_chunk('transfer', 0, 1, 'and eggs')
+
+    invocation = chunked_invocation('transfer', None)
+    session.reassemble_arguments(invocation)
+
+    assert invocation.call_args == ['spam and eggs']
+    assert session._chunk_index == {}
+
+
+def test_transfer_is_dropped_when_a_chunk_is_out_of_order():
+    session = chunking_session()
+    session.add_chunk('transfer', 0, 0, 'spam')
+
+    with pytest.raises(WampyError):
+        session.add_chunk('transfer', 0, 2, 'eggs')
+
+    assert session._chunk_index == {}
+
+
+def test_transfer_is_dropped_when_too_large():
+    session = chunking_session()
+
+    with patch('wampy.session.CHUNKED_TRANSFER_MAX_SIZE', 6):
+        session.add_chunk('transfer', 0, 0, 'spam')
+        with pytest.raises(WampyError):
+            session.add_chunk('transfer', 0, 1, 'eggs')
+
+    assert session._chunk_index == {}
+
+
+def test_abandoned_transfers_expire():
+    session = chunking_session()
+
+    with patch('wampy.session.time.monotonic') as monotonic:
+        monotonic.return_value = 100
+        session.add_chunk('abandoned', 0, 0, 'spam')
+        monotonic.return_value = 101
+        session.add_chunk('transfer', 0, 0, 'spam')
+
+        monotonic.return_value = 100 + CHUNKED_TRANSFER_TIMEOUT
+        session.add_chunk('transfer', 0, 1, 'eggs')
+
+    assert list(session._chunk_index) == ['transfer']
@@ -0,0 +1,639 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import socket
+
+import gevent
+import gevent.socket
+import pytest
+from mock import patch
+
+from wampy.backends import async_adapter
+from wampy.errors import WampyError, WebsocktProtocolError
+from wampy.serializers import MsgPackSerializer
+from wampy.testing.helpers import server_frame
+from wampy.transports.websocket.connection import WebSocket
+from wampy.transports.websocket.deflate import PerMessageDeflate
+from wampy.transports.websocket.frames import (
+    Frame, FrameFactory, FrameParser,
+)
+
+
+class RecordingSocket(object):
+    """ Wraps a real socket, counting the reads and writes made on it """
+
+    def __init__(self, socket):
+        self.socket = socket
+        self.reads = 0
+        self.writes = 0
+
+    def recv_into(self, buffer):
+        self.reads += 1
+        return self.socket.recv_into(buffer)
+
+    def sendall(self, data):
+        self.writes += 1
+        return self.socket.sendall(data)
+
+
+class VectoredSocket(RecordingSocket):
+
+    def __init__(self, socket):
+        super(VectoredSocket, self).__init__(socket)
+        self.sendmsg_calls = []
+
+    def sendmsg(self, buffers):
+        buffers = list(buffers)
+        self.sendmsg_calls.append(buffers)
+        # only ever send the first buffer to exercise partial writes
+        return self.socket.send(buffers[0])
+
+
+class TLSLikeSocket(RecordingSocket):
+
+    def sendmsg(self, buffers):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def socket_pair():
+    server_end, client_end = socket.socketpair()
+    yield server_end, client_end
+    server_end.close()
+    client_end.close()
+
+
+@pytest.fixture
+def websocket(socket_pair):
+    _, client_end = socket_pair
+    websocket = WebSocket(
+        server_url='ws://localhost:8080', receive_buffer_size=64,
+    )
+    websocket.socket = RecordingSocket(client_end)
+    return websocket
+
+
+def test_receive_many_frames_from_one_read(socket_pair, websocket):
+    server_end, _ = socket_pair
+    messages = ['[36, 1, 2, {}, [%s]]' % i for i in range(3)]
+    server_end.sendall(b''.join(server_frame(m) for m in messages))
+
+    received = [websocket.receive().payload for _ in messages]
+
+    assert received == messages
+    assert websocket.socket.reads == 1
+
+
+def test_receive_yields_once_per_read(socket_pair, websocket):
+    server_end, _ = socket_pair
+    messages = ['[36, 1, 2, {}, [%s]]' % i for i in range(3)]
+    server_end.sendall(b''.join(server_frame(m) for m in messages))
+
+    with patch.object(async_adapter, 'sleep') as sleep:
+        for _ in messages:
+            websocket.receive()
+
+    assert sleep.call_count == 1
+
+
+def test_receive_frame_split_across_reads(socket_pair, websocket):
+    server_end, _ = socket_pair
+    message = 'x' * 1000
+    raw_bytes = server_frame(message) + server_frame('spam')
+
+    server_end.sendall(raw_bytes[:3])
+    server_end.sendall(raw_bytes[3:])
+
+    assert websocket.receive().payload == message
+    assert websocket.receive().payload == 'spam'
+
+    # the buffer grew to fit the frame but is given back once drained
+    assert len(websocket._receive_buffer) == 64
+
+
+def test_receive_pong_is_not_returned(socket_pair, websocket):
+    server_end, _ = socket_pair
+    server_end.sendall(
+        server_frame('ping-id', opcode=Frame.OPCODE_PONG) +
+        server_frame('hello')
+    )
+
+    assert websocket.receive().payload == 'hello'
+
+
+def test_receive_awaited_pong_sets_its_event(socket_pair, websocket):
+    server_end, _ = socket_pair
+    pong_received = async_adapter.Event()
+    websocket._awaited_pongs[b'ping-id'] = pong_received
+    server_end.sendall(
+        server_frame('ping-id', opcode=Frame.OPCODE_PONG) +
+        server_frame('hello')
+    )
+
+    assert websocket.receive().payload == 'hello'
+    assert pong_received.is_set()
+    assert websocket._awaited_pongs == {}
+
+
+def test_receive_binary_ping_is_echoed(socket_pair, websocket):
+    server_end, _ = socket_pair
+    # routers such as Crossbar.io Ping with random bytes
+    payload = b'\x89\x0c\x18\xdf'
+    server_end.sendall(
+        bytes(FrameFactory.generate_bytes(
+            payload=payload, fin_bit=1, opcode=Frame.OPCODE_PING,
+            mask_payload=False,
+        )) +
+        server_frame('hello')
+    )
+
+    assert websocket.receive().payload == 'hello'
+
+    # a masked Pong: 2 byte header, 4 byte key and the payload
+    received = read_frame(server_end, 10)
+    assert received[0] == 0x80 | Frame.OPCODE_PONG
+    mask_key = bytes(received[2:6])
+    assert FrameFactory.generate_mask(mask_key, bytes(received[6:])) == (
+        payload
+    )
+
+
+def test_large_frame_gets_a_buffer_it_fits(socket_pair, websocket):
+    server_end, _ = socket_pair
+    # more than 2 ** 15 bytes, i.e. beyond a signed 16 bit length
+    message = 'y' * 40000
+    raw_bytes = server_frame(message)
+
+    server_end.sendall(raw_bytes[:100])
+    websocket._recv_into_buffer()
+    websocket._parse_buffered_frames()
+    assert websocket._frame_parser.required_bytes == len(raw_bytes) - 64
+
+    server_end.sendall(raw_bytes[100:])
+    assert websocket.receive().payload == message
+
+
+def read_frame(server_end, frame_length):
+    received = bytearray()
+    while len(received) < frame_length:
+        received.extend(server_end.recv(frame_length - len(received)))
+    return received
+
+
+def test_send_large_payload_is_vectored(socket_pair, websocket):
+    server_end, client_end = socket_pair
+    websocket.socket = VectoredSocket(client_end)
+    websocket.vectored_send_threshold = 100
+    payload = b'z' * 1000
+
+    websocket.send_frame(
+        payload, opcode=Frame.OPCODE_BINARY, mask_payload=False,
+    )
+
+    # header first, then the payload itself - not a copy of it
+    header, body = websocket.socket.sendmsg_calls[0]
+    assert bytes(header) == b'\x82\x7e\x03\xe8'
+    assert body.obj is payload
+    # and partial sends are picked up where they left off
+    assert len(websocket.socket.sendmsg_calls) == 2
+
+    frame = FrameFactory.from_bytes(read_frame(server_end, 1004))
+    assert bytes(frame._payload) == payload
+
+
+def test_send_falls_back_without_sendmsg(socket_pair, websocket):
+    server_end, client_end = socket_pair
+    websocket.socket = TLSLikeSocket(client_end)
+    websocket.vectored_send_threshold = 100
+
+    websocket.send_frame('x' * 200, opcode=Frame.OPCODE_TEXT)
+
+    received = read_frame(server_end, 208)
+    mask_key = bytes(received[4:8])
+    assert FrameFactory.generate_mask(mask_key, bytes(received[8:])) == (
+        b'x' * 200
+    )
+    # the header and payload are joined up, and written as one
+    assert websocket.socket.writes == 1
+
+
+@pytest.fixture
+def coalescing_websocket(websocket):
+    websocket.coalesce_writes = True
+    websocket.coalesce_max_bytes = 1000
+    websocket._writer_thread = async_adapter.spawn(websocket._writer)
+    yield websocket
+    websocket._writer_thread.kill()
+
+
+def test_coalesce_burst_into_one_write(socket_pair, coalescing_websocket):
+    server_end, _ = socket_pair
+    websocket = coalescing_websocket
+
+    for i in range(10):
+        websocket.send_frame('message %s' % i, opcode=Frame.OPCODE_TEXT)
+
+    assert websocket.socket.writes == 0
+
+    # the writer green thread flushes once the deadline has passed
+    async_adapter.sleep(0.05)
+    assert websocket.socket.writes == 1
+
+    # 10 masked frames, each a 2 byte header, 4 byte key and 9 byte payload
+    assert len(read_frame(server_end, 10 * 15)) == 150
+
+
+def test_coalesce_writes_when_buffer_fills(coalescing_websocket):
+    websocket = coalescing_websocket
+
+    for _ in range(10):
+        websocket.send_frame('x' * 100, opcode=Frame.OPCODE_TEXT)
+
+    # each frame is 108 bytes, so the 10th crosses the 1000 byte threshold
+    assert websocket.socket.writes == 1
+    assert not websocket._write_buffer
+
+
+def test_coalesce_large_frame_is_not_held_back(coalescing_websocket):
+    websocket = coalescing_websocket
+
+    websocket.send_frame('small', opcode=Frame.OPCODE_TEXT)
+    websocket.send_frame('x' * 2000, opcode=Frame.OPCODE_TEXT)
+
+    # written out straight away, along with the small one held back
+    assert websocket.socket.writes == 1
+    assert not websocket._write_buffer
+
+
+def test_flush(coalescing_websocket):
+    websocket = coalescing_websocket
+
+    websocket.send_frame('small', opcode=Frame.OPCODE_TEXT)
+    websocket.flush()
+
+    assert websocket.socket.writes == 1
+    assert not websocket._write_buffer
+
+
+def handshake_response(subprotocol):
+    return (
+        'HTTP/1.1 101 Switching Protocols\r\n'
+        'Upgrade: WebSocket\r\n'
+        'Connection: Upgrade\r\n'
+        'Sec-WebSocket-Protocol: {}\r\n'
+        '\r\n'.format(subprotocol)
+    ).encode()
+
+
+def handshake_request(server_end):
+    request = b''
+    while not request.endswith(b'\r\n\r\n'):
+        request += server_end.recv(1024)
+    return request.decode()
+
+
+def test_handshake_asks_for_the_serializers_subprotocol(socket_pair):
+    server_end, client_end = socket_pair
+    websocket = WebSocket(
+        server_url='ws://localhost:8080', serializer=MsgPackSerializer(),
+    )
+    websocket.socket = client_end
+    server_end.sendall(handshake_response('wamp.2.msgpack'))
+
+    websocket._handshake(upgrade=True)
+
+    assert (
+        'Sec-WebSocket-Protocol: wamp.2.msgpack' in
+        handshake_request(server_end)
+    )
+
+
+def test_handshake_fails_for_another_subprotocol(socket_pair):
+    server_end, client_end = socket_pair
+    websocket = WebSocket(
+        server_url='ws://localhost:8080', serializer=MsgPackSerializer(),
+    )
+    websocket.socket = client_end
+    server_end.sendall(handshake_response('wamp.2.json'))
+
+    with pytest.raises(WampyError):
+        websocket._handshake(upgrade=True)
+
+
+def test_send_binary_serialization(socket_pair):
+    server_end, client_end = socket_pair
+    websocket = WebSocket(
+        server_url='ws://localhost:8080', serializer=MsgPackSerializer(),
+    )
+    websocket.socket = client_end
+    message = [48, 1, {}, 'foo', [b'\x00\xff'], {}]
+
+    websocket.send(message)
+
+    payload = websocket.serializer.serialize(message)
+    received = read_frame(server_end, 6 + len(payload))
+    assert received[0] == 0x80 | Frame.OPCODE_BINARY
+    mask_key = bytes(received[2:6])
+    assert websocket.serializer.deserialize(
+        FrameFactory.generate_mask(mask_key, bytes(received[6:]))
+    ) == message
+
+
+def test_receive_compressed_frame(socket_pair, websocket):
+    server_end, _ = socket_pair
+    websocket._deflater = PerMessageDeflate().accept('permessage-deflate')
+    message = '[36, 1, 2, {}, ["%s"]]' % ('spam' * 100)
+    # the Router's compressor, whose context is kept like ours
+    router = PerMessageDeflate().accept('permessage-deflate')
+    for _ in range(2):
+        server_end.sendall(bytes(FrameFactory.generate_bytes(
+            payload=router.compress(message), fin_bit=1,
+            opcode=Frame.OPCODE_TEXT, mask_payload=False, rsv1=1,
+        )))
+
+    assert websocket.receive().payload == message
+    assert websocket.receive().payload == message
+
+
+def test_receive_compressed_frame_not_agreed(socket_pair, websocket):
+    server_end, _ = socket_pair
+    server_end.sendall(bytes(FrameFactory.generate_bytes(
+        payload=b'\x00', fin_bit=1, opcode=Frame.OPCODE_TEXT,
+        mask_payload=False, rsv1=1,
+    )))
+
+    with pytest.raises(WebsocktProtocolError):
+        websocket.receive()
+
+
+@pytest.mark.parametrize("repeat, compressed", [(1, False), (100, True)])
+def test_send_compressed_above_threshold(socket_pair, repeat, compressed):
+    server_end, client_end = socket_pair
+    websocket = WebSocket(server_url='ws://localhost:8080')
+    websocket.socket = client_end
+    websocket._deflater = PerMessageDeflate(threshold=128).accept(
+        'permessage-deflate'
+    )
+    message = [16, 1, {}, 'foo', ['spam'] * repeat, {}]
+
+    websocket.send(message)
+
+    # both frames are short: 2 byte header and 4 byte key
+    received = bytearray(server_end.recv(65536))
+    assert received[1] & 0x7f < 126
+    assert bool(received[0] & 0x40) is compressed
+
+    payload = FrameFactory.generate_mask(
+        bytes(received[2:6]), bytes(received[6:]),
+    )
+    if compressed:
+        payload = PerMessageDeflate().accept(
+            'permessage-deflate'
+        ).decompress(payload)
+
+    assert websocket.serializer.deserialize(payload) == message
+
+
+def test_send_uncompressed_with_a_window_of_8_bits(socket_pair):
+    server_end, client_end = socket_pair
+    websocket = WebSocket(server_url='ws://localhost:8080')
+    websocket.socket = client_end
+    websocket._deflater = PerMessageDeflate(threshold=128).accept(
+        'permessage-deflate; client_max_window_bits=8'
+    )
+    message = [16, 1, {}, 'foo', ['spam'] * 100, {}]
+
+    websocket.send(message)
+
+    received = bytearray(server_end.recv(65536))
+    assert not received[0] & 0x40
+
+    length = received[1] & 0x7f
+    assert length == 126
+    payload = FrameFactory.generate_mask(
+        bytes(received[4:8]), bytes(received[8:]),
+    )
+    assert websocket.serializer.deserialize(payload) == message
+
+
+def fragments(payload, size, opcode=Frame.OPCODE_TEXT, rsv1=0):
+    chunks = [payload[i:i + size] for i in range(0, len(payload), size)]
+    return [
+        server_frame(
+            chunk, opcode=opcode if i == 0 else Frame.OPCODE_CONT,
+            fin_bit=int(i == len(chunks) - 1), rsv1=rsv1 if i == 0 else 0,
+        )
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def test_receive_fragmented_message(socket_pair, websocket):
+    server_end, _ = socket_pair
+    message = '[50, 1, {}, ["%s"]]' % ('x' * 1000)
+    first, *rest = fragments(message, 300)
+    # a Ping may come between fragments, and is answered straight away
+    server_end.sendall(
+        first + server_frame('ping', opcode=Frame.OPCODE_PING) +
+        b''.join(rest) + server_frame('spam')
+    )
+
+    assert websocket.receive().payload == message
+    assert websocket.receive().payload == 'spam'
+
+    pong = read_frame(server_end, 10)
+    assert pong[0] == 0x80 | Frame.OPCODE_PONG
+
+
+def test_receive_fragmented_binary_message(socket_pair, websocket):
+    server_end, _ = socket_pair
+    message = bytes(range(256)) * 4
+    server_end.sendall(
+        b''.join(fragments(message, 100, opcode=Frame.OPCODE_BINARY))
+    )
+
+    frame = websocket.receive()
+
+    assert frame.opcode == Frame.OPCODE_BINARY
+    assert bytes(frame.payload) == message
+
+
+def test_receive_fragmented_compressed_message(socket_pair, websocket):
+    server_end, _ = socket_pair
+    websocket._deflater = PerMessageDeflate().accept('permessage-deflate')
+    message = '[36, 1, 2, {}, ["%s"]]' % ('spam ' * 1000)
+    router = PerMessageDeflate().accept('permessage-deflate')
+    # compressed first, then fragmented, with only the first marked
+    server_end.sendall(b''.join(
+        fragments(router.compress(message), 10, rsv1=1)
+    ))
+
+    assert websocket.receive().payload == message
+
+
+@pytest.mark.parametrize("raw_bytes", [
+    # a continuation of nothing
+    server_frame('spam', opcode=Frame.OPCODE_CONT),
+    # a new message before the last is finished
+    server_frame('spam', fin_bit=0) + server_frame('ham'),
+])
+def test_receive_fragments_out_of_order(socket_pair, websocket, raw_bytes):
+    server_end, _ = socket_pair
+    server_end.sendall(raw_bytes)
+
+    with pytest.raises(WebsocktProtocolError):
+        websocket.receive()
+
+
+def test_receive_fragmented_message_too_large(socket_pair, websocket):
+    server_end, _ = socket_pair
+    websocket.max_message_size = 1000
+    # every fragment is small enough on its own
+    server_end.sendall(b''.join(fragments('x' * 1001, 100)))
+
+    with pytest.raises(WebsocktProtocolError):
+        websocket.receive()
+
+
+def test_receive_frame_too_large(socket_pair):
+    server_end, client_end = socket_pair
+    websocket = WebSocket(
+        server_url='ws://localhost:8080', max_message_size=1000,
+    )
+    websocket.socket = client_end
+    # only the header is needed to know it is too large
+    server_end.sendall(server_frame('x' * 1001)[:4])
+
+    with pytest.raises(WebsocktProtocolError):
+        websocket.receive()
+
+
+def test_receive_compressed_message_too_large(socket_pair, websocket):
+    server_end, _ = socket_pair
+    websocket._deflater = PerMessageDeflate().accept('permessage-deflate')
+    websocket.max_message_size = 1000
+    router = PerMessageDeflate().accept('permessage-deflate')
+    compressed = router.compress('x' * 1001)
+    assert len(compressed) < 100
+
+    server_end.sendall(server_frame(compressed, rsv1=1))
+
+    with pytest.raises(WebsocktProtocolError):
+        websocket.receive()
+
+
+def read_frames(server_end, count):
+    parser = FrameParser()
+    received = bytearray()
+    frames = []
+    while len(frames) < count:
+        frame = parser.parse(bytes(received))
+        if frame is None:
+            received.extend(server_end.recv(65536))
+            continue
+
+        frames.append((
+            frame.opcode, frame.fin_bit, frame.rsv1,
+            bytes(frame.payload_bytes),
+        ))
+        del received[:len(frame.frame)]
+
+    return frames
+
+
+@pytest.mark.parametrize("payload_length", [999, 1000, 1001])
+def test_send_fragmented(socket_pair, websocket, payload_length):
+    server_end, _ = socket_pair
+    websocket.fragment_size = 100
+    payload = bytes(range(100)) * 10 + b'!'
+
+    websocket.send_frame(
+        payload[:payload_length], opcode=Frame.OPCODE_BINARY,
+        mask_payload=False, rsv1=1,
+    )
+
+    frames = read_frames(server_end, -(-payload_length // 100))
+    opcodes, fin_bits, rsv1s, chunks = zip(*frames)
+    assert opcodes[0] == Frame.OPCODE_BINARY
+    assert set(opcodes[1:]) == {Frame.OPCODE_CONT}
+    assert fin_bits[-1] == 1 and set(fin_bits[:-1]) == {0}
+    assert rsv1s[0] == 1 and set(rsv1s[1:]) == {0}
+    assert max(len(chunk) for chunk in chunks) == 100
+    assert b''.join(chunks) == payload[:payload_length]
+
+
+def test_send_small_message_is_not_fragmented(socket_pair, websocket):
+    server_end, _ = socket_pair
+    websocket.fragment_size = 100
+
+    websocket.send_frame('x' * 100, opcode=Frame.OPCODE_TEXT,
+                         mask_payload=False)
+
+    assert read_frames(server_end, 1) == [
+        (Frame.OPCODE_TEXT, 1, 0, b'x' * 100),
+    ]
+
+
+def test_send_fragments_are_not_interleaved(socket_pair, websocket):
+    server_end, _ = socket_pair
+    websocket.fragment_size = 100
+
+    # the first sender yields between fragments, but the second must
+    # wait for the whole of the first message to have gone
+    async_adapter.spawn(
+        websocket.send_frame, 'a' * 300, Frame.OPCODE_TEXT, False,
+    )
+    async_adapter.sleep()
+    websocket.send_frame('b' * 10, Frame.OPCODE_TEXT, False)
+
+    frames = read_frames(server_end, 4)
+    assert [payload[:1] for *_, payload in frames] == [b'a'] * 3 + [b'b']
+
+
+def test_concurrent_sends_are_not_interleaved(websocket):
+    # gevent's own sockets, as the green threads are its own, whatever
+    # else has been monkey-patched in by the time this runs
+    server_end, client_end = gevent.socket.socketpair()
+    websocket.socket = client_end
+    # large enough to fill the socket's buffer, so that a write blocks
+    # part way and the other senders get a turn
+    payloads = [b'a' * 200 * 1024, b'b' * 200 * 1024, b'c' * 10]
+
+    for payload in payloads:
+        async_adapter.spawn(
+            websocket.send_frame, payload, Frame.OPCODE_BINARY, False,
+        )
+
+    with gevent.Timeout(5):
+        frames = read_frames(server_end, len(payloads))
+
+    assert sorted(payload for *_, payload in frames) == payloads
+
+    server_end.close()
+    client_end.close()
+
+
+def test_control_frames_are_not_written_inside_a_fragment(websocket):
+    server_end, client_end = gevent.socket.socketpair()
+    websocket.socket = client_end
+    websocket.fragment_size = 256 * 1024
+
+    # as ``handle_ping`` sends a Pong, straight to the socket
+    async_adapter.spawn(
+        websocket.send_frame, b'a' * 1024 * 1024, Frame.OPCODE_BINARY, False,
+    )
+    async_adapter.spawn(
+        websocket._send_raw, server_frame(b'pong', opcode=Frame.OPCODE_PONG),
+    )
+
+    with gevent.Timeout(5):
+        frames = read_frames(server_end, 5)
+
+    assert (Frame.OPCODE_PONG, 1, 0, b'pong') in frames
+    assert [
+        len(payload) for opcode, _, _, payload in frames
+        if opcode != Frame.OPCODE_PONG
+    ] == [256 * 1024] * 4
+
+    server_end.close()
+    client_end.close()
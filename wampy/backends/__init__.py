@@ -3,9 +3,11 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from wampy.config.defaults import async_name
-from wampy.constants import EVENTLET, GEVENT
+from wampy.constants import ASYNCIO, EVENTLET, GEVENT
 from wampy.errors import WampyError
 
+from . asyncio_ import Asyncio
+
 
 def get_async_adapter():
     if async_name == GEVENT:
@@ -18,9 +20,18 @@ def get_async_adapter():
         _adapter = Eventlet()
         return _adapter
 
+    if async_name == ASYNCIO:
+        _adapter = Asyncio()
+        return _adapter
+
     raise WampyError(
-        'only gevent and eventlet are supported, sorry. help out??'
+        'only gevent, eventlet and asyncio are supported, sorry. help out??'
     )
 
 
 async_adapter = get_async_adapter()
+# whichever of them the green threads run on, the ``AsyncClient`` is
+# run on asyncio
+asyncio_adapter = (
+    async_adapter if async_name == ASYNCIO else Asyncio()
+)
@@ -0,0 +1,159 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" The asyncio backend, which the ``AsyncClient`` always runs on.
+
+Where the gevent and eventlet adapters block the green thread, this one
+has coroutines to await instead: ``receive_message``, ``sleep`` and
+``run_in_thread``, as well as the ``get`` of its ``Future`` and
+``Stream``. ``Timeout`` is an ``async with`` block. Everything else -
+setting a result, putting on a queue, spawning a task - never waits, so
+is called as it is with the other backends.
+
+"""
+import asyncio
+from functools import partial
+
+from wampy.backends import futures
+from wampy.errors import WampyTimeOutError
+from wampy.interfaces import Async
+
+
+class Future(futures.Future):
+
+    async def get(self, timeout=None):
+        """ Wait for the result, and return it - or raise it, if it is an
+        exception. Raises ``WampyTimeOutError`` after ``timeout`` seconds.
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise WampyTimeOutError(
+                "no result (timed-out in {})".format(timeout)
+            )
+
+        if self._exception is not None:
+            raise self._exception
+
+        return self._value
+
+
+class Stream(futures.Stream):
+
+    def set(self, value=None):
+        self._queue.put_nowait((value, None))
+
+    def set_exception(self, exception):
+        self._queue.put_nowait((None, exception))
+
+    async def get(self, timeout=None):
+        """ Wait for the next result, and return it - or raise it, if it
+        is an exception. Raises ``WampyTimeOutError`` after ``timeout``
+        seconds.
+        """
+        value, exception = await self._receive(
+            timeout=timeout, message_queue=self._queue,
+        )
+        if exception is not None:
+            raise exception
+
+        return value
+
+
+class Timeout(object):
+    """ Raise ``WampyTimeOutError`` from an ``async with`` block which
+    has not finished within ``timeout`` seconds, e.g. ::
+
+        async with async_adapter.Timeout(5):
+            await connection.connect()
+
+    """
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._handle = None
+        self._expired = False
+
+    async def __aenter__(self):
+        task = asyncio.current_task()
+        self._handle = asyncio.get_running_loop().call_later(
+            self.timeout, self._expire, task,
+        )
+        return self
+
+    async def __aexit__(self, exception_type, exception_value, traceback):
+        self._handle.cancel()
+        if self._expired and exception_type is asyncio.CancelledError:
+            raise WampyTimeOutError(
+                "timed-out in {}".format(self.timeout)
+            )
+
+    def _expire(self, task):
+        self._expired = True
+        task.cancel()
+
+
+class Asyncio(Async):
+
+    def __init__(self, message_queue=None):
+        # a default for ``receive_message``, made when it is first needed,
+        # as older asyncio queues belong to the loop they are made in
+        self.message_queue = message_queue
+
+    def __str__(self):
+        return 'AsyncioAsyncAdapter'
+
+    def queue(self, maxsize=None):
+        return asyncio.Queue(maxsize or 0)
+
+    def Timeout(self, timeout):
+        return Timeout(timeout)
+
+    def Lock(self):
+        return asyncio.Lock()
+
+    def Semaphore(self, value=1):
+        return asyncio.BoundedSemaphore(value)
+
+    def Event(self):
+        return asyncio.Event()
+
+    def Future(self):
+        return Future(event=self.Event())
+
+    def Stream(self):
+        return Stream(queue=self.queue(), receive=self.receive_message)
+
+    @property
+    def QueueEmpty(self):
+        return asyncio.QueueEmpty
+
+    async def receive_message(self, timeout, message_queue=None):
+        # awaited every time a Client expects to recieve a Message, so
+        # that the loop is free until one arrives
+        q = message_queue
+        if q is None:
+            if self.message_queue is None:
+                self.message_queue = self.queue()
+            q = self.message_queue
+
+        try:
+            message = await asyncio.wait_for(q.get(), timeout)
+        except asyncio.TimeoutError:
+            raise WampyTimeOutError(
+                "no message returned (timed-out in {})".format(timeout)
+            )
+        return message
+
+    def spawn(self, fn, *args, **kwargs):
+        # ``fn`` is a coroutine function, run in a task of its own
+        return asyncio.ensure_future(fn(*args, **kwargs))
+
+    async def sleep(self, time=0):
+        await asyncio.sleep(time)
+
+    async def run_in_thread(self, fn, *args, **kwargs):
+        # only the awaiting task waits on the native thread
+        return await asyncio.get_running_loop().run_in_executor(
+            None, partial(fn, *args, **kwargs),
+        )
@@ -3,21 +3,38 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import eventlet
+import eventlet.semaphore
+import eventlet.tpool
+from eventlet.green import threading
 
+from wampy.backends.futures import Future, Stream
 from wampy.errors import WampyTimeOutError
 from wampy.interfaces import Async
 
 
 class Eventlet(Async):
 
-    def __init__(self, message_queue=eventlet.queue.Queue()):
-        self.message_queue = message_queue
+    def __init__(self, message_queue=None):
+        # a default for ``receive_message``. each wampy ``Session`` has
+        # its own queue(s) so that ``Clients`` never share messages.
+        self.message_queue = (
+            eventlet.queue.Queue() if message_queue is None else message_queue
+        )
 
     def __str__(self):
         return 'EventletAsyncAdapter'
 
-    def queue(self):
-        return eventlet.queue.Queue()
+    def queue(self, maxsize=None):
+        return eventlet.queue.Queue(maxsize)
+
+    def Event(self):
+        return threading.Event()
+
+    def Future(self):
+        return Future(event=self.Event())
+
+    def Stream(self):
+        return Stream(queue=self.queue(), receive=self.receive_message)
 
     @property
     def QueueEmpty(self):
@@ -26,10 +43,20 @@ class Eventlet(Async):
     def Timeout(self, timeout, raise_after=True):
         return eventlet.Timeout(timeout, raise_after)
 
-    def receive_message(self, timeout):
+    def Lock(self):
+        return eventlet.semaphore.Semaphore()
+
+    def Semaphore(self, value=1):
+        return eventlet.semaphore.BoundedSemaphore(value)
+
+    def receive_message(self, timeout, message_queue=None):
+        # executed every time a Client expects to recieve a Message, and
+        # blocks on the queue so that the hub is free until one arrives
+        q = self.message_queue if message_queue is None else message_queue
+
         try:
-            message = self._wait_for_message(timeout)
-        except eventlet.Timeout:
+            message = q.get(timeout=timeout)
+        except eventlet.queue.Empty:
             raise WampyTimeOutError(
                 "no message returned (timed-out in {})".format(timeout)
             )
@@ -42,12 +69,6 @@ class Eventlet(Async):
     def sleep(self, time=0):
         eventlet.sleep(time)
 
-    def _wait_for_message(self, timeout):
-        q = self.message_queue
-
-        with eventlet.Timeout(timeout):
-            while q.qsize() == 0:
-                eventlet.sleep()
-
-        message = q.get()
-        return message
+    def run_in_thread(self, fn, *args, **kwargs):
+        # only the calling green thread waits on the native thread
+        return eventlet.tpool.execute(fn, *args, **kwargs)
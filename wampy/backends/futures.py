@@ -0,0 +1,83 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from wampy.errors import WampyTimeOutError
+
+
+class Future(object):
+    """ The eventual result of some work, waited on by blocking the
+    green thread rather than by polling for it.
+
+    Created by the async adapters, i.e. ``async_adapter.Future()``.
+
+    """
+    def __init__(self, event):
+        # an ``Event`` of the async adapter, set once there is a result
+        self._event = event
+        self._value = None
+        self._exception = None
+
+    def set(self, value=None):
+        self._value = value
+        self._event.set()
+
+    def set_exception(self, exception):
+        self._exception = exception
+        self._event.set()
+
+    def done(self):
+        return self._event.is_set()
+
+    def get(self, timeout=None):
+        """ Block until there is a result, and return it - or raise it,
+        if it is an exception.
+
+        :Parameters:
+            timeout : float
+                Seconds to wait for before raising ``WampyTimeOutError``.
+                Defaults to forever.
+
+        """
+        if not self._event.wait(timeout):
+            raise WampyTimeOutError(
+                "no result (timed-out in {})".format(timeout)
+            )
+
+        if self._exception is not None:
+            raise self._exception
+
+        return self._value
+
+
+class Stream(object):
+    """ Like a ``Future``, but of many results, each of which is waited
+    on in turn, e.g. the progressive RESULTs of a Call.
+
+    Created by the async adapters, i.e. ``async_adapter.Stream()``.
+
+    """
+    def __init__(self, queue, receive):
+        # an unbounded queue of the async adapter, and its
+        # ``receive_message`` to wait on it with
+        self._queue = queue
+        self._receive = receive
+
+    def set(self, value=None):
+        self._queue.put((value, None))
+
+    def set_exception(self, exception):
+        self._queue.put((None, exception))
+
+    def get(self, timeout=None):
+        """ Block until there is another result, and return it - or raise
+        it, if it is an exception. Raises ``WampyTimeOutError`` after
+        ``timeout`` seconds.
+        """
+        value, exception = self._receive(
+            timeout=timeout, message_queue=self._queue,
+        )
+        if exception is not None:
+            raise exception
+
+        return value
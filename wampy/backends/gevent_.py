@@ -3,35 +3,60 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import gevent
+import gevent.event
+import gevent.lock
 import gevent.queue
 
+from wampy.backends.futures import Future, Stream
 from wampy.errors import WampyTimeOutError
 from wampy.interfaces import Async
 
 
 class Gevent(Async):
 
-    def __init__(self, message_queue=gevent.queue.Queue()):
-        self.message_queue = message_queue
+    def __init__(self, message_queue=None):
+        # a default for ``receive_message``. each wampy ``Session`` has
+        # its own queue(s) so that ``Clients`` never share messages.
+        self.message_queue = (
+            gevent.queue.Queue() if message_queue is None else message_queue
+        )
 
     def __str__(self):
         return 'GeventAsyncAdapter'
 
-    def queue(self):
-        # TODO: why?
-        return gevent.queue.Queue()
+    def queue(self, maxsize=None):
+        return gevent.queue.Queue(maxsize)
 
     def Timeout(self, timeout, raise_after=True):
         return gevent.Timeout(timeout, raise_after)
 
+    def Lock(self):
+        return gevent.lock.Semaphore()
+
+    def Semaphore(self, value=1):
+        return gevent.lock.BoundedSemaphore(value)
+
+    def Event(self):
+        return gevent.event.Event()
+
+    def Future(self):
+        return Future(event=self.Event())
+
+    def Stream(self):
+        return Stream(queue=self.queue(), receive=self.receive_message)
+
     @property
     def QueueEmpty(self):
         return gevent.queue.Empty
 
-    def receive_message(self, timeout):
+    def receive_message(self, timeout, message_queue=None):
+        # executed every time a Client expects to recieve a Message, and
+        # blocks on the queue so that the hub is free until one arrives
+        q = self.message_queue if message_queue is None else message_queue
+
         try:
-            message = self._wait_for_message(timeout)
-        except gevent.Timeout:
+            message = q.get(timeout=timeout)
+        except gevent.queue.Empty:
             raise WampyTimeOutError(
                 "no message returned (timed-out in {})".format(timeout)
             )
@@ -44,13 +69,6 @@ class Gevent(Async):
     def sleep(self, time=0):
         gevent.sleep(time)
 
-    def _wait_for_message(self, timeout):
-        # executed every time a Client expects to recieve a Message
-        q = self.message_queue
-
-        with gevent.Timeout(timeout):
-            while q.qsize() == 0:
-                gevent.sleep()
-
-        message = q.get()
-        return message
+    def run_in_thread(self, fn, *args, **kwargs):
+        # only the calling green thread waits on the native thread
+        return gevent.get_hub().threadpool.apply(fn, args, kwargs)
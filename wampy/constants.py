@@ -8,8 +8,24 @@ DEFAULT_PORT = 8080
 DEFAULT_ROUTER_URL = "ws://{}/{}".format(DEFAULT_HOST, DEFAULT_PORT)
 
 WEBSOCKET_VERSION = 13
-WEBSOCKET_SUBPROTOCOLS = 'wamp.2.json'
 WEBSOCKET_SUCCESS_STATUS = 101
+# bytes requested from the socket per ``recv`` by a WebSocket
+WEBSOCKET_RECEIVE_BUFFER_SIZE = 64 * 1024  # 64 KiB
+# payloads of at least this many bytes are sent without being copied in
+# behind their frame header, using a vectored write where possible
+WEBSOCKET_VECTORED_SEND_THRESHOLD = 64 * 1024  # 64 KiB
+# when a WebSocket coalesces writes, frames are held back until this many
+# bytes are waiting or this many seconds have passed
+WEBSOCKET_COALESCE_MAX_BYTES = 64 * 1024  # 64 KiB
+WEBSOCKET_COALESCE_DELAY = 0.001  # seconds
+# with permessage-deflate agreed, smaller messages are sent uncompressed
+WEBSOCKET_DEFLATE_THRESHOLD = 128  # bytes
+# the largest message accepted from the Router, whether in one frame or
+# reassembled from many, and once inflated
+WEBSOCKET_MAX_MESSAGE_SIZE = 16 * 1024 * 1024  # 16 MiB
+
+# see ``wampy.serializers.SERIALIZERS``
+DEFAULT_SERIALIZER = 'json'
 
 CALLEE = 'CALLEE'
 CALLER = 'CALLER'
@@ -41,6 +57,44 @@ DEFAULT_ROLES = {
 }
 DEFAULT_TIMEOUT = 10  # seconds
 
+# the most INVOCATIONs a Callee handles at once
+DEFAULT_INVOCATION_CONCURRENCY = 100
+# the most INVOCATIONs of a procedure with limits of its own that may
+# wait for it, beyond which they are rejected
+DEFAULT_MAX_QUEUED_INVOCATIONS = 100
+
+# with chunked transfers, the keyword arguments of a Call which carry a
+# chunk of a large argument, or say where to find them
+CALL_CHUNK = '_wampy_chunk'
+CALL_CHUNKS = '_wampy_chunks'
+# the chunks are sent not to the procedure itself but to this one, which
+# a Callee with chunked transfers registers beside it. so a Callee
+# without, e.g. one which is not wampy, fails the first chunk rather
+# than being Called with it.
+CHUNKS_PROCEDURE_SUFFIX = '._wampy_chunks'
+# a Callee forgets the chunks of a Call that has not followed them
+# within this long of the last,
+CHUNKED_TRANSFER_TIMEOUT = 60  # seconds
+# or that add up to more than this, in bytes (or characters of a str)
+CHUNKED_TRANSFER_MAX_SIZE = 256 * 1024 * 1024  # 256 MiB
+
+# EVENTs wait for their Subscriber in a queue per Subscription, and when
+# it is full...
+DEFAULT_MAX_QUEUED_EVENTS = 1000
+# ...the reader waits for room,
+BLOCK = 'block'
+# or the oldest queued EVENT is dropped for the new one,
+DROP_OLDEST = 'drop_oldest'
+# or the new EVENT is dropped.
+DROP_NEWEST = 'drop_newest'
+OVERFLOW_POLICIES = [BLOCK, DROP_OLDEST, DROP_NEWEST]
+# the most EVENTs for a Subscription to handle at once, if not in order
+DEFAULT_EVENT_CONCURRENCY = 10
+# batches of EVENTs are handed to a Subscriber once full, or this long
+# after their first EVENT
+DEFAULT_EVENT_BATCH_SIZE = 100
+DEFAULT_EVENT_BATCH_WINDOW_MS = 10
+
 # disabled by default. override with OS env variables.
 DEFAULT_HEARTBEAT_SECONDS = 0
 DEFAULT_HEARTBEAT_TIMEOUT_SECONDS = 2
@@ -49,7 +103,9 @@ SUBSCRIBER = "subscriber"
 
 # WAMP URIs
 NOT_AUTHORISED = 'wamp.error.not_authorized'
+PROCEDURE_OVERLOADED = 'wamp.error.procedure_overloaded'
 
 GEVENT = 'gevent'
 EVENTLET = 'eventlet'
-EVENT_LOOP_BACKENDS = [EVENTLET, GEVENT]
+ASYNCIO = 'asyncio'
+EVENT_LOOP_BACKENDS = [ASYNCIO, EVENTLET, GEVENT]
@@ -0,0 +1,161 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import logging
+from time import monotonic
+
+from wampy.backends import async_adapter
+from wampy.constants import (
+    BLOCK, DEFAULT_EVENT_CONCURRENCY, DEFAULT_MAX_QUEUED_EVENTS, DROP_NEWEST,
+    DROP_OLDEST, OVERFLOW_POLICIES,
+)
+from wampy.errors import WampyError
+
+logger = logging.getLogger('wampy.dispatchers')
+
+
+class EventDispatcher(object):
+
+    def __init__(
+        self, ordered=True, max_concurrency=DEFAULT_EVENT_CONCURRENCY,
+        max_queued=DEFAULT_MAX_QUEUED_EVENTS, overflow=BLOCK,
+    ):
+        """ Hands EVENTs to their Subscribers in green threads, so that
+        the green thread reading from the Router is free for everything
+        else, e.g. RESULTs.
+
+        EVENTs wait in a queue per Subscription, and Subscriptions are
+        handled in parallel.
+
+        :Parameters:
+            ordered : bool
+                Handle the EVENTs of a Subscription one at a time, in the
+                order they were published. Defaults to ``True``.
+            max_concurrency : int
+                Otherwise, the most EVENTs of a Subscription to handle at
+                once. Defaults to
+                ``wampy.constants.DEFAULT_EVENT_CONCURRENCY``.
+            max_queued : int
+                The most EVENTs to queue per Subscription, or ``None``
+                for no limit. Defaults to
+                ``wampy.constants.DEFAULT_MAX_QUEUED_EVENTS``.
+            overflow : str
+                What to do with an EVENT when its queue is full. Either
+                ``"block"`` the reader until there is room, which pushes
+                back on the Router, or drop the oldest queued EVENT,
+                ``"drop_oldest"``, or the new one, ``"drop_newest"``.
+                Defaults to ``"block"``.
+
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise WampyError(
+                "overflow must be one of {}, not {}".format(
+                    ", ".join(OVERFLOW_POLICIES), overflow,
+                )
+            )
+        if max_queued is not None and max_queued < 1:
+            raise WampyError("max_queued must be at least 1")
+
+        self.ordered = ordered
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self.overflow = overflow
+        # the number of EVENTs dropped by the overflow policy
+        self.dropped = 0
+
+        self._queues = {}
+        self._workers = {}
+
+    def dispatch(self, subscription_id, handler, args, kwargs):
+        """ Queue an EVENT for ``handler``, the Subscriber. """
+        self._enqueue(subscription_id, (handler, args, kwargs), self._work)
+
+    def dispatch_to_batch(
+        self, subscription_id, handler, event, batch_size, batch_window,
+    ):
+        """ Queue an EVENT for ``handler``, the Subscriber, which is
+        called with a list of up to ``batch_size`` of them at a time.
+
+        A batch is handed over as soon as it is full, or once
+        ``batch_window`` seconds have passed since its first EVENT.
+
+        """
+        self._enqueue(
+            subscription_id, event, self._work_in_batches,
+            handler, batch_size, batch_window,
+        )
+
+    def _enqueue(self, subscription_id, item, work, *work_args):
+        try:
+            queue = self._queues[subscription_id]
+        except KeyError:
+            queue = self._queues[subscription_id] = async_adapter.queue(
+                self.max_queued,
+            )
+            self._workers[subscription_id] = []
+
+        if queue.full():
+            if self.overflow == DROP_NEWEST:
+                self._drop(subscription_id)
+                return
+
+            if self.overflow == DROP_OLDEST:
+                try:
+                    queue.get_nowait()
+                except async_adapter.QueueEmpty:
+                    pass
+                else:
+                    self._drop(subscription_id)
+
+        # with ``BLOCK`` this waits until there is room
+        queue.put(item)
+
+        workers = self._workers[subscription_id]
+        if len(workers) < (1 if self.ordered else self.max_concurrency):
+            workers.append(async_adapter.spawn(work, queue, *work_args))
+
+    def stop(self):
+        """ Stop handling EVENTs, dropping any still queued. """
+        for workers in self._workers.values():
+            for worker in workers:
+                worker.kill()
+
+        self._queues = {}
+        self._workers = {}
+
+    def _drop(self, subscription_id):
+        self.dropped += 1
+        logger.warning(
+            "queue for subscription %s is full: dropped an EVENT",
+            subscription_id,
+        )
+
+    def _work(self, queue):
+        while True:
+            handler, args, kwargs = queue.get()
+            try:
+                handler(*args, **kwargs)
+            except Exception:
+                logger.exception("error handling EVENT with %s", handler)
+
+    def _work_in_batches(self, queue, handler, batch_size, batch_window):
+        while True:
+            batch = [queue.get()]
+            deadline = monotonic() + batch_window
+
+            while len(batch) < batch_size:
+                # returns straight away whilst EVENTs are queued
+                try:
+                    batch.append(
+                        queue.get(timeout=max(0, deadline - monotonic()))
+                    )
+                except async_adapter.QueueEmpty:
+                    break
+
+            try:
+                handler(batch)
+            except Exception:
+                logger.exception(
+                    "error handling %s EVENTs with %s", len(batch), handler,
+                )
@@ -30,3 +30,7 @@ class WampyTimeOutError(Exception):
 
 class NoFrameReturnedError(Exception):
     pass
+
+
+class ExecutorSaturatedError(Exception):
+    pass
@@ -0,0 +1,190 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" Executors run a ``Client``'s procedures on its behalf, so that an
+INVOCATION never holds up the green thread reading from the Router.
+
+Every INVOCATION is handled by a green thread of its own, and at most
+``max_concurrency`` at once. When an executor is saturated, ``submit``
+blocks until a worker is free. The reader then stops reading, and so
+back-pressure reaches the Router via the TCP socket rather than wampy
+queueing up work without bound.
+
+An executor can instead have ``max_queued`` INVOCATIONs wait for a
+worker without holding up the reader, beyond which ``submit`` raises
+``ExecutorSaturatedError``. This is how a procedure is given limits of
+its own, see ``wampy.roles.callee``.
+
+Where the procedure itself runs is down to the type of executor:
+
+    ``GreenExecutor``
+        in the green thread, which suits I/O bound procedures.
+    ``ThreadExecutor``
+        in a native thread, for procedures which block without
+        yielding to the hub, e.g. calls into C extensions.
+    ``ProcessExecutor``
+        in another process, for CPU bound procedures.
+
+"""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from wampy.backends import async_adapter
+from wampy.config.defaults import async_name
+from wampy.constants import DEFAULT_INVOCATION_CONCURRENCY, EVENTLET
+from wampy.errors import ExecutorSaturatedError, WampyError
+
+logger = logging.getLogger('wampy.executors')
+
+
+class GreenExecutor(object):
+
+    def __init__(
+        self, max_concurrency=DEFAULT_INVOCATION_CONCURRENCY, max_queued=None,
+    ):
+        """ Runs procedures in green threads.
+
+        :Parameters:
+            max_concurrency : int
+                The most procedures to run at once. Defaults to
+                ``wampy.constants.DEFAULT_INVOCATION_CONCURRENCY``.
+            max_queued : int
+                How many more may wait for a worker, in the background,
+                once all are busy. Defaults to ``None``, where ``submit``
+                itself waits instead.
+
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self._workers = async_adapter.Semaphore(max_concurrency)
+        # running and waiting, when there is a queue
+        self._accepted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        """ Call ``fn`` in a green thread of its own, once a worker is
+        free.
+
+        Waits for the worker if all ``max_concurrency`` are busy, unless
+        there is room in the queue. Raises ``ExecutorSaturatedError`` if
+        there is not.
+
+        """
+        if self.max_queued is not None:
+            if self._accepted >= self.max_concurrency + self.max_queued:
+                raise ExecutorSaturatedError(
+                    "{} running or queued already".format(self._accepted)
+                )
+
+            self._accepted += 1
+            async_adapter.spawn(self._wait_then_work, fn, args, kwargs)
+            return
+
+        if self._workers.locked():
+            logger.info(
+                "all %s workers are busy: waiting", self.max_concurrency,
+            )
+        self._workers.acquire()
+        try:
+            async_adapter.spawn(self._work, fn, args, kwargs)
+        except Exception:
+            self._workers.release()
+            raise
+
+    def call(self, procedure, *args, **kwargs):
+        """ Run the procedure and return its result. Called by the
+        green thread running a submitted INVOCATION.
+        """
+        return procedure(*args, **kwargs)
+
+    def shutdown(self):
+        pass
+
+    def _work(self, fn, args, kwargs):
+        try:
+            fn(*args, **kwargs)
+        finally:
+            self._workers.release()
+
+    def _wait_then_work(self, fn, args, kwargs):
+        try:
+            self._workers.acquire()
+            self._work(fn, args, kwargs)
+        finally:
+            self._accepted -= 1
+
+
+class ThreadExecutor(GreenExecutor):
+    """ Runs procedures in native threads, so that a procedure which
+    never yields to the hub doesn't hold up all the green threads.
+
+    The threads are those of the async backend, e.g. the gevent hub's
+    thread pool, whose size also bounds how many run at once.
+
+    """
+    def call(self, procedure, *args, **kwargs):
+        return async_adapter.run_in_thread(procedure, *args, **kwargs)
+
+
+def _call_function(function, args, kwargs):
+    # a ``Client`` cannot be sent to another process, so ``self`` is None
+    return function(None, *args, **kwargs)
+
+
+class ProcessExecutor(GreenExecutor):
+
+    def __init__(
+        self, max_concurrency=DEFAULT_INVOCATION_CONCURRENCY, max_queued=None,
+        max_workers=None,
+    ):
+        """ Runs procedures in a pool of processes, for CPU bound work.
+
+        The arguments and results must be picklable, and the procedure
+        is called without its ``Client``, i.e. ``self`` is ``None`` -
+        for it cannot be sent to another process.
+
+        Not supported with eventlet, whose monkey-patching deadlocks
+        ``multiprocessing``.
+
+        :Parameters:
+            max_concurrency : int
+                The most INVOCATIONs to accept at once. Those beyond
+                ``max_workers`` wait for a process to be free.
+            max_queued : int
+                See ``GreenExecutor``.
+            max_workers : int
+                The number of processes. Defaults to the number of CPUs.
+
+        """
+        if async_name == EVENTLET:
+            raise WampyError(
+                "the ProcessExecutor cannot be used with eventlet, sorry"
+            )
+
+        super(ProcessExecutor, self).__init__(max_concurrency, max_queued)
+        self.max_workers = max_workers
+        self._pool = None
+
+    def call(self, procedure, *args, **kwargs):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        future = self._pool.submit(
+            _call_function, procedure.__func__, args, kwargs,
+        )
+        # wampy has monkey-patched ``threading``, so this only blocks the
+        # calling green thread
+        return future.result()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+# the executors that ``callee`` may name for a procedure
+EXECUTORS = {
+    'green': GreenExecutor,
+    'thread': ThreadExecutor,
+    'process': ProcessExecutor,
+}
@@ -26,6 +26,11 @@ class Transport(object):
     def receive(self):
         pass
 
+    def flush(self):
+        """ Write out anything sent but held back, if the ``Transport``
+        holds back writes at all.
+        """
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Async(object):
@@ -35,8 +40,30 @@ class Async(object):
         pass
 
     @abc.abstractmethod
-    def receive_message(self, timeout):
-        pass
+    def Lock(self):
+        """ A lock for green threads, usable as a context manager """
+
+    @abc.abstractmethod
+    def Semaphore(self, value=1):
+        """ A bounded semaphore for green threads """
+
+    @abc.abstractmethod
+    def Event(self):
+        """ A flag that green threads can block on until it is set """
+
+    @abc.abstractmethod
+    def Future(self):
+        """ A ``wampy.backends.futures.Future`` for a single result """
+
+    @abc.abstractmethod
+    def Stream(self):
+        """ A ``wampy.backends.futures.Stream`` for many results """
+
+    @abc.abstractmethod
+    def receive_message(self, timeout, message_queue=None):
+        """ Block until there is a message on the queue, and return it,
+        else raise ``WampyTimeOutError`` after ``timeout`` seconds.
+        """
 
     @abc.abstractmethod
     def spawn(self, *args, **kwargs):
@@ -45,3 +72,41 @@ class Async(object):
     @abc.abstractmethod
     def sleep(self, time):
         pass
+
+    @abc.abstractmethod
+    def run_in_thread(self, fn, *args, **kwargs):
+        """ Call ``fn`` in a native thread, blocking only the calling
+        green thread until it returns - or raises.
+        """
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Serializer(object):
+    """ Turns WAMP messages, i.e. lists, into WebSocket payloads and
+    back again.
+
+    ``SUBPROTOCOL`` is the WebSocket subprotocol agreed with the Router,
+    e.g. "wamp.2.json", and ``BINARY`` whether payloads are sent in
+    binary rather than text frames.
+
+    """
+    SUBPROTOCOL = None
+    BINARY = False
+
+    @abc.abstractmethod
+    def serialize(self, message):
+        """ Return the payload as bytes, which for text frames are UTF-8
+        encoded - or as ``str``, which the ``Transport`` encodes.
+
+        Raises ``WampProtocolError`` if ``message`` cannot be serialized.
+        """
+
+    @abc.abstractmethod
+    def deserialize(self, payload):
+        """ Return the message of a payload received from the Router,
+        given as ``str`` or bytes-like, e.g. a ``memoryview`` over the
+        receive buffer - which is only valid until this returns.
+
+        It is up to the deserializer to reject a payload which is not
+        valid, e.g. text which is not UTF-8.
+        """
@@ -1,9 +1,15 @@
 # This Source Code Form is subject to the terms of the Mozilla Public
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
-import json
+import inspect
 import logging
+import types
 
+from wampy.backends import asyncio_adapter
+from wampy.constants import (
+    CALL_CHUNK, CALL_CHUNKS, CHUNKS_PROCEDURE_SUFFIX, PROCEDURE_OVERLOADED,
+)
+from wampy.errors import ExecutorSaturatedError, WampyError
 from wampy.messages import MESSAGE_TYPE_MAP
 from wampy.messages import Error, Yield
 
@@ -32,29 +38,38 @@ class MessageHandler(object):
     """
     def __init__(self, client):
         self.client = client
+        self._subscription_meta = {}
+
+        # WAMP code to message class and the bound method handling it,
+        # looked up once here rather than for every message received
+        self._handlers = {
+            wamp_code: (
+                message_class,
+                getattr(self, "handle_{}".format(message_class.name)),
+            )
+            for wamp_code, message_class in MESSAGE_TYPE_MAP.items()
+            if hasattr(self, "handle_{}".format(message_class.name))
+        }
 
     @property
     def session(self):
         return self.client._session
 
     def handle_message(self, message):
-        # all WAMP paylods on a websocket frame are JSON
-        message = json.loads(message)
+        # in the serialization agreed with the Router, e.g. JSON
+        message = self.client.serializer.deserialize(message)
         wamp_code = message[0]
 
-        if wamp_code not in MESSAGE_TYPE_MAP:
+        try:
+            message_class, handler = self._handlers[wamp_code]
+        except KeyError:
             logger.warning('unexpected WAMP code: %s', wamp_code)
             return
 
-        message_class = MESSAGE_TYPE_MAP[wamp_code]
         # instantiate our Message obj using the incoming payload - but slicing
         # off the WAMP code, which we already know
-        message_obj = message_class(*message[1:])
-
-        handler_name = "handle_{}".format(message_obj.name)
-        logger.info("handling %s", message_class)
-        handler = getattr(self, handler_name)
-        handler(message_obj)
+        logger.debug("handling %s", message_class.name)
+        handler(message_class(*message[1:]))
 
     def handle_abort(self, message_obj):
         logger.warning(
@@ -64,13 +79,13 @@ class MessageHandler(object):
         # we can't raise from inside a green thread (it'll not be seen) and
         # we can't gracefully disconnect and kill other remaining gthreads
         # from here, either.
-        self.session._message_queue.put(message_obj)
+        self.session.put_message(message_obj)
 
     def handle_authenticate(self, message_obj):
-        self.session._message_queue.put(message_obj)
+        self.session.put_message(message_obj)
 
     def handle_challenge(self, message_obj):
-        self.session._message_queue.put(message_obj)
+        self.session.put_message(message_obj)
 
     def handle_close(self, close_frame):
         self.session.connection.stop_pinging()
@@ -82,24 +97,52 @@ class MessageHandler(object):
 
     def handle_error(self, message_obj):
         logger.error("received error: %s", message_obj.message)
-        self.session._message_queue.put(message_obj)
+        if not self.session.resolve_request(
+            message_obj.request_id, message_obj,
+        ):
+            # not for a Call, e.g. a failed Registration, so it's
+            # the Session's business
+            self.session.put_message(message_obj)
 
     def handle_event(self, message_obj):
         session = self.session
+        subscription_id = message_obj.subscription_id
 
         payload_list = message_obj.publish_args
         payload_dict = message_obj.publish_kwargs
 
-        func, topic = session.subscription_map[message_obj.subscription_id]
+        func, topic = session.subscription_map[subscription_id]
+
+        # any callable may be a handler, not only those decorated with
+        # ``subscribe``
+        if getattr(func, 'batch_size', None):
+            # one ``meta`` is shared by every EVENT of a Subscription
+            try:
+                meta = self._subscription_meta[subscription_id]
+            except KeyError:
+                meta = self._subscription_meta[subscription_id] = {
+                    'topic': topic,
+                    'subscription_id': subscription_id,
+                }
+
+            self.client.event_dispatcher.dispatch_to_batch(
+                subscription_id, func, (payload_list, payload_dict, meta),
+                func.batch_size, func.batch_window,
+            )
+            return
 
         payload_dict['meta'] = {}
         payload_dict['meta']['topic'] = topic
-        payload_dict['meta']['subscription_id'] = message_obj.subscription_id
+        payload_dict['meta']['subscription_id'] = subscription_id
 
-        func(*payload_list, **payload_dict)
+        # the Subscriber is called by the dispatcher so that this, the
+        # green thread reading from the Router, is free for other messages
+        self.client.event_dispatcher.dispatch(
+            subscription_id, func, payload_list, payload_dict,
+        )
 
     def handle_goodbye(self, message_obj):
-        self.session._message_queue.put(message_obj)
+        self.session.put_message(message_obj)
 
     def handle_subscribed(self, message_obj):
         session = self.session
@@ -113,16 +156,68 @@ class MessageHandler(object):
     def handle_invocation(self, message_obj):
         session = self.session
 
-        args = message_obj.call_args
-        kwargs = message_obj.call_kwargs
+        if message_obj.registration_id in session.chunks_registration_map:
+            self._add_chunk(message_obj)
+            return
 
         procedure_name = session.registration_map[message_obj.registration_id]
+
         procedure = getattr(self.client, procedure_name)
 
+        # the procedure is run by an executor so that this, the green
+        # thread reading from the Router, only waits on it if all of the
+        # executor's workers are busy.
+        executor = self.client.procedure_executors.get(
+            procedure_name, self.client.invocation_executor,
+        )
+
+        try:
+            executor.submit(self.invoke, executor, message_obj, procedure)
+        except ExecutorSaturatedError as exc:
+            logger.warning("rejecting call of %s: %s", procedure_name, exc)
+            error_message = Error(
+                request_type=68,  # the failing message wamp code
+                request_id=message_obj.request_id,
+                error=PROCEDURE_OVERLOADED,
+                args_list=[procedure_name],
+            )
+            session.send_message(error_message)
+
+    def _add_chunk(self, message_obj):
+        # of a large argument, which is kept for when the Call itself
+        # arrives. acknowledging it has the Caller send the next, while
+        # an Error has it give up on the Call.
+        chunk = message_obj.call_kwargs[CALL_CHUNK]
+        try:
+            self.session.add_chunk(
+                chunk['transfer'], chunk['argument'], chunk['index'],
+                message_obj.call_args[0],
+            )
+        except WampyError as exc:
+            logger.warning("rejecting chunk: %s", exc)
+            error_message = Error(
+                request_type=68,  # the failing message wamp code
+                request_id=message_obj.request_id,
+                error=self.session.chunks_registration_map[
+                    message_obj.registration_id
+                ],
+                args_list=[str(exc)],
+            )
+            self.session.send_message(error_message)
+            return
+
+        self.session.send_message(Yield(message_obj.request_id))
+
+    def invoke(self, executor, message_obj, procedure):
         try:
-            result = procedure(*args, **kwargs)
+            if CALL_CHUNKS in message_obj.call_kwargs:
+                self.session.reassemble_arguments(message_obj)
+
+            result = executor.call(
+                procedure, *message_obj.call_args, **message_obj.call_kwargs
+            )
         except Exception as exc:
-            logger.exception("error calling: %s", procedure_name)
+            logger.exception("error calling: %s", procedure.__name__)
             result = None
             error = exc
         else:
@@ -133,23 +228,48 @@ class MessageHandler(object):
     def handle_registered(self, message_obj):
         session = self.session
         procedure_name = session.request_ids[message_obj.request_id]
-        session.registration_map[message_obj.registration_id] = procedure_name
+        if procedure_name.endswith(CHUNKS_PROCEDURE_SUFFIX):
+            registration_map = session.chunks_registration_map
+        else:
+            registration_map = session.registration_map
+        registration_map[message_obj.registration_id] = procedure_name
         logger.info("registrated %s for %s", procedure_name, self.client.name)
 
     def handle_result(self, message_obj):
+        # progressive RESULTs may be put together into one first
+        message_obj = self.session.gather_result(message_obj)
+        if message_obj is None:
+            return
+
         # result of RPC needs to be passed back to the Client app
-        self.session._message_queue.put(message_obj)
+        if not self.session.resolve_request(
+            message_obj.request_id, message_obj,
+        ):
+            logger.warning(
+                "nobody is waiting for the result of request %s - "
+                "has the Call timed out?", message_obj.request_id,
+            )
 
     def handle_welcome(self, message_obj):
         self.session.session_id = message_obj.session_id
         logger.info("Welcomed %s", self.client)
-        self.session._message_queue.put(message_obj)
+        self.session.put_message(message_obj)
         # this may look to be more appropriate on the Client following starting
         # a Session, but a Session is not guaranteed - and this is the only
         # place that it is.
         self.client._register_roles()
 
     def process_result(self, message_obj, result, exc=None):
+        """ Send the result of an INVOCATION back to the Router, or the
+        exception it raised as an ERROR.
+
+        A generator's results are sent as they are made, as progressive
+        YIELDs, if the Caller asked for progressive results. Otherwise
+        they are all sent together as one list. So too is a ``str`` or
+        ``bytes`` result larger than the ``Session``'s ``chunk_size``
+        sent in chunks, for the Caller to join back together.
+
+        """
         if self.session.session_id is None:
             logger.error(
                 'wampy has already ended the WAMP session. not processing %s',
@@ -162,20 +282,75 @@ class MessageHandler(object):
         ]
 
         if exc:
-            error_message = Error(
-                request_type=68,  # the failing message wamp code
-                request_id=message_obj.request_id,
-                error=procedure_name,
-                kwargs_dict={
-                    'exc_type': exc.__class__.__name__,
-                    'message': str(exc),
-                    'call_args': message_obj.call_args,
-                    'call_kwargs': message_obj.call_kwargs,
-                },
+            self._send_error(message_obj, procedure_name, exc)
+            return
+
+        if isinstance(result, types.GeneratorType):
+            self._process_results(message_obj, procedure_name, result)
+            return
+
+        chunk_size = self.session.chunk_size
+        if (
+            chunk_size is not None and
+            isinstance(result, (str, bytes)) and len(result) > chunk_size and
+            message_obj.details.get('receive_progress', False)
+        ):
+            self._send_chunks(message_obj, procedure_name, result, chunk_size)
+            return
+
+        self.session.send_message(
+            self._make_yield(message_obj, procedure_name, result)
+        )
+
+    def _process_results(self, message_obj, procedure_name, results):
+        progressive = message_obj.details.get('receive_progress', False)
+        collected = []
+
+        while True:
+            try:
+                result = next(results)
+            except StopIteration:
+                break
+            except Exception as exc:
+                logger.exception("error calling: %s", procedure_name)
+                self._send_error(message_obj, procedure_name, exc)
+                return
+
+            if progressive:
+                self.session.send_message(self._make_yield(
+                    message_obj, procedure_name, result, progress=True,
+                ))
+            else:
+                collected.append(result)
+
+        if progressive:
+            # an empty YIELD ends the Call
+            self.session.send_message(Yield(message_obj.request_id))
+        else:
+            self.session.send_message(
+                self._make_yield(message_obj, procedure_name, collected)
             )
-            logger.error("returning with Error: %s", error_message)
-            self.session.send_message(error_message)
 
+    def _send_chunks(self, message_obj, procedure_name, result, chunk_size):
+        for start in range(0, len(result), chunk_size):
+            self.session.send_message(Yield(
+                message_obj.request_id, options={'progress': True},
+                result_args=[result[start:start + chunk_size]],
+                result_kwargs={'meta': {'chunk': True}},
+            ))
+
+        # the last, empty YIELD has the Caller join them up
+        self.session.send_message(Yield(
+            message_obj.request_id, result_kwargs={
+                'meta': {
+                    'procedure_name': procedure_name,
+                    'session_id': self.session.id,
+                    'chunked': True,
+                },
+            },
+        ))
+
+    def _make_yield(self, message_obj, procedure_name, result, progress=False):
         result_kwargs = {}
         result_kwargs['message'] = result
         result_kwargs['meta'] = {}
@@ -183,10 +358,99 @@ class MessageHandler(object):
         result_kwargs['meta']['session_id'] = self.session.id
         result_args = [result]
 
-        yield_message = Yield(
+        return Yield(
             message_obj.request_id,
+            options={'progress': True} if progress else None,
             result_args=result_args,
             result_kwargs=result_kwargs,
         )
 
-        self.session.send_message(yield_message)
+    def _send_error(self, message_obj, procedure_name, exc):
+        error_message = Error(
+            request_type=68,  # the failing message wamp code
+            request_id=message_obj.request_id,
+            error=procedure_name,
+            kwargs_dict={
+                'exc_type': exc.__class__.__name__,
+                'message': str(exc),
+                'call_args': message_obj.call_args,
+                'call_kwargs': message_obj.call_kwargs,
+            },
+        )
+        logger.error("returning with Error: %s", error_message)
+        self.session.send_message(error_message)
+
+
+class AsyncMessageHandler(MessageHandler):
+    """ The ``MessageHandler`` of an ``AsyncClient``.
+
+    Messages are handled just as they are for a ``Client``, except that a
+    procedure, which may be a coroutine, is run in a task of its own for
+    each INVOCATION, and EVENTs are put on the ``Subscription`` that is
+    iterated over for them. The ``AsyncClient`` awaits its registrations
+    and subscriptions, so REGISTERED, SUBSCRIBED and UNSUBSCRIBED are
+    handed to it as the responses to its requests.
+
+    """
+    def handle_welcome(self, message_obj):
+        self.session.session_id = message_obj.session_id
+        logger.info("Welcomed %s", self.client)
+        self.session.put_message(message_obj)
+
+    def handle_registered(self, message_obj):
+        self.session.resolve_request(message_obj.request_id, message_obj)
+
+    handle_subscribed = handle_registered
+    handle_unsubscribed = handle_registered
+
+    def handle_event(self, message_obj):
+        subscription_id = message_obj.subscription_id
+        try:
+            subscription, topic = self.session.subscription_map[
+                subscription_id
+            ]
+        except KeyError:
+            # published before the Router had our UNSUBSCRIBE
+            return
+
+        subscription.put(
+            message_obj.publish_args, message_obj.publish_kwargs,
+            {'topic': topic, 'subscription_id': subscription_id},
+        )
+
+    def handle_invocation(self, message_obj):
+        session = self.session
+        if message_obj.registration_id in session.chunks_registration_map:
+            self._add_chunk(message_obj)
+            return
+
+        procedure_name = session.registration_map[message_obj.registration_id]
+        procedure = getattr(self.client, procedure_name)
+
+        # there is no executor: the task is free to wait on whatever it
+        # likes without holding up this, the task reading from the Router
+        task = asyncio_adapter.spawn(
+            self.invoke, None, message_obj, procedure,
+        )
+        invocation_tasks = session._invocation_tasks
+        invocation_tasks.add(task)
+        task.add_done_callback(invocation_tasks.discard)
+
+    async def invoke(self, executor, message_obj, procedure):
+        try:
+            if CALL_CHUNKS in message_obj.call_kwargs:
+                self.session.reassemble_arguments(message_obj)
+
+            result = procedure(
+                *message_obj.call_args, **message_obj.call_kwargs
+            )
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as exc:
+            logger.exception("error calling: %s", procedure.__name__)
+            result = None
+            error = exc
+        else:
+            error = None
+
+        self.process_result(message_obj, result, exc=error)
@@ -18,6 +18,8 @@ from . registered import Registered
 from . result import Result
 from . subscribe import Subscribe
 from . subscribed import Subscribed
+from . unsubscribe import Unsubscribe
+from . unsubscribed import Unsubscribed
 from . yield_ import Yield
 from . welcome import Welcome
 
@@ -25,7 +27,7 @@ from . welcome import Welcome
 __all__ = [
     Abort, Authenticate, Call, Challenge, Error, Event, Goodbye, Hello,
     Invocation, Publish, Register, Registered, Result, Subscribe,
-    Subscribed, Welcome, Yield
+    Subscribed, Unsubscribe, Unsubscribed, Welcome, Yield
 ]
 
 
@@ -40,6 +42,8 @@ MESSAGE_TYPE_MAP = {
     16: Publish,
     32: Subscribe,
     33: Subscribed,
+    34: Unsubscribe,
+    35: Unsubscribed,
     36: Event,
     48: Call,
     49: Cancel,
@@ -6,6 +6,7 @@
 class Abort(object):
     WAMP_CODE = 3
     name = "abort"
+    __slots__ = ('details', 'uri')
 
     def __init__(self, details=None, uri=None):
         """ Sent by a Peer*to abort the opening of a WAMP session.
@@ -6,6 +6,7 @@
 class Authenticate(object):
     WAMP_CODE = 5
     name = "authenticate"
+    __slots__ = ('signature', 'kwargs_dict')
 
     def __init__(self, signature, kwargs_dict=None):
         """ The "AUTHENTICATE" message is used with certain Authentication
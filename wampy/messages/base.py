@@ -1,5 +1,6 @@
 
 class Message(object):
+    __slots__ = ()
 
     def __str__(self):
         return str(self.message)
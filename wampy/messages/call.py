@@ -26,6 +26,7 @@ class Call(object):
     """
     WAMP_CODE = 48
     name = "call"
+    __slots__ = ('procedure', 'options', 'args', 'kwargs', 'request_id')
 
     def __init__(self, procedure, options=None, args=None, kwargs=None):
         super(Call, self).__init__()
@@ -22,6 +22,7 @@ class Cancel(object):
     """
     WAMP_CODE = 49
     name = "cancel"
+    __slots__ = ('request_id', 'options')
 
     def __init__(self, request_id, options=None):
         super(Cancel, self).__init__()
@@ -6,6 +6,7 @@
 class Challenge(object):
     WAMP_CODE = 4
     name = "challenge"
+    __slots__ = ('auth_method', 'kwargs_dict')
 
     def __init__(self, auth_method, kwargs_dict):
         """ The "CHALLENGE" message is used with certain Authentication
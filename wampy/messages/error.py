@@ -8,6 +8,10 @@ from wampy.errors import WampyError
 class Error(object):
     WAMP_CODE = 8
     name = "error"
+    __slots__ = (
+        'request_type', 'request_id', 'error', 'args_list', 'kwargs_dict',
+        'details',
+    )
 
     def __init__(
             self, request_type, request_id,
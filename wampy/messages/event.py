@@ -23,6 +23,10 @@ class Event(object):
     """
     WAMP_CODE = 36
     name = "event"
+    __slots__ = (
+        'subscription_id', 'publication_id', 'details', 'publish_args',
+        'publish_kwargs',
+    )
 
     def __init__(
             self, subscription_id, publication_id, details_dict,
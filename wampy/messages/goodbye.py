@@ -17,6 +17,7 @@ class Goodbye(object):
     DEFAULT_REASON = "wamp.error.close_realm"
 
     name = "goodbye"
+    __slots__ = ('details', 'reason')
 
     def __init__(
             self, details=None, reason=DEFAULT_REASON,
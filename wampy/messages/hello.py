@@ -28,6 +28,7 @@ class Hello(object):
     """
     WAMP_CODE = 1
     name = "hello"
+    __slots__ = ('realm', 'details')
 
     def __init__(self, realm, details):
         super(Hello, self).__init__()
@@ -20,6 +20,9 @@ class Invocation(Message):
     """
     WAMP_CODE = 68
     name = "invocation"
+    __slots__ = (
+        'request_id', 'registration_id', 'details', 'call_args', 'call_kwargs',
+    )
 
     def __init__(
             self, request_id, registration_id, details,
@@ -19,6 +19,7 @@ class Publish(object):
     """
     WAMP_CODE = 16
     name = "publish"
+    __slots__ = ('topic', 'options', 'request_id', 'args', 'kwargs')
 
     def __init__(self, topic, options, *args, **kwargs):
         super(Publish, self).__init__()
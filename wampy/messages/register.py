@@ -25,6 +25,7 @@ class Register(object):
     """
     WAMP_CODE = 64
     name = "register"
+    __slots__ = ('procedure', 'options', 'request_id')
 
     def __init__(self, procedure, options=None):
         super(Register, self).__init__()
@@ -8,6 +8,7 @@ class Registered(object):
     """
     WAMP_CODE = 65
     name = "registered"
+    __slots__ = ('request_id', 'registration_id')
 
     def __init__(self, request_id, registration_id):
 
@@ -23,6 +23,7 @@ class Result(Message):
     """
     WAMP_CODE = 50
     name = "result"
+    __slots__ = ('request_id', 'details', 'yield_args', 'yield_kwargs')
 
     def __init__(
             self, request_id, details_dict, yield_args=None,
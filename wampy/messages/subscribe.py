@@ -18,6 +18,7 @@ class Subscribe(object):
     """
     WAMP_CODE = 32
     name = "subscribe"
+    __slots__ = ('topic', 'options', 'request_id')
 
     def __init__(self, topic, options=None):
         super(Subscribe, self).__init__()
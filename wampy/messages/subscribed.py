@@ -12,6 +12,7 @@ class Subscribed(object):
     """
     WAMP_CODE = 33
     name = "subscribed"
+    __slots__ = ('request_id', 'subscription_id')
 
     def __init__(self, request_id, subscription_id):
         super(Subscribed, self).__init__()
@@ -0,0 +1,33 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import random
+
+
+class Unsubscribe(object):
+    """ Send an UNSUBSCRIBE message to the Router.
+
+    Message is of the format ``[UNSUBSCRIBE, Request|id,
+    SUBSCRIBED.Subscription|id]``, e.g. ::
+
+        [
+            34, 85346237, 5512315355
+        ]
+
+    """
+    WAMP_CODE = 34
+    name = "unsubscribe"
+    __slots__ = ('subscription_id', 'request_id')
+
+    def __init__(self, subscription_id):
+        super(Unsubscribe, self).__init__()
+
+        self.subscription_id = subscription_id
+        self.request_id = random.getrandbits(32)
+
+    @property
+    def message(self):
+        return [
+            self.WAMP_CODE, self.request_id, self.subscription_id,
+        ]
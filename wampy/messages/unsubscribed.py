@@ -0,0 +1,27 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+class Unsubscribed(object):
+    """ Once the _Broker_ has removed the subscription, it answers by
+    sending an "UNSUBSCRIBED" message to the _Subscriber_
+
+       [UNSUBSCRIBED, UNSUBSCRIBE.Request|id]
+
+    """
+    WAMP_CODE = 35
+    name = "unsubscribed"
+    __slots__ = ('request_id', 'details')
+
+    def __init__(self, request_id, details=None):
+        super(Unsubscribed, self).__init__()
+
+        self.request_id = request_id
+        self.details = details or {}
+
+    @property
+    def message(self):
+        return [
+            self.WAMP_CODE, self.request_id,
+        ]
@@ -16,6 +16,7 @@ class Welcome(object):
     """
     WAMP_CODE = 2
     name = "welcome"
+    __slots__ = ('session_id', 'details')
 
     def __init__(self, session_id, details_dict):
         self.session_id = session_id
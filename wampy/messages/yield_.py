@@ -29,6 +29,9 @@ class Yield(object):
     """
     WAMP_CODE = 70
     name = "yield"
+    __slots__ = (
+        'invocation_request_id', 'options', 'result_args', 'result_kwargs',
+    )
 
     def __init__(
             self, invocation_request_id, options=None, result_args=None,
@@ -2,5 +2,5 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from . clients import Client  # noqa
+from . clients import AsyncClient, Client  # noqa
 from . routers import Crossbar  # noqa
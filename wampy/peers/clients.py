@@ -5,13 +5,22 @@
 import inspect
 import logging
 
+from wampy.config.defaults import async_name
 from wampy.constants import (
-    DEFAULT_ROUTER_URL, DEFAULT_TIMEOUT, DEFAULT_ROLES, DEFAULT_REALM,
+    ASYNCIO, DEFAULT_ROUTER_URL, DEFAULT_TIMEOUT, DEFAULT_ROLES,
+    DEFAULT_REALM, DEFAULT_SERIALIZER, WEBSOCKET_MAX_MESSAGE_SIZE,
 )
-from wampy.session import Session
-from wampy.message_handler import MessageHandler
-from wampy.roles.caller import CallProxy, RpcProxy
-from wampy.roles.publisher import PublishProxy
+from wampy.dispatchers import EventDispatcher
+from wampy.errors import WampyError
+from wampy.executors import EXECUTORS, GreenExecutor
+from wampy.session import AsyncSession, Session
+from wampy.message_handler import AsyncMessageHandler, MessageHandler
+from wampy.roles.caller import (
+    AsyncCallProxy, AsyncRpcProxy, CallProxy, RpcProxy,
+)
+from wampy.roles.publisher import AsyncPublishProxy, PublishProxy
+from wampy.roles.subscriber import Subscription
+from wampy.serializers import get_serializer
 
 logger = logging.getLogger("wampy.clients")
 
@@ -23,7 +32,11 @@ class Client(object):
     def __init__(
         self, url=DEFAULT_ROUTER_URL, cert_path=None, ipv=4, name=None,
         realm=DEFAULT_REALM, roles=DEFAULT_ROLES, call_timeout=DEFAULT_TIMEOUT,
-        message_handler_cls=None,
+        message_handler_cls=None, coalesce_writes=False,
+        invocation_executor=None, event_dispatcher=None,
+        serializer=DEFAULT_SERIALIZER, compression=None,
+        max_message_size=WEBSOCKET_MAX_MESSAGE_SIZE, fragment_size=None,
+        chunk_size=None,
     ):
         """ A WAMP Client "Peer".
 
@@ -57,8 +70,60 @@ class Client(object):
                 A Caller might want to issue a call and provide a timeout after
                 which the call will finish.
                 The value should be in seconds.
+            coalesce_writes : bool
+                Opt in to briefly holding back outgoing messages so that
+                bursts of them, e.g. many publishes, go out in far fewer
+                writes to the network. Anything held back is written out
+                within a millisecond, when the ``Client`` waits for a
+                reply, or on ``flush``. Defaults to ``False``.
+            invocation_executor : executor
+                Runs the ``Client``'s procedures when they are Called, e.g.
+                ``wampy.executors.ThreadExecutor(max_concurrency=8)``.
+                It may be shared with other Clients, so is left to
+                whoever made it to shut down. Defaults to a
+                ``wampy.executors.GreenExecutor``, which the ``Client``
+                shuts down when it stops.
+            event_dispatcher : ``wampy.dispatchers.EventDispatcher``
+                Hands EVENTs to the ``Client``'s Subscribers. Configure one
+                to handle them out of order, or to drop them rather than
+                fall behind. Defaults to an ``EventDispatcher`` which
+                handles each Subscription's EVENTs in order.
+            serializer : string
+                The serialization of WAMP messages to agree with the
+                Router, one of ``wampy.serializers.SERIALIZERS``, e.g.
+                "msgpack". Defaults to "json".
+            compression : ``PerMessageDeflate``
+                Offer the Router permessage-deflate compression, e.g.
+                ``wampy.transports.websocket.deflate.PerMessageDeflate()``.
+                Messages are sent as they are if it is not agreed.
+                Defaults to ``None``, i.e. no compression.
+            max_message_size : int
+                The largest message, in bytes, to accept from the Router
+                - beyond which the connection is abandoned rather than
+                run out of memory. Defaults to
+                ``wampy.constants.WEBSOCKET_MAX_MESSAGE_SIZE``.
+            fragment_size : int
+                Send messages larger than this many bytes in fragments,
+                e.g. large RPC results, so that they are never copied
+                whole when masked and other traffic can go in between.
+                Defaults to ``None``, i.e. no fragmenting.
+            chunk_size : int
+                Opt in to sending ``str`` and ``bytes`` arguments and
+                results larger than this many bytes in chunks, so that
+                only a chunk at a time, rather than the whole, is ever
+                serialized. A Callee puts chunked arguments back together
+                regardless, but only sends its results in chunks if it
+                opts in too. The procedure must be registered by the one
+                Callee, to receive every chunk. Defaults to ``None``, i.e.
+                no chunking.
 
         """
+        if async_name == ASYNCIO:
+            raise WampyError(
+                "the Client runs on the green threads of gevent or "
+                "eventlet: with asyncio, use the AsyncClient"
+            )
+
         # the endpoint of a WAMP Router
         self.url = url
         # when using Secure WebSockets
@@ -70,6 +135,8 @@ class Client(object):
         # the ``roles`` define what Roles (features) the Client can act,
         # but also configure behaviour such as auth
         self.roles = roles
+        # messages are serialized and deserialized by the same serializer
+        self.serializer = get_serializer(serializer)
 
         # wampy uses a decoupled "messge handler" to process incoming messages.
         # wampy also provides a very adequate default.
@@ -88,6 +155,34 @@ class Client(object):
         # message, we still implement our own cuttoff
         self.call_timeout = call_timeout
 
+        self.coalesce_writes = coalesce_writes
+        self.compression = compression
+        self.max_message_size = max_message_size
+        self.fragment_size = fragment_size
+        self.chunk_size = chunk_size
+
+        # procedures are run for INVOCATIONs by an executor, so that one
+        # slow procedure doesn't stop the Client handling other messages
+        self.invocation_executor = invocation_executor or GreenExecutor()
+        # which is only ours to shut down if we made it
+        self._owns_invocation_executor = invocation_executor is None
+        # and procedures with limits of their own have their own executor
+        self.procedure_executors = {}
+        for name, procedure in inspect.getmembers(
+            self.__class__, inspect.isfunction,
+        ):
+            options = getattr(procedure, 'executor_options', None)
+            if options:
+                executor_cls = EXECUTORS[options['executor']]
+                self.procedure_executors[name] = executor_cls(
+                    max_concurrency=options['max_concurrency'],
+                    max_queued=options['max_queued'],
+                )
+
+        # EVENTs are handed to Subscribers by a dispatcher, for the same
+        # reason that procedures are run by an executor
+        self.event_dispatcher = event_dispatcher or EventDispatcher()
+
         # create a Session between ourselves and the Router.
         # the ``MessageHandler`` will process incoming messages
         # and pass back any messages that the client needs, such
@@ -101,6 +196,12 @@ class Client(object):
             realm=self.realm,
             roles=self.roles,
             client_name=self.name,
+            coalesce_writes=self.coalesce_writes,
+            serializer=self.serializer,
+            compression=self.compression,
+            max_message_size=self.max_message_size,
+            fragment_size=self.fragment_size,
+            chunk_size=self.chunk_size,
         )
 
     def __enter__(self):
@@ -136,6 +237,22 @@ class Client(object):
     def call(self):
         return CallProxy(client=self)
 
+    def call_async(self, procedure, *args, **kwargs):
+        """ Send a Call without waiting on its result.
+
+        Returns a ``wampy.roles.caller.PendingCall``, whose ``get``
+        returns what ``call`` would have.
+
+        """
+        return self.call.async_(procedure, *args, **kwargs)
+
+    def call_many(self, calls):
+        """ Pipeline many Calls, sending them all before waiting on any
+        of them, and return their results in order. See
+        ``wampy.roles.caller.CallProxy.many``.
+        """
+        return self.call.many(calls)
+
     @property
     def rpc(self):
         return RpcProxy(client=self)
@@ -150,16 +267,27 @@ class Client(object):
     def stop(self):
         if self.session:
             self.session.end(goodbye_from=self.name)
+        if self._owns_invocation_executor:
+            self.invocation_executor.shutdown()
+        self.event_dispatcher.stop()
+        for executor in self.procedure_executors.values():
+            executor.shutdown()
 
     def send_message(self, message):
         self.session.send_message(message)
 
+    def flush(self):
+        """ Write out immediately any messages held back by
+        ``coalesce_writes``.
+        """
+        self._session.flush()
+
     def recv_message(self, source_request_id=None):
         return self.session.recv_message(source_request_id=source_request_id)
 
     def _make_rpc(self, message):
         # _make_rpc should not be called directly, rather by a Proxy object
-        self.send_message(message)
+        self.session.send_request(message)
         response = self.recv_message(
             source_request_id=message.request_id,
         )
@@ -197,3 +325,170 @@ class Client(object):
                 )
 
         logger.info("waiting for registration of roles for: %s", self.name)
+
+
+class AsyncClient(object):
+    """ A WAMP Client for asyncio applications, which shares their event
+    loop rather than needing green threads, e.g. ::
+
+        async with AsyncClient(url="ws://localhost:8080") as client:
+            result = await client.rpc.get_data()
+
+            subscription = await client.subscribe("com.example.readings")
+            async for args, kwargs, meta in subscription:
+                ...
+
+    As with a ``Client``, its procedures are declared on a subclass with
+    ``callee``, and may be coroutines. Topics are subscribed to with
+    ``subscribe`` rather than the ``subscribe`` decorator.
+
+    """
+
+    def __init__(
+        self, url=DEFAULT_ROUTER_URL, cert_path=None, ipv=4, name=None,
+        realm=DEFAULT_REALM, roles=DEFAULT_ROLES, call_timeout=DEFAULT_TIMEOUT,
+        message_handler_cls=None, serializer=DEFAULT_SERIALIZER,
+        compression=None, max_message_size=WEBSOCKET_MAX_MESSAGE_SIZE,
+        fragment_size=None,
+    ):
+        """ An asyncio WAMP Client "Peer", which connects to the Router
+        when it is started.
+
+        :Parameters:
+            As for the ``Client``, but for those which configure green
+            threads - ``coalesce_writes``, ``invocation_executor`` and
+            ``event_dispatcher`` - and ``chunk_size``.
+
+            message_handler_cls : Class
+                A ``wampy.message_handler.AsyncMessageHandler`` class, or
+                a subclass of.
+
+        """
+        for name_, member in inspect.getmembers(
+            self.__class__, inspect.isfunction,
+        ):
+            if getattr(member, 'subscriber', False):
+                raise WampyError(
+                    "{} cannot be a subscriber: subscribe with "
+                    "``await client.subscribe(topic)``".format(name_)
+                )
+
+        self.url = url
+        self.cert_path = cert_path
+        self.ipv = ipv
+        self.realm = realm
+        self.roles = roles
+        self.serializer = get_serializer(serializer)
+
+        self.message_handler = (
+            message_handler_cls(client=self) if message_handler_cls
+            else AsyncMessageHandler(client=self)
+        )
+
+        self.name = name or self.__class__.__name__
+        self.call_timeout = call_timeout
+        self.compression = compression
+        self.max_message_size = max_message_size
+        self.fragment_size = fragment_size
+
+        self._session = AsyncSession(
+            router_url=self.url,
+            message_handler=self.message_handler,
+            ipv=self.ipv,
+            cert_path=self.cert_path,
+            call_timeout=self.call_timeout,
+            realm=self.realm,
+            roles=self.roles,
+            client_name=self.name,
+            serializer=self.serializer,
+            compression=self.compression,
+            max_message_size=self.max_message_size,
+            fragment_size=self.fragment_size,
+        )
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exception_type, exception_value, traceback):
+        await self.stop()
+
+    @property
+    def session(self):
+        if self._session.session_id:
+            return self._session
+        return None
+
+    @property
+    def subscription_map(self):
+        return self.session.subscription_map
+
+    @property
+    def registration_map(self):
+        return self.session.registration_map
+
+    @property
+    def call(self):
+        return AsyncCallProxy(client=self)
+
+    @property
+    def rpc(self):
+        return AsyncRpcProxy(client=self)
+
+    @property
+    def publish(self):
+        return AsyncPublishProxy(client=self)
+
+    async def subscribe(self, topic):
+        """ Subscribe to a topic, and return the ``Subscription`` to
+        iterate over its EVENTs with.
+        """
+        return await Subscription(client=self, topic=topic).subscribe()
+
+    async def start(self):
+        await self._session.begin()
+        await self._register_roles()
+
+    async def stop(self):
+        if self.session:
+            await self.session.end(goodbye_from=self.name)
+
+    def send_message(self, message):
+        self.session.send_message(message)
+
+    async def flush(self):
+        """ Wait for the messages sent to be taken by the network. """
+        await self._session.flush()
+
+    async def recv_message(self, source_request_id=None):
+        return await self.session.recv_message(
+            source_request_id=source_request_id,
+        )
+
+    async def _make_rpc(self, message):
+        # _make_rpc should not be called directly, rather by a Proxy object
+        self.session.send_request(message)
+        response = await self.recv_message(
+            source_request_id=message.request_id,
+        )
+        return response
+
+    async def _register_roles(self):
+        # unlike a ``Client``, these are waited on, so the procedures can
+        # be Called once the ``AsyncClient`` has started
+        logger.info("registering roles for: %s", self.name)
+
+        maybe_roles = []
+        bases = [b for b in inspect.getmro(self.__class__) if b is not object]
+
+        for base in bases:
+            maybe_roles.extend(
+                v for v in base.__dict__.values() if
+                inspect.isclass(base) and callable(v)
+            )
+
+        for maybe_role in maybe_roles:
+            if hasattr(maybe_role, 'callee'):
+                await self.session._register_procedure(
+                    maybe_role.__name__, maybe_role.invocation_policy,
+                )
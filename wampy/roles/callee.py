@@ -6,10 +6,24 @@ import logging
 import types
 from functools import partial
 
+from wampy.constants import (
+    DEFAULT_INVOCATION_CONCURRENCY, DEFAULT_MAX_QUEUED_INVOCATIONS,
+)
+from wampy.errors import WampyError
+from wampy.executors import EXECUTORS
 
 logger = logging.getLogger(__name__)
 
 
+def _check_limit(fn, name, value, minimum):
+    if not isinstance(value, int) or value < minimum:
+        raise ValueError(
+            "{} of {} must be an int of at least {}: {!r}".format(
+                name, fn.__name__, minimum, value,
+            )
+        )
+
+
 class RegisterProcedureDecorator(object):
 
     def __init__(self, *args, **kwargs):
@@ -17,11 +31,62 @@ class RegisterProcedureDecorator(object):
 
     @classmethod
     def decorator(cls, *args, **kwargs):
+        """ Register the method as a procedure.
+
+        A procedure may be given limits of its own, isolated from the
+        ``Client``'s other procedures, e.g. ::
+
+            @callee(max_concurrency=8, executor="process")
+            def crunch_numbers(self, numbers):
+                ...
+
+        :Parameters:
+            executor : str
+                Where the procedure runs: "green", "thread" or "process",
+                see ``wampy.executors``.
+            max_concurrency : int
+                The most Calls of the procedure to run at once, at least
+                one.
+            max_queued : int
+                How many more Calls may wait. Beyond this they are
+                rejected with a ``wamp.error.procedure_overloaded``
+                ERROR. Zero, the least it may be, rejects every Call
+                that cannot run at once.
 
+        """
         def registering_decorator(fn, args, kwargs):
             invocation_policy = kwargs.get("invocation_policy", "single")
             fn.callee = True
             fn.invocation_policy = invocation_policy
+
+            executor = kwargs.get("executor")
+            max_concurrency = kwargs.get("max_concurrency")
+            if executor is None and max_concurrency is None:
+                # run by the Client's ``invocation_executor``
+                fn.executor_options = None
+                return fn
+
+            if executor is not None and executor not in EXECUTORS:
+                raise WampyError(
+                    "unknown executor for {}: {}".format(
+                        fn.__name__, executor,
+                    )
+                )
+
+            if max_concurrency is None:
+                max_concurrency = DEFAULT_INVOCATION_CONCURRENCY
+            _check_limit(fn, 'max_concurrency', max_concurrency, 1)
+
+            max_queued = kwargs.get(
+                "max_queued", DEFAULT_MAX_QUEUED_INVOCATIONS,
+            )
+            _check_limit(fn, 'max_queued', max_queued, 0)
+
+            fn.executor_options = {
+                'executor': executor or 'green',
+                'max_concurrency': max_concurrency,
+                'max_queued': max_queued,
+            }
             return fn
 
         if len(args) == 1 and isinstance(args[0], types.FunctionType):
@@ -4,15 +4,141 @@
 
 import logging
 
-from wampy.constants import NOT_AUTHORISED
+from wampy.constants import NOT_AUTHORISED, PROCEDURE_OVERLOADED
 from wampy.errors import WampyError, WampProtocolError
-from wampy.messages import Error, Result
+from wampy.messages import Cancel, Error, Result
 from wampy.messages import MESSAGE_TYPE_MAP
 from wampy.messages.call import Call
 
 logger = logging.getLogger('wampy.rpc')
 
 
+class PendingCall(object):
+    """ The eventual result of a Call which has been sent but not
+    waited on, so that many Calls can be in flight at once.
+
+    Call ``get`` for the result, which blocks until it arrives. Every
+    ``PendingCall`` should be waited on, or ``discard``-ed.
+
+    """
+    def __init__(self, client, message, handle_response):
+        self.session = client.session
+        self.request_id = message.request_id
+        self._handle_response = handle_response
+        self._response = None
+        self._failure = None
+
+        self.session.send_request(message)
+
+    def get(self, timeout=None):
+        """ Wait for and return the result of the Call.
+
+        :Parameters:
+            timeout : float
+                Seconds to wait for. Defaults to the ``call_timeout`` of
+                the ``Client``.
+
+        """
+        if self._response is None:
+            if self._failure is not None:
+                # the Call is over, e.g. it has timed out and been
+                # cancelled, so there is nothing left to wait for
+                raise self._failure
+
+            try:
+                self._response = self.session.recv_message(
+                    source_request_id=self.request_id, timeout=timeout,
+                )
+            except Exception as exc:
+                self._failure = exc
+                raise
+
+        return self._handle_response(self._response)
+
+    def discard(self):
+        """ Stop waiting on the Call. Any result will be dropped. """
+        self.session.discard_request(self.request_id)
+
+
+class ProgressiveCall(object):
+    """ A Call for progressive results, which are iterated over as they
+    arrive, e.g. ::
+
+        with client.rpc.fetch_rows.stream(table="readings") as rows:
+            for row in rows:
+                ...
+
+    The Callee sends as many results as it likes before its last, and a
+    Callee which does not send progressive results just sends the one.
+
+    Each result is waited on for at most ``timeout`` seconds, rather
+    than the Call as a whole, which may take as long as it needs. To
+    stop before the last result, ``close`` the ``ProgressiveCall`` and
+    the Call is cancelled - as it is on leaving the ``with`` block, so
+    that a ``ProgressiveCall`` given up on is never left waiting for
+    results.
+
+    """
+    def __init__(self, client, message, handle_response, timeout=None):
+        self.session = client.session
+        self.request_id = message.request_id
+        self.timeout = timeout
+        self._handle_response = handle_response
+        self._finished = False
+
+        self.session.send_request(message, progressive=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+
+        try:
+            response = self.session.recv_message(
+                source_request_id=self.request_id, timeout=self.timeout,
+                discard=False,
+            )
+        except Exception:
+            self._finish()
+            raise
+
+        return self._next_result(response)
+
+    def _next_result(self, response):
+        if response.WAMP_CODE != Result.WAMP_CODE:
+            # an ERROR, which is raised
+            self._finish()
+            return self._handle_response(response)
+
+        if not response.details.get('progress'):
+            self._finish()
+            if not response.yield_args and not response.yield_kwargs:
+                # nothing more: the results have all been progressive
+                raise StopIteration
+
+        return self._handle_response(response)
+
+    def close(self):
+        """ Stop waiting for results, cancelling the Call if it is not
+        yet finished.
+        """
+        if not self._finished:
+            self._finish()
+            self.session.send_message(Cancel(request_id=self.request_id))
+
+    def _finish(self):
+        self._finished = True
+        self.session.discard_request(self.request_id)
+
+
 class CallProxy:
     """ Proxy wrapper of a `wampy` client for WAMP application RPCs.
 
@@ -24,6 +150,9 @@ class CallProxy:
     and a `CallProxy` object will call such and endpoint, passing in
     any `args` or `kwargs` necessary.
 
+    Calls can also be sent without waiting on their results, either
+    one at a time with ``async_``, or pipelined with ``many``.
+
     """
     def __init__(self, client):
         self.client = client
@@ -31,6 +160,47 @@ class CallProxy:
     def __call__(self, procedure, *args, **kwargs):
         message = Call(procedure=procedure, args=args, kwargs=kwargs)
         response = self.client._make_rpc(message)
+        return self._handle_response(response)
+
+    def async_(self, procedure, *args, **kwargs):
+        """ Send the Call and return a ``PendingCall`` for its result.
+        """
+        message = Call(procedure=procedure, args=args, kwargs=kwargs)
+        return PendingCall(
+            client=self.client, message=message,
+            handle_response=self._handle_response,
+        )
+
+    def many(self, calls):
+        """ Send all the Calls before waiting on any of them, and return
+        their results in order.
+
+        :Parameters:
+            calls : iterable
+                Of ``(procedure, args, kwargs)`` tuples, where ``args``
+                and ``kwargs`` are optional, e.g. ::
+
+                    [("get_foo", ), ("get_bar", (1, 2), {"spam": "ham"})]
+
+        """
+        pending_calls = []
+        for call in calls:
+            call = tuple(call)
+            procedure, args, kwargs = call + ((), {})[len(call) - 1:]
+            pending_calls.append(self.async_(procedure, *args, **kwargs))
+
+        results = []
+        try:
+            for pending_call in pending_calls:
+                results.append(pending_call.get())
+        finally:
+            for pending_call in pending_calls[len(results):]:
+                pending_call.discard()
+
+        return results
+
+    @staticmethod
+    def _handle_response(response):
         wamp_code = response.WAMP_CODE
 
         if wamp_code == Error.WAMP_CODE:
@@ -52,53 +222,207 @@ class RpcProxy:
     The typical use case of this proxy class is for microservices
     where endpoints are class methods.
 
+    To send a Call without waiting on its result, go through
+    ``async_``, e.g. ``client.rpc.async_.get_data()``, which returns a
+    ``PendingCall``.
+
     """
-    def __init__(self, client):
+    def __init__(self, client, pending=False):
         self.client = client
+        self.pending = pending
+
+    @property
+    def async_(self):
+        return RpcProxy(client=self.client, pending=True)
 
     def __getattr__(self, name):
+        return RemoteProcedure(proxy=self, name=name)
 
-        def wrapper(*args, **kwargs):
-            # timeout is currently handled by wampy whilst
-            # https://github.com/crossbario/crossbar/issues/299
-            # is addressed, but we pass in the value regardless, waiting
-            # for the feature on CrossBar.
-            # WAMP Call Message requires milliseconds...
-            options = {
-                'timeout': int(self.client.call_timeout * 1000),
-            }
-            message = Call(
-                procedure=name, options=options, args=args, kwargs=kwargs,
-            )
-            response = self.client._make_rpc(message)
-
-            wamp_code = response.WAMP_CODE
-            if wamp_code == Error.WAMP_CODE:
-                _, _, request_id, _, endpoint, exc_args, exc_kwargs = (
-                    response.message)
-
-                if endpoint == NOT_AUTHORISED:
-                    raise WampyError(
-                        "NOT_AUTHORISED: {} - {}".format(
-                            self.client.name, exc_args[0]
-                        )
-                    )
+    def _handle_response(self, response):
+        wamp_code = response.WAMP_CODE
+        if wamp_code == Error.WAMP_CODE:
+            _, _, request_id, _, endpoint, exc_args, exc_kwargs = (
+                response.message)
 
+            if endpoint == NOT_AUTHORISED:
                 raise WampyError(
-                    'oops! wampy has failed, sorry: {}'.format(
-                        response.message
+                    "NOT_AUTHORISED: {} - {}".format(
+                        self.client.name, exc_args[0]
                     )
                 )
 
-            if wamp_code != Result.WAMP_CODE:
-                raise WampProtocolError(
-                    'unexpected message code: "%s (%s) %s"',
-                    wamp_code, MESSAGE_TYPE_MAP[wamp_code],
-                    response[5]
+            if endpoint == PROCEDURE_OVERLOADED:
+                raise WampyError(
+                    "PROCEDURE_OVERLOADED: {}".format(exc_args[0])
+                )
+
+            raise WampyError(
+                'oops! wampy has failed, sorry: {}'.format(
+                    response.message
                 )
+            )
+
+        if wamp_code != Result.WAMP_CODE:
+            raise WampProtocolError(
+                'unexpected message code: "%s (%s) %s"',
+                wamp_code, MESSAGE_TYPE_MAP[wamp_code],
+                response[5]
+            )
+
+        result = response.value
+        logger.debug("RpcProxy got result: %s", result)
+        return result
+
+
+class RemoteProcedure(object):
+    """ A procedure of a Callee, as got from an ``RpcProxy``, e.g.
+    ``client.rpc.get_data``, which sends a Call when called.
+
+    ``stream`` instead Calls it for progressive results, see
+    ``ProgressiveCall``.
+
+    """
+    def __init__(self, proxy, name):
+        self.proxy = proxy
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        proxy = self.proxy
+        message = Call(
+            procedure=self.name, options=self._options(), args=args,
+            kwargs=kwargs,
+        )
+
+        if proxy.pending:
+            return PendingCall(
+                client=proxy.client, message=message,
+                handle_response=proxy._handle_response,
+            )
+
+        response = proxy.client._make_rpc(message)
+        return proxy._handle_response(response)
+
+    def stream(self, *args, **kwargs):
+        """ Send the Call and return a ``ProgressiveCall`` to iterate
+        over its results with.
+        """
+        # without a ``timeout`` for the Router, as the Call may take as
+        # long as it needs, so long as its results keep coming
+        message = Call(
+            procedure=self.name, options={'receive_progress': True},
+            args=args, kwargs=kwargs,
+        )
+
+        return ProgressiveCall(
+            client=self.proxy.client, message=message,
+            handle_response=self.proxy._handle_response,
+        )
+
+    def _options(self):
+        # timeout is currently handled by wampy whilst
+        # https://github.com/crossbario/crossbar/issues/299
+        # is addressed, but we pass in the value regardless, waiting
+        # for the feature on CrossBar.
+        # WAMP Call Message requires milliseconds...
+        return {
+            'timeout': int(self.proxy.client.call_timeout * 1000),
+        }
+
+
+class AsyncProgressiveCall(ProgressiveCall):
+    """ The ``ProgressiveCall`` of an ``AsyncClient``, whose results are
+    iterated over with ``async for``, e.g. ::
+
+        async with client.rpc.fetch_rows.stream(table="readings") as rows:
+            async for row in rows:
+                ...
+
+    """
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._finished:
+            raise StopAsyncIteration
+
+        try:
+            response = await self.session.recv_message(
+                source_request_id=self.request_id, timeout=self.timeout,
+                discard=False,
+            )
+        except Exception:
+            self._finish()
+            raise
+
+        try:
+            return self._next_result(response)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class AsyncCallProxy(CallProxy):
+    """ The ``CallProxy`` of an ``AsyncClient``, whose Calls are awaited,
+    e.g. ::
+
+        await client.call("com.example.endpoint", *args, **kwargs)
+
+    Many Calls are in flight at once when they are awaited together, e.g.
+    with ``asyncio.gather``, so there is no ``async_`` or ``many``.
+
+    """
+    async def __call__(self, procedure, *args, **kwargs):
+        message = Call(procedure=procedure, args=args, kwargs=kwargs)
+        response = await self.client._make_rpc(message)
+        return self._handle_response(response)
+
+    def async_(self, procedure, *args, **kwargs):
+        raise WampyError(
+            "await Calls together instead, e.g. with asyncio.gather"
+        )
+
+
+class AsyncRpcProxy(RpcProxy):
+    """ The ``RpcProxy`` of an ``AsyncClient``, whose Calls are awaited,
+    e.g. ``await client.rpc.get_data()``.
+    """
+    @property
+    def async_(self):
+        raise WampyError(
+            "await Calls together instead, e.g. with asyncio.gather"
+        )
+
+    def __getattr__(self, name):
+        return AsyncRemoteProcedure(proxy=self, name=name)
+
+
+class AsyncRemoteProcedure(RemoteProcedure):
+
+    async def __call__(self, *args, **kwargs):
+        proxy = self.proxy
+        message = Call(
+            procedure=self.name, options=self._options(), args=args,
+            kwargs=kwargs,
+        )
+
+        response = await proxy.client._make_rpc(message)
+        return proxy._handle_response(response)
 
-            result = response.value
-            logger.debug("RpcProxy got result: %s", result)
-            return result
+    def stream(self, *args, **kwargs):
+        """ Send the Call and return an ``AsyncProgressiveCall`` to
+        iterate over its results with.
+        """
+        message = Call(
+            procedure=self.name, options={'receive_progress': True},
+            args=args, kwargs=kwargs,
+        )
 
-        return wrapper
+        return AsyncProgressiveCall(
+            client=self.proxy.client, message=message,
+            handle_response=self.proxy._handle_response,
+        )
@@ -17,6 +17,12 @@ class PublishProxy:
         self.client = client
 
     def __call__(self, *unsupported_args, **kwargs):
+        message = self._make_message(*unsupported_args, **kwargs)
+        logger.info('publishing message: "%s"', message.message)
+
+        self.client.send_message(message)
+
+    def _make_message(self, *unsupported_args, **kwargs):
         if len(unsupported_args) != 0:
             raise WampyError(
                 "wampy only supports publishing keyword arguments "
@@ -31,7 +37,17 @@ class PublishProxy:
 
         if "options" not in kwargs:
             kwargs["options"] = {}
-        message = Publish(topic=topic, **kwargs)
+        return Publish(topic=topic, **kwargs)
+
+
+class AsyncPublishProxy(PublishProxy):
+    """ The ``PublishProxy`` of an ``AsyncClient``, which is awaited, e.g.
+    ``await client.publish(topic="foo", message="bar")``, to hold back
+    the publisher while the Router is slow to take its messages.
+    """
+    async def __call__(self, *unsupported_args, **kwargs):
+        message = self._make_message(*unsupported_args, **kwargs)
         logger.info('publishing message: "%s"', message.message)
 
         self.client.send_message(message)
+        await self.client.flush()
@@ -4,6 +4,10 @@
 
 import logging
 
+from wampy.backends import asyncio_adapter
+from wampy.constants import (
+    DEFAULT_EVENT_BATCH_SIZE, DEFAULT_EVENT_BATCH_WINDOW_MS,
+)
 from wampy.errors import WampyError
 
 logger = logging.getLogger(__name__)
@@ -19,6 +23,22 @@ class RegisterSubscriptionDecorator(object):
 
         self.topic = kwargs['topic']
 
+        # EVENTs can be handed over in batches, as a list of
+        # ``(args, kwargs, meta)`` tuples, rather than one by one
+        batch_size = kwargs.get('batch_size')
+        batch_window_ms = kwargs.get('batch_window_ms')
+        if batch_size is None and batch_window_ms is None:
+            self.batch_size = None
+            self.batch_window = None
+        else:
+            self.batch_size = batch_size or DEFAULT_EVENT_BATCH_SIZE
+            if self.batch_size < 1:
+                raise WampyError("``batch_size`` must be at least 1")
+
+            if batch_window_ms is None:
+                batch_window_ms = DEFAULT_EVENT_BATCH_WINDOW_MS
+            self.batch_window = batch_window_ms / 1000.0
+
     def __call__(self, f):
         def wrapped_f(*args, **kwargs):
             f(*args, **kwargs)
@@ -26,7 +46,73 @@ class RegisterSubscriptionDecorator(object):
         wrapped_f.subscriber = True
         wrapped_f.topic = self.topic
         wrapped_f.handler = f
+        wrapped_f.batch_size = self.batch_size
+        wrapped_f.batch_window = self.batch_window
         return wrapped_f
 
 
 subscribe = RegisterSubscriptionDecorator
+
+
+class Subscription(object):
+    """ A topic subscribed to by an ``AsyncClient``, whose EVENTs are
+    iterated over with ``async for`` as they arrive, e.g. ::
+
+        subscription = await client.subscribe("com.example.readings")
+        async for args, kwargs, meta in subscription:
+            ...
+
+    Each is an ``(args, kwargs, meta)`` tuple, as in a batch. EVENTs wait
+    for the iteration, however far behind it falls, so ``close`` the
+    ``Subscription`` once done with it - which unsubscribes, and ends the
+    iteration once the EVENTs already received have been had. So too
+    does the end of the ``Session``.
+
+    """
+    def __init__(self, client, topic):
+        self.client = client
+        self.topic = topic
+        self.subscription_id = None
+        self._events = None
+        self._closed = False
+
+    async def subscribe(self):
+        self._events = asyncio_adapter.queue()
+        self.subscription_id = await self.client.session._subscribe_to_topic(
+            self, self.topic,
+        )
+        return self
+
+    async def close(self):
+        if self._closed:
+            return
+
+        self._closed = True
+        if self.client.session is not None:
+            await self.client.session._unsubscribe(self.subscription_id)
+        self.put_end()
+
+    def put(self, args, kwargs, meta):
+        self._events.put_nowait((args, kwargs, meta))
+
+    def put_end(self):
+        # after any EVENTs still to be iterated over
+        self._events.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self._events.get()
+        if event is None:
+            # and for anyone else iterating
+            self._events.put_nowait(None)
+            raise StopAsyncIteration
+
+        return event
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exception_type, exception_value, traceback):
+        await self.close()
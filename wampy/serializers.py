@@ -2,18 +2,51 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-import simplejson as json
-from wampy.errors import WampProtocolError
+""" The WAMP serializations a ``Client`` can talk to a Router in.
+
+A ``Client`` is given one by name, e.g. ``Client(serializer="msgpack")``,
+and agrees it with the Router during the WebSocket handshake. JSON is
+the default, and is the one every Router supports.
+
+"""
+import json
+
+import simplejson
+
+from wampy.errors import WampProtocolError, WampyError
+from wampy.interfaces import Serializer
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 
 def json_serialize(message):
     # WAMP serialization insists on UTF-8 encoded Unicode
     try:
-        data = json.dumps(
+        data = simplejson.dumps(
             message, separators=(',', ':'), ensure_ascii=False,
             encoding='utf-8',
         )
-    except TypeError as exc:
+    except (TypeError, UnicodeDecodeError) as exc:
+        # e.g. ``bytes`` which are not UTF-8, for which use a binary
+        # serializer
         raise WampProtocolError(
             "Message not serialized: {} - {}".format(
                 message, str(exc)
@@ -21,3 +54,189 @@ def json_serialize(message):
         )
 
     return data
+
+
+def _text(payload):
+    # for the JSON libraries which cannot read a ``memoryview``
+    if isinstance(payload, str):
+        return payload
+    return str(payload, 'utf-8')
+
+
+# every ``dumps`` returns compact, UTF-8 encoded JSON, and every ``loads``
+# takes ``str`` or bytes-like, including a ``memoryview`` - which orjson
+# parses where it is, without a copy
+def _orjson_dumps(message):
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _ujson_dumps(message):
+    return ujson.dumps(
+        message, ensure_ascii=False, escape_forward_slashes=False,
+    ).encode('utf-8')
+
+
+def _ujson_loads(payload):
+    return ujson.loads(_text(payload))
+
+
+def _simplejson_dumps(message):
+    return json_serialize(message).encode('utf-8')
+
+
+def _simplejson_loads(payload):
+    return simplejson.loads(_text(payload))
+
+
+def _json_dumps(message):
+    return json.dumps(
+        message, separators=(',', ':'), ensure_ascii=False,
+    ).encode('utf-8')
+
+
+def _json_loads(payload):
+    return json.loads(_text(payload))
+
+
+# the JSON implementations installed, by name, as (dumps, loads) and
+# fastest first
+JSON_BACKENDS = {}
+if orjson is not None:
+    JSON_BACKENDS['orjson'] = _orjson_dumps, orjson.loads
+if ujson is not None:
+    JSON_BACKENDS['ujson'] = _ujson_dumps, _ujson_loads
+JSON_BACKENDS['simplejson'] = _simplejson_dumps, _simplejson_loads
+JSON_BACKENDS['json'] = _json_dumps, _json_loads
+
+
+class JsonSerializer(Serializer):
+    SUBPROTOCOL = 'wamp.2.json'
+    BINARY = False
+
+    def __init__(self, backend=None):
+        """ JSON, sent in text frames.
+
+        ``bytes`` values cannot be sent as JSON: use a binary serializer
+        for those.
+
+        :Parameters:
+            backend : string
+                The JSON implementation to use, one of ``JSON_BACKENDS``.
+                Defaults to the fastest installed, trying ``orjson``,
+                ``ujson`` and then ``simplejson``, e.g. after
+                ``pip install wampy[fastjson]``.
+
+        """
+        if backend is None:
+            backend = next(iter(JSON_BACKENDS))
+
+        try:
+            # both ways, so that what one sends the other can read
+            self._dumps, self._loads = JSON_BACKENDS[backend]
+        except KeyError:
+            raise WampyError(
+                "JSON backend {} is not installed. Choose from: {}".format(
+                    backend, ", ".join(JSON_BACKENDS),
+                )
+            )
+
+        self.backend = backend
+
+    def serialize(self, message):
+        try:
+            return self._dumps(message)
+        except (TypeError, ValueError, OverflowError) as exc:
+            raise WampProtocolError(
+                "Message not serialized: {} - {}".format(
+                    message, str(exc)
+                )
+            )
+
+    def deserialize(self, payload):
+        return self._loads(payload)
+
+
+class MsgPackSerializer(Serializer):
+    """ MessagePack, sent in binary frames. Payloads are smaller than
+    JSON's and quicker to (de)serialize.
+
+    Requires ``msgpack``, e.g. ``pip install wampy[msgpack]``.
+
+    """
+    SUBPROTOCOL = 'wamp.2.msgpack'
+    BINARY = True
+
+    def __init__(self):
+        if msgpack is None:
+            raise WampyError(
+                "the msgpack serializer needs ``msgpack`` installed"
+            )
+
+    def serialize(self, message):
+        try:
+            # ``use_bin_type`` keeps ``bytes`` and ``str`` apart
+            return msgpack.packb(message, use_bin_type=True)
+        except TypeError as exc:
+            raise WampProtocolError(
+                "Message not serialized: {} - {}".format(
+                    message, str(exc)
+                )
+            )
+
+    def deserialize(self, payload):
+        return msgpack.unpackb(payload, raw=False)
+
+
+class CborSerializer(Serializer):
+    """ CBOR, sent in binary frames. Like MessagePack, ``bytes`` values
+    are sent as they are rather than having to be base64 encoded, as
+    they would be in JSON.
+
+    Requires ``cbor2``, e.g. ``pip install wampy[cbor]``.
+
+    """
+    SUBPROTOCOL = 'wamp.2.cbor'
+    BINARY = True
+
+    def __init__(self):
+        if cbor2 is None:
+            raise WampyError(
+                "the cbor serializer needs ``cbor2`` installed"
+            )
+
+    def serialize(self, message):
+        try:
+            return cbor2.dumps(message)
+        except cbor2.CBOREncodeError as exc:
+            raise WampProtocolError(
+                "Message not serialized: {} - {}".format(
+                    message, str(exc)
+                )
+            )
+
+    def deserialize(self, payload):
+        return cbor2.loads(payload)
+
+
+# the serializers that a ``Client`` may name
+SERIALIZERS = {
+    'cbor': CborSerializer,
+    'json': JsonSerializer,
+    'msgpack': MsgPackSerializer,
+}
+
+
+def get_serializer(name):
+    """ Return a new instance of the serializer called ``name``, one of
+    ``SERIALIZERS``.
+    """
+    try:
+        serializer_cls = SERIALIZERS[name]
+    except KeyError:
+        raise WampyError(
+            "unknown serializer: {}. Choose from: {}".format(
+                name, ", ".join(sorted(SERIALIZERS)),
+            )
+        )
+
+    return serializer_cls()
@@ -2,22 +2,35 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import asyncio
 import logging
 import os
+import time
+import uuid
+from itertools import chain
 
 from wampy.auth import compute_wcs
 from wampy.backends import async_adapter
+from wampy.backends import asyncio_adapter
+from wampy.backends.futures import Stream
+from wampy.constants import (
+    CALL_CHUNK, CALL_CHUNKS, CHUNKED_TRANSFER_MAX_SIZE,
+    CHUNKED_TRANSFER_TIMEOUT, CHUNKS_PROCEDURE_SUFFIX,
+    WEBSOCKET_MAX_MESSAGE_SIZE,
+)
 from wampy.errors import (
     NoFrameReturnedError, WampyError, WampyTimeOutError,
-    WampProtocolError,
+    WampProtocolError, WebsocktProtocolError,
 )
 from wampy.messages import (
-    Abort, Authenticate, Cancel, Challenge, Hello, Goodbye, Register,
-    Subscribe, Welcome,
+    Abort, Authenticate, Call, Cancel, Challenge, Error, Hello, Goodbye,
+    Register, Result, Subscribe, Unsubscribe, Welcome,
 )
 
 from wampy.mixins import ParseUrlMixin
-from wampy.transports import WebSocket, SecureWebSocket
+from wampy.transports import (
+    AsyncSecureWebSocket, AsyncWebSocket, SecureWebSocket, WebSocket,
+)
 
 logger = logging.getLogger('wampy.session')
 
@@ -40,10 +53,15 @@ class Session(ParseUrlMixin):
         same Realm.
 
     """
+    # what the Session's own green threads, queues and futures are of
+    async_adapter = async_adapter
 
     def __init__(
         self, router_url, message_handler, ipv, cert_path,
-        call_timeout, realm, roles, client_name,
+        call_timeout, realm, roles, client_name, coalesce_writes=False,
+        serializer=None, compression=None,
+        max_message_size=WEBSOCKET_MAX_MESSAGE_SIZE, fragment_size=None,
+        chunk_size=None,
     ):
         """ A Session between a Client and a Router.
 
@@ -57,6 +75,24 @@ class Session(ParseUrlMixin):
                 or a subclass of it. Handles incoming WAMP Messages.
             ipv : int
                 The Internet Protocol version for the Transport to use
+            coalesce_writes : bool
+                Whether the Transport should hold back outgoing messages
+                briefly so that bursts of them are written out together.
+            serializer : ``wampy.interfaces.Serializer``
+                The serialization of WAMP messages to agree with the
+                Router. Defaults to JSON.
+            compression : ``PerMessageDeflate``
+                Compression to offer the Router, if any.
+            max_message_size : int
+                The largest message to accept from the Router.
+            fragment_size : int
+                The largest frame to send, with larger messages sent as
+                fragments. ``None`` is no limit.
+            chunk_size : int
+                Send ``str`` and ``bytes`` arguments and results larger
+                than this in chunks of at most this size, and put back
+                together those received in chunks. ``None`` is no
+                chunking.
 
         """
         self.url = router_url
@@ -77,12 +113,22 @@ class Session(ParseUrlMixin):
             self.transport = WebSocket(
                 server_url=self.url,
                 ipv=self.ipv,
+                coalesce_writes=coalesce_writes,
+                serializer=serializer,
+                compression=compression,
+                max_message_size=max_message_size,
+                fragment_size=fragment_size,
             )
         elif self.scheme == "wss":
             self.transport = SecureWebSocket(
                 server_url=self.url,
                 ipv=self.ipv,
                 certificate_path=self.cert_path,
+                coalesce_writes=coalesce_writes,
+                serializer=serializer,
+                compression=compression,
+                max_message_size=max_message_size,
+                fragment_size=fragment_size,
             )
         else:
             raise WampyError(
@@ -94,6 +140,8 @@ class Session(ParseUrlMixin):
         self.request_ids = {}
         self.subscription_map = {}
         self.registration_map = {}
+        # and of the procedures which the chunks of Calls are sent to
+        self.chunks_registration_map = {}
 
         self.session_id = None
         # spawn a green thread to listen for incoming messages over
@@ -101,8 +149,26 @@ class Session(ParseUrlMixin):
         self._managed_thread = None
         # the MessageHandler is responsible for putting messages on
         # to this queue which are then returned to the Client. The
-        # queue is shared between the green threads.
-        self._message_queue = async_adapter.message_queue
+        # queue is shared between the green threads, but not with any
+        # other Session. It carries the messages of the Session's own
+        # lifecycle, e.g. WELCOME and GOODBYE.
+        self._message_queue = async_adapter.queue()
+        # responses to requests in flight, e.g. RESULTs for CALLs, are
+        # instead correlated by request ID. each request has its own
+        # Future, which the MessageHandler sets the response on, so many
+        # requests can be in flight at once from any number of green
+        # threads.
+        self._pending_requests = {}
+
+        self.chunk_size = chunk_size
+        # the chunks of the large arguments of Calls on their way, by
+        # transfer, until the Call itself arrives. the transfer least
+        # recently added to comes first.
+        self._chunk_index = {}
+        # and the progressive results, e.g. chunks, of Calls which want
+        # the one result, by request ID, until the last arrives
+        self._partial_results = {}
+
         self._listen()
 
     @property
@@ -127,14 +193,269 @@ class Session(ParseUrlMixin):
         message = message_obj.message
         self.connection.send(message)
 
-    # TODO: move this to the Client to remove another layer of abstraction?
-    def recv_message(self, source_request_id=None, timeout=None):
-        # Messages are passed from the MessageHandler to a queue on the
-        # Client.
+    def send_request(self, message_obj, progressive=False):
+        """ Send a message that expects a response with the same
+        request ID, which is then returned by ``recv_message``.
+
+        A ``progressive`` request, e.g. a Call for progressive results,
+        may have many responses. Each is returned by a call to
+        ``recv_message`` in turn, until the request is discarded.
+
+        With a ``chunk_size``, the large arguments of a Call are sent
+        ahead of it in chunks, and then a large result may come back in
+        chunks too - which ``recv_message`` returns put back together.
+
+        """
+        if (
+            self.chunk_size is not None and
+            message_obj.WAMP_CODE == Call.WAMP_CODE and
+            self._send_chunks(message_obj)
+        ):
+            message_obj.options.setdefault('receive_progress', True)
+
+        self._send_request(message_obj, progressive)
+
+    def _send_request(self, message_obj, progressive=False):
+        request_id = message_obj.request_id
+        # expect the response *before* sending, else it may beat us to it
+        self._pending_requests[request_id] = (
+            self.async_adapter.Stream() if progressive
+            else self.async_adapter.Future()
+        )
+
+        try:
+            self.send_message(message_obj)
+        except Exception:
+            del self._pending_requests[request_id]
+            raise
+
+    def resolve_request(self, request_id, message_obj):
+        """ Hand a response to whoever is waiting on its request.
+
+        Returns ``False`` if nobody is, e.g. they have timed out.
+
+        """
         try:
-            message = async_adapter.receive_message(
-                timeout=timeout or self.call_timeout,
+            response = self._pending_requests[request_id]
+        except KeyError:
+            return False
+
+        response.set(message_obj)
+        return True
+
+    def put_message(self, message_obj):
+        """ Hand over a message of the Session's own lifecycle, e.g.
+        WELCOME, which ``recv_message`` returns.
+        """
+        self._message_queue.put(message_obj)
+
+    def discard_request(self, request_id):
+        """ Stop expecting a response to a request. """
+        self._pending_requests.pop(request_id, None)
+        self._partial_results.pop(request_id, None)
+
+    def gather_result(self, message_obj):
+        """ Gather up the progressive RESULTs of a Call which expects
+        only the one result, i.e. a large result sent in chunks or the
+        results of a generator.
+
+        Returns the RESULT to hand to whoever waits on the Call, with
+        the chunks joined back together or the results in a list, else
+        ``None`` until the last.
+
+        """
+        request_id = message_obj.request_id
+        progress = message_obj.details.get('progress')
+        if not progress and request_id not in self._partial_results:
+            # the usual, single RESULT
+            return message_obj
+
+        meta = (message_obj.yield_kwargs or {}).get('meta') or {}
+
+        if progress:
+            if meta.get('chunk'):
+                result = message_obj.yield_args[0]
+            elif isinstance(self._pending_requests.get(request_id), Stream):
+                # iterated over by the Caller itself
+                return message_obj
+            else:
+                result = message_obj.value
+
+            self._partial_results.setdefault(request_id, []).append(result)
+            return None
+
+        results = self._partial_results.pop(request_id)
+        if meta.get('chunked'):
+            # an empty ``str`` or ``bytes`` to join them with
+            result = results[0][:0].join(results)
+        else:
+            if message_obj.yield_args or message_obj.yield_kwargs:
+                results.append(message_obj.value)
+            result = results
+
+        return Result(
+            request_id, message_obj.details, yield_args=[result],
+            yield_kwargs={'message': result, 'meta': meta},
+        )
+
+    def add_chunk(self, transfer, argument, index, chunk):
+        """ Keep a chunk of a large argument until its Call arrives.
+
+        Raises ``WampyError``, and forgets the transfer, if the chunk is
+        not the next one of it, or takes it over the
+        ``CHUNKED_TRANSFER_MAX_SIZE``.
+
+        """
+        now = time.monotonic()
+        self._expire_transfers(now)
+
+        state = self._chunk_index.pop(transfer, None) or {
+            'arguments': {}, 'chunks': 0, 'size': 0,
+        }
+        if index != state['chunks']:
+            raise WampyError(
+                "chunk {} of transfer {} arrived out of order, "
+                "expected chunk {}".format(index, transfer, state['chunks'])
+            )
+
+        state['size'] += len(chunk)
+        if state['size'] > CHUNKED_TRANSFER_MAX_SIZE:
+            raise WampyError(
+                "transfer {} is larger than {}".format(
+                    transfer, CHUNKED_TRANSFER_MAX_SIZE,
+                )
             )
+
+        state['chunks'] += 1
+        state['updated_at'] = now
+        state['arguments'].setdefault(argument, []).append(chunk)
+        # to the back, as the transfer least likely to have expired
+        self._chunk_index[transfer] = state
+
+    def _expire_transfers(self, now):
+        # forget the chunks of Calls which never followed them, e.g.
+        # because their Caller timed out or went away
+        expired_at = now - CHUNKED_TRANSFER_TIMEOUT
+        for transfer, state in list(self._chunk_index.items()):
+            if state['updated_at'] > expired_at:
+                break
+
+            logger.warning("forgetting chunks of transfer %s", transfer)
+            del self._chunk_index[transfer]
+
+    def reassemble_arguments(self, invocation):
+        """ Put back the large arguments of an INVOCATION that were sent
+        ahead of it in chunks, where they were left out.
+        """
+        kwargs = invocation.call_kwargs
+        transfer = kwargs.pop(CALL_CHUNKS)
+        try:
+            state = self._chunk_index.pop(transfer['transfer'])
+        except KeyError:
+            raise WampyError("the chunks of the Call's arguments are missing")
+
+        arguments = state['arguments']
+
+        args = list(invocation.call_args)
+        for argument in transfer['arguments']:
+            chunks = arguments.pop(argument, None)
+            if not chunks:
+                raise WampyError(
+                    "the chunks of argument {} are missing".format(argument)
+                )
+
+            value = chunks[0][:0].join(chunks)
+            if isinstance(argument, int):
+                args[argument] = value
+            else:
+                kwargs[argument] = value
+
+        invocation.call_args = args
+
+    def _send_chunks(self, message_obj):
+        # each chunk is sent as a Call of its own, and acknowledged,
+        # before the next, so only one is ever on its way. the Call
+        # itself then follows, saying where its arguments were left out.
+        # returns whether there were any large enough to send in chunks.
+        chunk_size = self.chunk_size
+        args = list(message_obj.args)
+        kwargs = dict(message_obj.kwargs)
+        transfer = uuid.uuid4().hex
+        chunked = []
+        index = 0
+
+        for argument, value in chain(enumerate(args), kwargs.items()):
+            if (
+                not isinstance(value, (str, bytes)) or
+                len(value) <= chunk_size
+            ):
+                continue
+
+            for start in range(0, len(value), chunk_size):
+                self._send_chunk(
+                    message_obj.procedure, transfer, argument, index,
+                    value[start:start + chunk_size],
+                )
+                index += 1
+            chunked.append(argument)
+
+        if not chunked:
+            return False
+
+        for argument in chunked:
+            if isinstance(argument, int):
+                args[argument] = None
+            else:
+                kwargs[argument] = None
+
+        kwargs[CALL_CHUNKS] = {'transfer': transfer, 'arguments': chunked}
+        message_obj.args = args
+        message_obj.kwargs = kwargs
+        return True
+
+    def _send_chunk(self, procedure, transfer, argument, index, chunk):
+        message = Call(
+            procedure=procedure + CHUNKS_PROCEDURE_SUFFIX, args=[chunk],
+            kwargs={
+                CALL_CHUNK: {
+                    'transfer': transfer, 'argument': argument,
+                    'index': index,
+                },
+            },
+        )
+        self._send_request(message)
+
+        response = self.recv_message(source_request_id=message.request_id)
+        if response.WAMP_CODE == Error.WAMP_CODE:
+            raise WampyError(
+                "failed to send a chunk of a Call to {}: {}".format(
+                    procedure, response.message,
+                )
+            )
+
+    def flush(self):
+        self.connection.flush()
+
+    # TODO: move this to the Client to remove another layer of abstraction?
+    def recv_message(
+        self, source_request_id=None, timeout=None, discard=True,
+    ):
+        # whatever we are waiting on a reply to must not sit in a write
+        # buffer while we wait
+        self.flush()
+
+        # Messages are passed from the MessageHandler to the Client - as
+        # the response to a request, else on the Session's queue.
+        response = self._pending_requests.get(source_request_id)
+        timeout = timeout or self.call_timeout
+
+        try:
+            if response is None:
+                message = async_adapter.receive_message(
+                    timeout=timeout, message_queue=self._message_queue,
+                )
+            else:
+                message = response.get(timeout=timeout)
         except WampProtocolError as wamp_err:
             logger.error(wamp_err)
             raise
@@ -150,17 +471,14 @@ class Session(ParseUrlMixin):
             logger.warning("rpc failed!!")
             logger.exception(str(exc))
             raise
+        finally:
+            if response is not None and discard:
+                self.discard_request(source_request_id)
 
         return message
 
     def _say_hello(self):
-        details = self.roles
-        for role, features in details['roles'].items():
-            features.setdefault('features', {})
-            features['features'].setdefault('call_timeout', True)
-
-        message = Hello(realm=self.realm, details=details)
-        self.send_message(message)
+        self.send_message(self._make_hello())
 
         message_obj = self.recv_message()
         # raise if Router aborts handshake or we cannot respond to a
@@ -172,23 +490,7 @@ class Session(ParseUrlMixin):
             raise WampyError(message_obj.message)
 
         if message_obj.WAMP_CODE == Challenge.WAMP_CODE:
-            if 'WAMPYSECRET' not in os.environ:
-                raise WampyError(
-                    "Wampy requires a client's secret to be "
-                    "in the environment as ``WAMPYSECRET``"
-                )
-
-            secret = os.environ['WAMPYSECRET']
-            if message_obj.auth_method == 'ticket':
-                logger.info("proceeding with ticket authentication method")
-                message = Authenticate(secret)
-            else:
-                logger.info("assuming wampcra authentication method")
-                challenge_data = message_obj.challenge
-                signature = compute_wcs(secret, str(challenge_data))
-                message = Authenticate(signature.decode("utf-8"))
-
-            self.send_message(message)
+            self.send_message(self._make_authenticate(message_obj))
             message_obj = self.recv_message()
 
             # raise if Router aborts handshake or we cannot respond to a
@@ -203,6 +505,34 @@ class Session(ParseUrlMixin):
                     "%s has been Authenticated and Welcomed", self.client_name,
                 )
 
+    def _make_hello(self):
+        details = self.roles
+        for role, features in details['roles'].items():
+            features.setdefault('features', {})
+            features['features'].setdefault('call_timeout', True)
+            if role in ('caller', 'callee'):
+                features['features'].setdefault(
+                    'progressive_call_results', True,
+                )
+
+        return Hello(realm=self.realm, details=details)
+
+    def _make_authenticate(self, challenge):
+        if 'WAMPYSECRET' not in os.environ:
+            raise WampyError(
+                "Wampy requires a client's secret to be "
+                "in the environment as ``WAMPYSECRET``"
+            )
+
+        secret = os.environ['WAMPYSECRET']
+        if challenge.auth_method == 'ticket':
+            logger.info("proceeding with ticket authentication method")
+            return Authenticate(secret)
+
+        logger.info("assuming wampcra authentication method")
+        signature = compute_wcs(secret, str(challenge.challenge))
+        return Authenticate(signature.decode("utf-8"))
+
     def _say_goodbye(self, goodbye_from):
         logger.info("%s is saying GoodBye", goodbye_from)
         message = Goodbye()
@@ -222,30 +552,36 @@ class Session(ParseUrlMixin):
         connection = self.connection
 
         def connection_handler():
+            # ``receive`` blocks in the socket read, and only when every
+            # frame already read has been handled, so a burst of messages
+            # is dispatched without a trip through the hub per message.
             while True:
-                if not self._managed_thread.ready():
-                    async_adapter.sleep()
-
-                if (
-                    not hasattr(connection, 'closed') or
-                    connection.socket.closed
-                ):
-                    try:
-                        frame = connection.receive()
-                        if frame:
-                            message = frame.payload
-                            logger.info("handling %s", message)
-                            self.message_handler.handle_message(message)
-                    except (SystemExit, KeyboardInterrupt):
-                        logger.warning("system manually exited")
-                        break
-                    except NoFrameReturnedError:
-                        break
-
-                else:
-                    # this is likely the parent gthread closing it deliberately
+                try:
+                    frame = connection.receive()
+                except (SystemExit, KeyboardInterrupt):
+                    logger.warning("system manually exited")
+                    break
+                except NoFrameReturnedError:
+                    # this is likely the parent gthread closing it
+                    # deliberately
                     logger.warning("connection gthread has closed")
                     break
+                except WebsocktProtocolError as exc:
+                    # e.g. a message larger than we will accept. there is
+                    # no carrying on, so fail everything that is waiting
+                    # rather than have it time out.
+                    logger.error("abandoning the connection: %s", exc)
+                    connection.disconnect()
+                    # the Session is over: there is no saying Goodbye now
+                    self.session_id = None
+                    for response in self._pending_requests.values():
+                        response.set_exception(exc)
+                    break
+
+                # the payload's bytes are handed over as they are, not
+                # decoded to ``str``, as the deserializer reads them as
+                # well - and checks that text is valid UTF-8.
+                self.message_handler.handle_message(frame.payload_bytes)
 
         gthread = async_adapter.spawn(connection_handler)
         self._managed_thread = gthread
@@ -267,16 +603,268 @@ class Session(ParseUrlMixin):
     def _register_procedure(self, procedure_name, invocation_policy="single"):
         """ Register a "procedure" on a Client as callable over the Router.
         The REGISTERED Message is handled by the MessageHandler.
+
+        With a ``chunk_size``, the procedure which the chunks of Calls
+        to it are sent to is registered too - and first, so that it is
+        there once the procedure is.
+
         """
+        procedure_names = [procedure_name]
+        if self.chunk_size is not None:
+            procedure_names.insert(
+                0, procedure_name + CHUNKS_PROCEDURE_SUFFIX,
+            )
+
         options = {"invoke": invocation_policy}
-        message = Register(procedure=procedure_name, options=options)
-        request_id = message.request_id
+        for name in procedure_names:
+            message = Register(procedure=name, options=options)
+            request_id = message.request_id
+
+            try:
+                self.send_message(message)
+            except ValueError:
+                raise WampProtocolError(
+                    "failed to register callee: %s", name
+                )
+
+            self.request_ids[request_id] = name
+
+
+class AsyncSession(Session):
+    """ A ``Session`` for the ``AsyncClient``, run on asyncio.
+
+    Whatever waits on the Router - beginning and ending the Session,
+    receiving a message, registering and subscribing - is awaited here.
+    Sending a message never waits, see ``AsyncWebSocket``, so is not.
+
+    """
+    async_adapter = asyncio_adapter
+
+    def __init__(
+        self, router_url, message_handler, ipv, cert_path,
+        call_timeout, realm, roles, client_name, serializer=None,
+        compression=None, max_message_size=WEBSOCKET_MAX_MESSAGE_SIZE,
+        fragment_size=None,
+    ):
+        """ A Session between an ``AsyncClient`` and a Router, which is
+        connected by ``begin``.
+
+        :Parameters:
+            See ``Session``, but for coalescing writes, which asyncio
+            does anyway, and chunking.
+
+        """
+        self.url = router_url
+        self.parse_url()
+
+        self.message_handler = message_handler
+        self.ipv = ipv
+        self.cert_path = cert_path
+        self.call_timeout = call_timeout
+        self.realm = realm
+        self.roles = roles
+        self.client_name = client_name
+
+        if self.scheme == "ws":
+            self.transport = AsyncWebSocket(
+                server_url=self.url,
+                ipv=self.ipv,
+                serializer=serializer,
+                compression=compression,
+                max_message_size=max_message_size,
+                fragment_size=fragment_size,
+            )
+        elif self.scheme == "wss":
+            self.transport = AsyncSecureWebSocket(
+                server_url=self.url,
+                ipv=self.ipv,
+                certificate_path=self.cert_path,
+                serializer=serializer,
+                compression=compression,
+                max_message_size=max_message_size,
+                fragment_size=fragment_size,
+            )
+        else:
+            raise WampyError(
+                'wampy only suppoers network protocol "ws" or "wss"'
+            )
+
+        self.connection = None
+
+        self.request_ids = {}
+        self.subscription_map = {}
+        self.registration_map = {}
+        # and of the procedures which the chunks of Calls are sent to
+        self.chunks_registration_map = {}
+
+        self.session_id = None
+        self._managed_thread = None
+        # made once there is an event loop to make them in
+        self._message_queue = None
+        self._pending_requests = {}
+        # the tasks running procedures for INVOCATIONs. the event loop
+        # only keeps weak references to tasks, so these are kept here
+        # until they are done.
+        self._invocation_tasks = set()
+
+        # large arguments are not sent in chunks, but those received in
+        # chunks, and chunked results, are still put back together
+        self.chunk_size = None
+        self._chunk_index = {}
+        self._partial_results = {}
+
+    async def begin(self):
+        self._message_queue = self.async_adapter.queue()
+        self.connection = await self.transport.connect(upgrade=True)
+        self._listen()
+
+        await self._say_hello()
+        logger.info("Session requested")
+
+    async def end(self, goodbye_from):
+        # their results could no longer be sent anyway
+        invocation_tasks = list(self._invocation_tasks)
+        for task in invocation_tasks:
+            task.cancel()
+        await asyncio.gather(*invocation_tasks, return_exceptions=True)
+
+        await self._say_goodbye(goodbye_from=goodbye_from)
+        await self.connection.disconnect()
+        self._managed_thread.cancel()
+        self.session_id = None
+
+    def put_message(self, message_obj):
+        self._message_queue.put_nowait(message_obj)
+
+    async def flush(self):
+        await self.connection.flush()
+
+    async def recv_message(
+        self, source_request_id=None, timeout=None, discard=True,
+    ):
+        # whatever we are waiting on a reply to must be on its way
+        await self.flush()
+
+        response = self._pending_requests.get(source_request_id)
+        timeout = timeout or self.call_timeout
 
         try:
-            self.send_message(message)
-        except ValueError:
-            raise WampProtocolError(
-                "failed to register callee: %s", procedure_name
+            if response is None:
+                message = await self.async_adapter.receive_message(
+                    timeout=timeout, message_queue=self._message_queue,
+                )
+            else:
+                message = await response.get(timeout=timeout)
+        except WampyTimeOutError:
+            if source_request_id:
+                logger.warning(
+                    'cancelling Call after wampy timed the Call out'
+                )
+                cancelation = Cancel(request_id=source_request_id)
+                self.send_message(cancelation)
+            raise
+        finally:
+            if response is not None and discard:
+                self.discard_request(source_request_id)
+
+        return message
+
+    async def _say_hello(self):
+        self.send_message(self._make_hello())
+        message_obj = await self.recv_message()
+
+        if message_obj.WAMP_CODE == Challenge.WAMP_CODE:
+            self.send_message(self._make_authenticate(message_obj))
+            message_obj = await self.recv_message()
+
+        # raise if Router aborts handshake or we cannot respond to a
+        # Challenge.
+        if message_obj.WAMP_CODE == Abort.WAMP_CODE:
+            await self.connection.disconnect()
+            self._managed_thread.cancel()
+            raise WampyError(message_obj.message)
+
+    async def _say_goodbye(self, goodbye_from):
+        logger.info("%s is saying GoodBye", goodbye_from)
+        self.send_message(Goodbye())
+
+        message_obj = await self.recv_message()
+        if message_obj.WAMP_CODE != Goodbye.WAMP_CODE:
+            raise WampyError(
+                "Expecting a Goodbye from the Router: got a "
+                f"{message_obj.WAMP_CODE} instead",
             )
 
-        self.request_ids[request_id] = procedure_name
+    def _listen(self):
+        connection = self.connection
+
+        async def connection_handler():
+            try:
+                while True:
+                    try:
+                        frame = await connection.receive()
+                    except NoFrameReturnedError:
+                        logger.warning("connection task has closed")
+                        break
+                    except WebsocktProtocolError as exc:
+                        logger.error("abandoning the connection: %s", exc)
+                        await connection.disconnect()
+                        self.session_id = None
+                        for response in self._pending_requests.values():
+                            response.set_exception(exc)
+                        break
+
+                    self.message_handler.handle_message(frame.payload_bytes)
+            finally:
+                # there will be no more EVENTs
+                for subscription, _ in self.subscription_map.values():
+                    subscription.put_end()
+
+        self._managed_thread = self.async_adapter.spawn(connection_handler)
+
+    async def _request(self, message_obj):
+        # send a request, and return its response - unless it is an ERROR
+        self.send_request(message_obj)
+        response = await self.recv_message(
+            source_request_id=message_obj.request_id,
+        )
+        if response.WAMP_CODE == Error.WAMP_CODE:
+            raise WampyError(
+                "the Router refused a {}: {}".format(
+                    message_obj.name, response.message,
+                )
+            )
+
+        return response
+
+    async def _subscribe_to_topic(self, handler, topic):
+        """ Subscribe a handler, e.g. a ``Subscription``, to a topic, and
+        return the ID of the subscription.
+        """
+        subscribed = await self._request(Subscribe(topic=topic))
+        self.subscription_map[subscribed.subscription_id] = handler, topic
+        return subscribed.subscription_id
+
+    async def _unsubscribe(self, subscription_id):
+        await self._request(Unsubscribe(subscription_id=subscription_id))
+        self.subscription_map.pop(subscription_id, None)
+
+    async def _register_procedure(
+        self, procedure_name, invocation_policy="single",
+    ):
+        options = {"invoke": invocation_policy}
+        # chunks are always put back together, so there is always
+        # somewhere to send the chunks of Calls to it - before it can be
+        # Called at all
+        chunks_procedure_name = procedure_name + CHUNKS_PROCEDURE_SUFFIX
+        registered = await self._request(
+            Register(procedure=chunks_procedure_name, options=options)
+        )
+        self.chunks_registration_map[registered.registration_id] = (
+            chunks_procedure_name
+        )
+
+        registered = await self._request(
+            Register(procedure=procedure_name, options=options)
+        )
+        self.registration_map[registered.registration_id] = procedure_name
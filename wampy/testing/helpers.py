@@ -1,10 +1,10 @@
 # This Source Code Form is subject to the terms of the Mozilla Public
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
-import json
 
 from wampy.backends import async_adapter
 from wampy.message_handler import MessageHandler
+from wampy.transports.websocket.frames import Frame, FrameFactory
 
 TIMEOUT = 5
 
@@ -65,7 +65,17 @@ class CollectingMessageHandler(MessageHandler):
         self.messages_received = []
 
     def handle_message(self, message):
-        self.messages_received.append(json.loads(message))
+        self.messages_received.append(
+            self.client.serializer.deserialize(message)
+        )
         super(CollectingMessageHandler, self).handle_message(
             message,
         )
+
+
+def server_frame(payload, opcode=Frame.OPCODE_TEXT, fin_bit=1, rsv1=0):
+    """ The bytes of a frame as a server sends it, i.e. never masked. """
+    return bytes(FrameFactory.generate_bytes(
+        payload=payload, fin_bit=fin_bit, opcode=opcode, mask_payload=False,
+        rsv1=rsv1,
+    ))
@@ -3,3 +3,4 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from . websocket import WebSocket, SecureWebSocket  # noqa
+from . websocket import AsyncWebSocket, AsyncSecureWebSocket  # noqa
@@ -3,3 +3,4 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from . connection import WebSocket, SecureWebSocket  # noqa
+from . asyncio_ import AsyncWebSocket, AsyncSecureWebSocket  # noqa
@@ -0,0 +1,383 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" WebSocket client connections for asyncio, as ``asyncio`` Protocols.
+
+Frames are built, parsed, fragmented and compressed exactly as they are
+by the ``WebSocket``, whose code this shares: only the I/O differs. The
+event loop reads straight into the receive buffer, and each read is
+parsed into frames there and then - so nothing is copied on the way in,
+and there is no stream in between to wake. Any event loop implementing
+the Protocol API will do, and uvloop's is the quickest.
+
+Sending never waits. The frames sent in one turn of the event loop are
+written together at the end of it, or once ``coalesce_max_bytes`` of
+them are waiting. ``flush`` is awaited to hold back a sender while the
+Router is slow to take them.
+
+"""
+import asyncio
+import logging
+import socket
+import ssl
+import uuid
+
+from wampy.backends import asyncio_adapter as async_adapter
+from wampy.config.defaults import heartbeat, heartbeat_timeout
+from wampy.constants import (
+    WEBSOCKET_MAX_MESSAGE_SIZE, WEBSOCKET_RECEIVE_BUFFER_SIZE,
+    WEBSOCKET_VECTORED_SEND_THRESHOLD,
+)
+from wampy.errors import NoFrameReturnedError, WampyError, WampyTimeOutError
+
+from . connection import WebSocket
+from . frames import Ping
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWebSocket(WebSocket, asyncio.BufferedProtocol):
+
+    async_adapter = async_adapter
+
+    def __init__(
+        self, server_url, ipv=4,
+        receive_buffer_size=WEBSOCKET_RECEIVE_BUFFER_SIZE,
+        vectored_send_threshold=WEBSOCKET_VECTORED_SEND_THRESHOLD,
+        serializer=None, compression=None,
+        max_message_size=WEBSOCKET_MAX_MESSAGE_SIZE, fragment_size=None,
+    ):
+        """ A WebSocket client connection for asyncio, whose ``connect``,
+        ``receive``, ``flush`` and ``disconnect`` are awaited.
+
+        The parameters are those of the ``WebSocket``, but for writes
+        being coalesced, which they always are here, up to the
+        ``WEBSOCKET_COALESCE_MAX_BYTES``.
+
+        """
+        super(AsyncWebSocket, self).__init__(
+            server_url=server_url, ipv=ipv,
+            receive_buffer_size=receive_buffer_size,
+            vectored_send_threshold=vectored_send_threshold,
+            serializer=serializer, compression=compression,
+            max_message_size=max_message_size, fragment_size=fragment_size,
+        )
+
+        self.pinger_thread = None
+
+        # the event loop's end of the connection
+        self._transport = None
+        self._closed = None
+        self._connection_lost = False
+        # the ``receive`` waiting on more bytes, if any
+        self._waiter = None
+        self._reading_paused = False
+        # the buffers to write at the end of this turn of the event loop,
+        # and the ``flush``es waiting on the transport's write buffer
+        self._pending_writes = []
+        self._pending_bytes = 0
+        self._write_scheduled = False
+        self._writing_paused = False
+        self._drain_waiters = []
+
+    async def connect(self, upgrade=True):
+        if self.ipv == 4:
+            family = socket.AF_INET
+        elif self.ipv == 6:
+            family = socket.AF_INET6
+        else:
+            raise WampyError(
+                "unknown IPV: {}".format(self.ipv)
+            )
+
+        loop = asyncio.get_running_loop()
+        self._closed = loop.create_future()
+
+        try:
+            await loop.create_connection(
+                lambda: self, self.host, self.port, family=family,
+                ssl=self._ssl_context(),
+            )
+        except OSError:
+            logger.error(
+                'unable to connect to %s:%s (IPV%s)',
+                self.host, self.port, self.ipv
+            )
+            raise
+
+        logger.info("socket connected")
+        await self._handshake(upgrade=upgrade)
+
+        if heartbeat > 0:
+            self.start_pinging()
+        return self
+
+    async def disconnect(self):
+        logger.warning("disconnecting from %s", self.url)
+        self.stop_pinging()
+
+        if self._transport is not None:
+            self._write_pending()
+            # the transport writes out what it holds before closing
+            self._transport.close()
+            await self._closed
+
+    async def flush(self):
+        """ Wait for the transport to take everything sent - or for its
+        write buffer to be small again, at least - if it is behind.
+        Otherwise it is written at the end of this turn of the event
+        loop, as ever.
+        """
+        if self._writing_paused and not self._connection_lost:
+            self._write_pending()
+            waiter = asyncio.get_running_loop().create_future()
+            self._drain_waiters.append(waiter)
+            await waiter
+
+    def send_frame(self, payload, opcode, mask_payload=True, rsv1=0):
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        if self.fragment_size is None:
+            self._send_frame(payload, 1, opcode, mask_payload, rsv1)
+            return
+
+        # the fragments are all written together, so nothing else can
+        # come in between them
+        for fragment, fin_bit, opcode, rsv1 in self._fragment(
+            payload, opcode, rsv1,
+        ):
+            self._send_frame(fragment, fin_bit, opcode, mask_payload, rsv1)
+
+    def _send_raw(self, *buffers):
+        logger.debug('send raw: %s', buffers)
+        self._pending_writes.extend(buffer for buffer in buffers if buffer)
+        self._pending_bytes += sum(len(buffer) for buffer in buffers)
+
+        if self._pending_bytes >= self.coalesce_max_bytes:
+            self._write_pending()
+        elif not self._write_scheduled:
+            self._write_scheduled = True
+            asyncio.get_running_loop().call_soon(self._write_pending)
+
+    def _write_pending(self):
+        self._write_scheduled = False
+        if not self._pending_writes or self._connection_lost:
+            return
+
+        pending_writes, self._pending_writes = self._pending_writes, []
+        self._pending_bytes = 0
+        self._transport.writelines(pending_writes)
+
+    async def receive(self):
+        """ Return the next WAMP carrying (or Close) frame from the server,
+        as the ``WebSocket`` does.
+
+        A data frame is a view over the receive buffer, so take what you
+        need from it before anything else is awaited.
+
+        """
+        while True:
+            frame = self._next_frame()
+            if frame is not None:
+                return frame
+
+            # every frame parsed so far has been handled, so all of the
+            # buffer is free again
+            self._reclaim_buffer()
+            if self._reading_paused:
+                self._reading_paused = False
+                self._transport.resume_reading()
+
+            await self._wait_for_bytes()
+
+    async def _wait_for_bytes(self):
+        if self._connection_lost:
+            raise NoFrameReturnedError()
+
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def _wake_up(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def get_buffer(self, sizehint):
+        """ Hand the event loop the free end of the receive buffer to read
+        into.
+        """
+        if self._buffer_end == len(self._receive_buffer):
+            if self._received_frames:
+                # frames still to be returned are views over this buffer,
+                # so rather than shuffle bytes to its front, start a new
+                # one with them. this is rare, as reading is paused once
+                # the buffer is full of frames not yet handled.
+                self._move_to_new_buffer()
+            else:
+                self._make_room_in_buffer()
+
+        return self._receive_view[self._buffer_end:]
+
+    def buffer_updated(self, nbytes):
+        self._buffer_end += nbytes
+
+        if not self.connected:
+            # still reading the handshake response
+            self._wake_up()
+            return
+
+        self._parse_buffered_frames()
+        if not self._received_frames:
+            return
+
+        if self._buffer_end == len(self._receive_buffer):
+            # the other end is sending faster than the frames are handled
+            self._reading_paused = True
+            self._transport.pause_reading()
+        self._wake_up()
+
+    def eof_received(self):
+        # let the transport close itself
+        return False
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            logger.info("connection lost: %s", exc)
+
+        self._connection_lost = True
+        self._wake_up()
+        self._resume_drain_waiters()
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self):
+        self._writing_paused = True
+
+    def resume_writing(self):
+        self._writing_paused = False
+        self._resume_drain_waiters()
+
+    def _resume_drain_waiters(self):
+        drain_waiters, self._drain_waiters = self._drain_waiters, []
+        for waiter in drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _move_to_new_buffer(self):
+        pending = self._buffer_end - self._buffer_start
+        receive_buffer = bytearray(max(
+            pending + self._frame_parser.required_bytes,
+            self.receive_buffer_size,
+        ))
+        receive_buffer[:pending] = (
+            self._receive_view[self._buffer_start:self._buffer_end]
+        )
+
+        self._receive_buffer = receive_buffer
+        self._receive_view = memoryview(receive_buffer)
+        self._buffer_start = 0
+        self._buffer_end = pending
+
+    def _ssl_context(self):
+        # plain TCP
+        return None
+
+    async def _handshake(self, upgrade):
+        handshake_headers = self._get_handshake_headers(upgrade=upgrade)
+        handshake = '\r\n'.join(handshake_headers) + "\r\n\r\n"
+
+        self._transport.write(handshake.encode())
+
+        try:
+            async with async_adapter.Timeout(5):
+                while True:
+                    end = self._receive_buffer.find(
+                        b'\r\n\r\n', self._buffer_start, self._buffer_end,
+                    )
+                    if end >= 0:
+                        break
+                    await self._wait_for_bytes()
+        except (WampyTimeOutError, NoFrameReturnedError):
+            raise WampyError(
+                'No response after handshake "{}"'.format(handshake)
+            )
+
+        response = bytes(self._receive_view[self._buffer_start:end])
+        # each header ends with \r\n and there's an extra \r\n after the
+        # last one
+        self._buffer_start = end + 4
+
+        self.status, self.headers = self._parse_handshake_response(
+            response.split(b'\r\n')
+        )
+        self._check_handshake(upgrade)
+
+        # the Router may have sent frames straight after its response
+        self._parse_buffered_frames()
+
+        logger.debug("connection upgraded")
+
+    def start_pinging(self):
+        self.pinger_thread = async_adapter.spawn(self._ping)
+        self.is_pinging = True
+
+    async def _ping(self):
+        # the first Ping will be emitted after the first "hearbeat"
+        # seconds, i.e. *not* immediatly
+        while True:
+            await async_adapter.sleep(heartbeat)
+
+            # we send a Ping with a unique payload, and we expect a Pong
+            # back echoing the same payload - but within the deadline of
+            # ``heartbeat_timeout_seconds``.
+            payload = 'wampy::' + str(uuid.uuid4())
+            pong_received = async_adapter.Event()
+            self._awaited_pongs[payload.encode('utf-8')] = pong_received
+
+            try:
+                self._send_raw(Ping(payload=payload, mask_payload=True).frame)
+
+                async with async_adapter.Timeout(heartbeat_timeout):
+                    await pong_received.wait()
+            except WampyTimeOutError:
+                logger.info('missed a Pong from the server')
+                self.missed_pongs += 1
+            finally:
+                self._awaited_pongs.pop(payload.encode('utf-8'), None)
+
+    def stop_pinging(self):
+        if self.pinger_thread is not None:
+            self.pinger_thread.cancel()
+            self.pinger_thread = None
+        self.is_pinging = False
+
+    def handle_close(self, close_frame):
+        logger.warning(
+            'server closed connection: %s', close_frame.payload,
+        )
+        self.stop_pinging()
+        # there is nothing to wait for: the Router has gone
+        self._write_pending()
+        self._transport.close()
+
+
+class AsyncSecureWebSocket(AsyncWebSocket):
+
+    def __init__(self, server_url, certificate_path, ipv=4, **kwargs):
+        super(AsyncSecureWebSocket, self).__init__(
+            server_url=server_url, ipv=ipv, **kwargs
+        )
+
+        self.certificate = certificate_path
+
+    def _ssl_context(self):
+        context = ssl.create_default_context(cafile=self.certificate)
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        return context
@@ -7,6 +7,7 @@ import sched
 import socket
 import ssl
 import uuid
+from collections import deque
 try:
     from base64 import encodestring as encodebytes
 except ImportError:
@@ -19,26 +20,100 @@ from wampy.backends import async_adapter
 from wampy.backends.errors import WampyTimeOut
 from wampy.config.defaults import heartbeat, heartbeat_timeout
 from wampy.constants import (
-    WEBSOCKET_SUBPROTOCOLS, WEBSOCKET_VERSION,
+    WEBSOCKET_COALESCE_DELAY, WEBSOCKET_COALESCE_MAX_BYTES,
+    WEBSOCKET_MAX_MESSAGE_SIZE, WEBSOCKET_RECEIVE_BUFFER_SIZE,
+    WEBSOCKET_VECTORED_SEND_THRESHOLD, WEBSOCKET_VERSION,
 )
 from wampy.errors import (
-    IncompleteFrameError, NoFrameReturnedError, WampProtocolError, WampyError,
+    NoFrameReturnedError, WampProtocolError, WampyError,
+    WebsocktProtocolError,
 )
 from wampy.interfaces import Transport
 from wampy.mixins import ParseUrlMixin
-from wampy.serializers import json_serialize
+from wampy.serializers import JsonSerializer
 
-from . frames import FrameFactory, Ping, Pong, Text
+from . frames import Frame, FrameFactory, FrameParser, Ping, Pong
 
 logger = logging.getLogger(__name__)
 
 
 class WebSocket(Transport, ParseUrlMixin):
 
-    def __init__(self, server_url, ipv=4):
+    # where the connection's locks, queues and green threads come from
+    async_adapter = async_adapter
+
+    def __init__(
+        self, server_url, ipv=4,
+        receive_buffer_size=WEBSOCKET_RECEIVE_BUFFER_SIZE,
+        vectored_send_threshold=WEBSOCKET_VECTORED_SEND_THRESHOLD,
+        coalesce_writes=False,
+        coalesce_max_bytes=WEBSOCKET_COALESCE_MAX_BYTES,
+        coalesce_delay=WEBSOCKET_COALESCE_DELAY, serializer=None,
+        compression=None, max_message_size=WEBSOCKET_MAX_MESSAGE_SIZE,
+        fragment_size=None,
+    ):
+        """ A WebSocket client connection.
+
+        :Parameters:
+            server_url : string
+                The URL of the WebSocket server, i.e. the Router.
+            ipv : int
+                The Internet Protocol version. Defaults to 4.
+            receive_buffer_size : int
+                The number of bytes requested from the socket on each
+                read. Frames larger than this are still received, the
+                buffer grows to fit them.
+            vectored_send_threshold : int
+                Payloads of at least this many bytes are sent as a
+                separate buffer to their frame header, rather than both
+                being copied into one, using ``socket.sendmsg`` when the
+                socket supports it.
+            coalesce_writes : bool
+                Opt in to holding back outgoing frames so that a burst of
+                them goes out in a single write. Defaults to ``False``.
+            coalesce_max_bytes : int
+                When coalescing, write as soon as this many bytes are
+                waiting.
+            coalesce_delay : float
+                When coalescing, the most seconds a frame is held back
+                for. ``flush`` writes out everything immediately.
+            serializer : ``wampy.interfaces.Serializer``
+                Serializes the WAMP messages sent, and decides the
+                subprotocol asked for in the handshake and the type of
+                frame sent. Defaults to a ``JsonSerializer``.
+            compression : ``PerMessageDeflate``
+                Offer the Router permessage-deflate compression, see
+                ``wampy.transports.websocket.deflate``. Defaults to
+                ``None``, i.e. no compression.
+            max_message_size : int
+                The largest message to accept from the Router, however
+                many frames it comes in and once inflated. Anything
+                larger is a ``WebsocktProtocolError``. Defaults to
+                ``WEBSOCKET_MAX_MESSAGE_SIZE``, and ``None`` is no limit.
+            fragment_size : int
+                Send messages larger than this many bytes as fragments
+                of at most this size, with Pings and Pongs free to go in
+                between them. Defaults to ``None``, i.e. every message is
+                sent as one frame.
 
+        """
         self.url = server_url
         self.ipv = ipv
+        self.receive_buffer_size = receive_buffer_size
+        self.vectored_send_threshold = vectored_send_threshold
+        self.coalesce_writes = coalesce_writes
+        self.coalesce_max_bytes = coalesce_max_bytes
+        self.coalesce_delay = coalesce_delay
+        self.serializer = serializer or JsonSerializer()
+        self._data_opcode = (
+            Frame.OPCODE_BINARY if self.serializer.BINARY
+            else Frame.OPCODE_TEXT
+        )
+        self.compression = compression
+        # the compression agreed with the Router, if any
+        self._deflater = None
+        self.max_message_size = max_message_size
+        self.fragment_size = fragment_size
 
         self.host = None
         self.port = None
@@ -54,22 +129,65 @@ class WebSocket(Transport, ParseUrlMixin):
         self._pinged_at = None
         self._pong_pointer = None
 
-        self.pongs = async_adapter.queue()
+        # Pongs are expected for our own Pings, by payload bytes.
+        # any other is dropped.
+        self._awaited_pongs = {}
         self.missed_pongs = 0
         self.is_pinging = False
 
+        # bytes are read from the socket in large chunks into a persistent
+        # buffer. ``_buffer_start`` and ``_buffer_end`` mark the bytes
+        # received but not yet parsed into frames, which may be the start of
+        # a frame still in flight.
+        self._receive_buffer = bytearray(self.receive_buffer_size)
+        self._receive_view = memoryview(self._receive_buffer)
+        self._buffer_start = 0
+        self._buffer_end = 0
+        # remembers the header of a frame still being received
+        self._frame_parser = FrameParser(max_payload_length=max_message_size)
+        # the first byte and type of frame of a fragmented message being
+        # received, and the payload of its fragments so far
+        self._fragmented = None
+        self._fragments = None
+        # frames held back when coalescing writes, and the green thread
+        # which writes them out. the lock keeps any writes, coalesced or
+        # not, from interleaving.
+        self._write_buffer = bytearray()
+        self._write_lock = self.async_adapter.Lock()
+        self._write_wakeups = self.async_adapter.queue()
+        self._writer_thread = None
+        # the fragments of one message must not be interleaved with those
+        # of another, so each message sent holds this while fragmenting
+        self._message_lock = self.async_adapter.Lock()
+        # complete frames parsed from the buffer but not yet returned.
+        # these are views over the buffer, so the buffer is only reused
+        # once they have all been returned.
+        self._received_frames = deque()
+
     def connect(self, upgrade=True):
         # TCP connection
         self._connect()
         self._handshake(upgrade=upgrade)
 
+        if self.coalesce_writes:
+            self._writer_thread = self.async_adapter.spawn(self._writer)
+
         if heartbeat > 0:
             self.start_pinging()
         return self
 
     def disconnect(self):
         logger.warning("disconnecting from %s", self.url)
+        if self._writer_thread:
+            self._writer_thread.kill()
+            self._writer_thread = None
+
         if self.socket:
+            try:
+                self.flush()
+            except OSError:
+                pass
+
             try:
                 self.socket.shutdown(socket.SHUT_RDWR)
             except socket.error:
@@ -78,63 +196,245 @@ class WebSocket(Transport, ParseUrlMixin):
             self.socket.close()
 
     def send(self, message):
-        frame = Text(payload=json_serialize(message))
-        websocket_message = frame.frame
-        self._send_raw(websocket_message)
+        payload = self.serializer.serialize(message)
+
+        deflater = self._deflater
+        if deflater is not None and deflater.worth_compressing(payload):
+            self.send_frame(
+                payload=deflater.compress(payload),
+                opcode=self._data_opcode,
+                rsv1=1,
+            )
+            return
+
+        self.send_frame(payload=payload, opcode=self._data_opcode)
 
-    def _send_raw(self, websocket_message):
-        logger.debug('send raw: %s', websocket_message)
-        self.socket.sendall(websocket_message)
+    def send_frame(self, payload, opcode, mask_payload=True, rsv1=0):
+        """ Frame and send ``payload`` (``str`` or bytes-like), as
+        fragments if it is larger than the ``fragment_size``.
 
-    def receive(self, bufsize=1):
-        frame = None
-        received_bytes = bytearray()
-        conn = self.socket
+        Client to server frames must always be masked, but unmasked frames
+        are supported too, e.g. for server side use. ``rsv1`` marks the
+        payload as compressed.
 
+        """
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        if self.fragment_size is None:
+            self._send_frame(payload, 1, opcode, mask_payload, rsv1)
+            return
+
+        with self._message_lock:
+            for fragment, fin_bit, opcode, rsv1 in self._fragment(
+                payload, opcode, rsv1,
+            ):
+                if opcode == Frame.OPCODE_CONT:
+                    # let a Ping or Pong out between fragments - never
+                    # inside one, as each is written under the write lock
+                    self.async_adapter.sleep()
+
+                self._send_frame(fragment, fin_bit, opcode, mask_payload, rsv1)
+
+    def _fragment(self, payload, opcode, rsv1):
+        """ Split a payload into fragments of at most ``fragment_size``,
+        yielding the ``(fragment, fin_bit, opcode, rsv1)`` of each.
+        """
+        fragment_size = self.fragment_size
+        if len(payload) <= fragment_size:
+            yield payload, 1, opcode, rsv1
+            return
+
+        # each fragment is a view over the payload, so only the masked
+        # copy of one fragment at a time is ever made
+        view = memoryview(payload)
+        for start in range(0, len(view), fragment_size):
+            end = start + fragment_size
+            if start:
+                opcode = Frame.OPCODE_CONT
+                # compression is of the whole message, so is marked on the
+                # first fragment only
+                rsv1 = 0
+
+            yield view[start:end], int(end >= len(view)), opcode, rsv1
+
+    def _send_frame(self, payload, fin_bit, opcode, mask_payload, rsv1):
+        if len(payload) < self.vectored_send_threshold:
+            # build the frame's bytes directly rather than a ``Text``
+            # frame object, which would only inspect the header we just
+            # wrote
+            self._send_raw(FrameFactory.generate_bytes(
+                payload=payload,
+                fin_bit=fin_bit,
+                opcode=opcode,
+                mask_payload=mask_payload,
+                rsv1=rsv1,
+            ))
+        else:
+            self._send_raw(*FrameFactory.generate_parts(
+                payload=payload,
+                fin_bit=fin_bit,
+                opcode=opcode,
+                mask_payload=mask_payload,
+                rsv1=rsv1,
+            ))
+
+    def _send_raw(self, *buffers):
+        logger.debug('send raw: %s', buffers)
+
+        if not self.coalesce_writes:
+            # Callers, Callees' executors, Pongs and the pinger all send
+            # from green threads of their own, and a write may block part
+            # way through - so each is finished before the next begins
+            with self._write_lock:
+                self._write(*buffers)
+            return
+
+        size = sum(len(buffer) for buffer in buffers)
+        if size >= self.coalesce_max_bytes:
+            # nothing to gain from holding this one back, so write it out
+            # now along with anything already waiting, keeping their order
+            with self._write_lock:
+                waiting = self._take_write_buffer()
+                self._write(waiting, *buffers)
+            return
+
+        start_the_clock = not self._write_buffer
+        for buffer in buffers:
+            self._write_buffer += buffer
+
+        if len(self._write_buffer) >= self.coalesce_max_bytes:
+            self.flush()
+        elif start_the_clock:
+            self._write_wakeups.put(None)
+
+    def flush(self):
+        """ Write out any frames held back by coalescing.
+        """
+        with self._write_lock:
+            waiting = self._take_write_buffer()
+            if waiting:
+                self._write(waiting)
+
+    def _take_write_buffer(self):
+        waiting, self._write_buffer = self._write_buffer, bytearray()
+        return waiting
+
+    def _writer(self):
+        # a held back frame is written out within ``coalesce_delay`` of
+        # being sent, along with anything else sent in that time.
         while True:
+            self._write_wakeups.get()
+            self.async_adapter.sleep(self.coalesce_delay)
 
             try:
-                bytes_ = conn.recv(bufsize)
-            except socket.timeout as e:
-                message = str(e)
-                raise ConnectionError('timeout: "{}"'.format(message))
+                self.flush()
             except OSError:
-                logger.info("socket connection lost? Bad File Descriptor?")
-                break
-            except Exception as exc:
-                raise ConnectionError('Connection lost: "{}"'.format(exc))
-            if not bytes_:
+                logger.warning("failed to write to %s", self.url)
                 break
 
-            received_bytes.extend(bytes_)
+    def _write(self, *buffers):
+        buffers = [buffer for buffer in buffers if buffer]
+        if not buffers:
+            return
+
+        if len(buffers) == 1:
+            self.socket.sendall(buffers[0])
+            return
 
+        # scatter/gather so that the buffers needn't be joined up first.
+        # the method is looked up on the class because green sockets that
+        # don't implement it cooperatively may still proxy the OS call.
+        if hasattr(type(self.socket), 'sendmsg'):
             try:
-                frame = FrameFactory.from_bytes(received_bytes)
-            except IncompleteFrameError as exc:
-                bufsize = exc.required_bytes
+                self._sendmsg_all(buffers)
+            except NotImplementedError:
+                # e.g. TLS sockets, which must encrypt each write
+                pass
             else:
-                # non WAMP-handled opcides
-                if frame.opcode == frame.OPCODE_PING:
-                    # Opcode 0x9 marks a ping frame. It does not contain wamp
-                    # data, so the frame is not returned.
-                    # Still it must be handled or the server will close the
-                    # connection.
-                    async_adapter.spawn(self.handle_ping(ping_frame=frame))
-                    received_bytes = bytearray()
-                    continue
-                if frame.opcode == frame.OPCODE_PONG:
-                    self.handle_pong(pong_frame=frame)
-                    received_bytes = bytearray()
-                    continue
-                if frame.opcode == frame.OPCODE_BINARY:
+                return
+
+        # one write of the whole frame, so that its header and payload
+        # are never split by another frame's, nor into two TLS records
+        self.socket.sendall(b''.join(buffers))
+
+    def _sendmsg_all(self, buffers):
+        # like ``sendall`` but for ``sendmsg``, which may send only part
+        # of what it is given
+        views = deque(memoryview(buffer) for buffer in buffers)
+
+        while views:
+            sent = self.socket.sendmsg(views)
+
+            while sent:
+                view = views[0]
+                if sent < len(view):
+                    views[0] = view[sent:]
                     break
-                if frame.opcode == frame.OPCODE_CLOSE:
-                    self.handle_close(close_frame=frame)
 
-                break
+                sent -= len(view)
+                views.popleft()
+
+    def receive(self):
+        """ Return the next WAMP carrying (or Close) frame from the server.
+
+        Pings and Pongs are handled here and not returned, and the
+        fragments of a message are put back together into a single frame.
+
+        A data frame is a view over the receive buffer and is only valid
+        until ``receive`` is next called, so take what you need from it,
+        e.g. its ``payload``, before then.
+
+        """
+        while True:
+            frame = self._next_frame()
+            if frame is not None:
+                return frame
+
+            # every frame read so far has been handled. give the other
+            # green threads a turn before reading again, as a read which
+            # finds bytes waiting never yields to them - so this is once
+            # per read rather than once per frame.
+            self._reclaim_buffer()
+            self.async_adapter.sleep()
+            if not self._recv_into_buffer():
+                raise NoFrameReturnedError()
+            self._parse_buffered_frames()
+
+    def _next_frame(self):
+        """ Return the next WAMP carrying (or Close) frame of those parsed
+        from the receive buffer, handling any Pings and Pongs and
+        fragments on the way, else ``None`` once they have all gone.
+        """
+        while True:
+            if not self._received_frames:
+                return None
+
+            frame = self._received_frames.popleft()
+
+            # non WAMP-handled opcides
+            if frame.opcode == frame.OPCODE_PING:
+                # Opcode 0x9 marks a ping frame. It does not contain wamp
+                # data, so the frame is not returned.
+                # Still it must be handled or the server will close the
+                # connection.
+                self.handle_ping(ping_frame=frame)
+                continue
+            if frame.opcode == frame.OPCODE_PONG:
+                self.handle_pong(pong_frame=frame)
+                continue
+            if frame.opcode == frame.OPCODE_CLOSE:
+                self.handle_close(close_frame=frame)
+            elif (
+                not frame.fin_bit or frame.opcode == frame.OPCODE_CONT or
+                self._fragments is not None
+            ):
+                frame = self._reassemble(frame)
+                if frame is None:
+                    # the last fragment is still to come
+                    continue
 
-        if frame is None:
-            raise NoFrameReturnedError()
+            break
 
         if frame.opcode not in (
             frame.OPCODE_TEXT, frame.OPCODE_CLOSE, frame.OPCODE_BINARY
@@ -143,9 +443,149 @@ class WebSocket(Transport, ParseUrlMixin):
                 f"Non Text frame returned: {frame.opcode}"
             )
 
-        logger.info(f"returning {frame.opcode}")
+        if frame.rsv1:
+            frame = self._inflate(frame)
+
+        logger.debug("returning %s", frame.opcode)
         return frame
 
+    def _inflate(self, frame):
+        if self._deflater is None or frame.opcode == frame.OPCODE_CLOSE:
+            raise WebsocktProtocolError(
+                "compressed frame, but compression was not agreed"
+            )
+
+        return frame.__class__(
+            raw_bytes=frame.frame,
+            payload=self._deflater.decompress(
+                frame.payload_bytes, max_length=self.max_message_size,
+            ),
+            opcode=frame.opcode,
+        )
+
+    def _reassemble(self, frame):
+        """ Add a fragment to the message being received, returning the
+        whole message as one frame once its last fragment is in, else
+        ``None``.
+        """
+        if frame.opcode == frame.OPCODE_CONT:
+            if self._fragments is None:
+                raise WebsocktProtocolError(
+                    "continuation frame, but no message to continue"
+                )
+        elif self._fragments is not None:
+            raise WebsocktProtocolError(
+                "new message, but the last was not finished"
+            )
+        else:
+            # the first fragment has the opcode, and RSV1 if compressed
+            self._fragmented = frame.frame[0] | 0x80, frame.__class__
+            self._fragments = bytearray()
+
+        # a fragment is a view over the receive buffer, which is reused
+        # for the next read, so its payload is copied out
+        payload = frame.payload_bytes
+        if (
+            self.max_message_size is not None and
+            len(self._fragments) + len(payload) > self.max_message_size
+        ):
+            raise WebsocktProtocolError(
+                "fragmented message is larger than the {} bytes "
+                "allowed".format(self.max_message_size)
+            )
+        self._fragments += payload
+
+        if not frame.fin_bit:
+            return None
+
+        (first_byte, frame_cls), self._fragmented = self._fragmented, None
+        fragments, self._fragments = self._fragments, None
+
+        return frame_cls(
+            raw_bytes=bytes((first_byte, 0)), payload=memoryview(fragments),
+            opcode=first_byte & 0xf,
+        )
+
+    def _recv_into_buffer(self):
+        """ Read as many bytes as the socket has ready, up to the free
+        space in the receive buffer. Returns the number of bytes read,
+        where 0 means the connection has gone.
+        """
+        if self._buffer_end == len(self._receive_buffer):
+            self._make_room_in_buffer()
+
+        try:
+            received = self.socket.recv_into(
+                self._receive_view[self._buffer_end:]
+            )
+        except socket.timeout as e:
+            message = str(e)
+            raise ConnectionError('timeout: "{}"'.format(message))
+        except OSError:
+            logger.info("socket connection lost? Bad File Descriptor?")
+            return 0
+        except Exception as exc:
+            raise ConnectionError('Connection lost: "{}"'.format(exc))
+
+        self._buffer_end += received
+        return received
+
+    def _make_room_in_buffer(self):
+        pending = self._buffer_end - self._buffer_start
+        # the parser knows the size of the frame in flight once it has seen
+        # its header, so a large frame gets a buffer it fits in one go
+        # rather than one grown piecemeal
+        wanted = pending + self._frame_parser.required_bytes
+
+        if wanted <= len(self._receive_buffer):
+            # shuffle the start of an incomplete frame to the front of the
+            # buffer. the source and destination may overlap, hence the
+            # copy, and this is a same-size slice assignment so the buffer
+            # is never resized underneath our memoryview.
+            self._receive_buffer[:pending] = bytes(
+                self._receive_view[self._buffer_start:self._buffer_end]
+            )
+        else:
+            receive_buffer = bytearray(
+                max(wanted, 2 * len(self._receive_buffer))
+            )
+            receive_buffer[:pending] = (
+                self._receive_view[self._buffer_start:self._buffer_end]
+            )
+            self._receive_buffer = receive_buffer
+            self._receive_view = memoryview(receive_buffer)
+
+        self._buffer_start = 0
+        self._buffer_end = pending
+
+    def _parse_buffered_frames(self):
+        """ Parse every complete frame in the receive buffer, leaving
+        behind the bytes of any incomplete frame for the next read.
+        """
+        parser = self._frame_parser
+        view = self._receive_view
+
+        while self._buffer_start < self._buffer_end:
+            frame = parser.parse(view[self._buffer_start:self._buffer_end])
+            if frame is None:
+                break
+
+            self._buffer_start += len(frame.frame)
+            self._received_frames.append(frame)
+
+    def _reclaim_buffer(self):
+        """ Start again from the front of the receive buffer if every byte
+        in it has been parsed. Only called once every frame parsed from it
+        has been returned, as they are views over it.
+        """
+        if self._buffer_start == self._buffer_end:
+            self._buffer_start = self._buffer_end = 0
+
+            if len(self._receive_buffer) > self.receive_buffer_size:
+                # give back the memory taken by an unusually large frame
+                self._receive_buffer = bytearray(self.receive_buffer_size)
+                self._receive_view = memoryview(self._receive_buffer)
+
     def _connect(self):
         if self.ipv == 4:
             _socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -190,13 +630,33 @@ class WebSocket(Transport, ParseUrlMixin):
         self.socket.send(handshake.encode())
 
         try:
-            with async_adapter.Timeout(5):
+            with self.async_adapter.Timeout(5):
                 self.status, self.headers = self._read_handshake_response()
         except WampyTimeOut:
             raise WampyError(
                 'No response after handshake "{}"'.format(handshake)
             )
 
+        self._check_handshake(upgrade)
+
+    def _check_handshake(self, upgrade):
+        # that the Router agreed to what we asked for
+        if upgrade:
+            subprotocol = self.headers.get('sec-websocket-protocol')
+            if subprotocol != self.serializer.SUBPROTOCOL:
+                raise WampyError(
+                    'the Router will not talk "{}": it agreed to "{}"'.format(
+                        self.serializer.SUBPROTOCOL, subprotocol,
+                    )
+                )
+
+            if self.compression is not None:
+                extensions = self.headers.get('sec-websocket-extensions')
+                if extensions:
+                    self._deflater = self.compression.accept(extensions)
+                else:
+                    logger.warning("the Router declined compression")
+
         logger.debug("connection upgraded")
 
     def _get_handshake_headers(self, upgrade):
@@ -207,7 +667,7 @@ class WebSocket(Transport, ParseUrlMixin):
         a browser. Maybe a reasonable assumption once upon a time...
 
         The headers here will go a little further and also agree the
-        WAMP websocket JSON subprotocols.
+        WAMP websocket subprotocol, i.e. the serialization of messages.
 
         """
         headers = []
@@ -227,9 +687,14 @@ class WebSocket(Transport, ParseUrlMixin):
 
         if upgrade:
             headers.append("Sec-WebSocket-Protocol: {}".format(
-                WEBSOCKET_SUBPROTOCOLS)
+                self.serializer.SUBPROTOCOL)
             )
 
+            if self.compression is not None:
+                headers.append("Sec-WebSocket-Extensions: {}".format(
+                    self.compression.offer())
+                )
+
         logger.debug("connection headers: %s", headers)
 
         return headers
@@ -237,9 +702,6 @@ class WebSocket(Transport, ParseUrlMixin):
     def _read_handshake_response(self):
         # each header ends with \r\n and there's an extra \r\n after the last
         # one
-        status = None
-        headers = {}
-
         def read_line():
             bytes_cache = []
             received_bytes = None
@@ -248,12 +710,21 @@ class WebSocket(Transport, ParseUrlMixin):
                 bytes_cache.append(received_bytes)
             return b''.join(bytes_cache)
 
+        lines = []
         while True:
             received_bytes = read_line()
             if received_bytes == b'\r\n':
                 # end of the response
                 break
+            lines.append(received_bytes)
 
+        return self._parse_handshake_response(lines)
+
+    def _parse_handshake_response(self, lines):
+        status = None
+        headers = {}
+
+        for received_bytes in lines:
             bytes_as_str = received_bytes.decode()
             line = bytes_as_str.strip()
 
@@ -286,7 +757,7 @@ class WebSocket(Transport, ParseUrlMixin):
     def start_pinging(self):
 
         def websocket_ping_thread(socket):
-            s = sched.scheduler(time, async_adapter.sleep)
+            s = sched.scheduler(time, self.async_adapter.sleep)
 
             def send_ping_and_expect_pong():
                 payload = 'wampy::' + str(uuid.uuid4())
@@ -294,9 +765,11 @@ class WebSocket(Transport, ParseUrlMixin):
                 # a Pong back echoing the same payload - but within the
                 # deadline of ``heartbeat_timeout_seconds``.
                 ping = Ping(payload=payload, mask_payload=True)
+                pong_received = self.async_adapter.Event()
+                self._awaited_pongs[payload.encode('utf-8')] = pong_received
 
                 try:
-                    socket.sendall(bytes(ping.frame))
+                    self._send_raw(ping.frame)
                 except OSError:
                     # connection closed by parent thread, or wampy
                     # has been disconnected from server...
@@ -309,36 +782,16 @@ class WebSocket(Transport, ParseUrlMixin):
                     logger.info('server ripped out from under us!')
                     pass
 
-                pong = None
-
-                with async_adapter.Timeout(
-                    heartbeat_timeout, raise_after=False
-                ):
-                    while pong is None:
-                        async_adapter.sleep()
-
-                        try:
-                            maybe_my_pong = self.pongs.get(block=False)
-                        except async_adapter.QueueEmpty:
-                            continue
-
-                        if maybe_my_pong:
-                            if maybe_my_pong.payload == payload:
-                                pong = maybe_my_pong
-                            else:
-                                # possibly Pinging faster than the server is
-                                # Ponging, else Hub hasn't scheduled the right
-                                # gthread yet.
-                                logger.error('Pongs out of order?')
-                                self.pongs.put(maybe_my_pong)
-
-                if pong is None:
-                    logger.info('missed a Pong from the server')
-                    self.missed_pongs += 1
+                try:
+                    if not pong_received.wait(heartbeat_timeout):
+                        logger.info('missed a Pong from the server')
+                        self.missed_pongs += 1
+                finally:
+                    self._awaited_pongs.pop(payload.encode('utf-8'), None)
 
             def pinger(sc):
                 # do i need to spawn here???
-                async_adapter.spawn(send_ping_and_expect_pong)
+                self.async_adapter.spawn(send_ping_and_expect_pong)
                 s.enter(heartbeat, 1, pinger, (sc,))
 
             s.enter(heartbeat, 1, pinger, (s,))
@@ -347,18 +800,26 @@ class WebSocket(Transport, ParseUrlMixin):
             # seconds, i.e. *not* immediatly
             s.run()
 
-        self.pinger_thread = async_adapter.spawn(
+        self.pinger_thread = self.async_adapter.spawn(
             websocket_ping_thread, self.socket
         )
         self.is_pinging = True
 
     def handle_ping(self, ping_frame):
-        pong_frame = Pong(payload=ping_frame.payload)
+        # the payload is echoed back as is, and need not be text
+        pong_frame = Pong(payload=bytes(ping_frame.payload_bytes))
         bytes_ = pong_frame.frame
         self._send_raw(bytes_)
 
     def handle_pong(self, pong_frame):
-        self.pongs.put(pong_frame)
+        pong_received = self._awaited_pongs.pop(
+            bytes(pong_frame.payload_bytes), None,
+        )
+        if pong_received is None:
+            # unsolicited, or too late
+            logger.debug("dropping Pong: %s", pong_frame.payload_bytes)
+        else:
+            pong_received.set()
 
     def stop_pinging(self):
         try:
@@ -376,8 +837,10 @@ class WebSocket(Transport, ParseUrlMixin):
 
 
 class SecureWebSocket(WebSocket):
-    def __init__(self, server_url, certificate_path, ipv=4):
-        super(SecureWebSocket, self).__init__(server_url=server_url, ipv=ipv)
+    def __init__(self, server_url, certificate_path, ipv=4, **kwargs):
+        super(SecureWebSocket, self).__init__(
+            server_url=server_url, ipv=ipv, **kwargs
+        )
 
         # PROTOCOL_TLSv1_1 and PROTOCOL_TLSv1_2 are only available if Python is
         # linked with OpenSSL 1.0.1 or later.
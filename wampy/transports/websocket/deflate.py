@@ -0,0 +1,278 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+""" The permessage-deflate WebSocket extension, RFC 7692.
+
+Compression is offered to the Router in the opening handshake and, if it
+agrees, messages of at least ``threshold`` bytes are deflated before they
+are framed, and compressed frames from the Router (marked by the RSV1
+bit) are inflated before they are deserialized.
+
+By default the sliding window - the "context" - of each direction is
+kept from message to message, which is what makes repetitive messages,
+e.g. a stream of similar EVENTs, compress so well.
+
+"""
+import logging
+import zlib
+
+from wampy.constants import WEBSOCKET_DEFLATE_THRESHOLD
+from wampy.errors import WampyError, WebsocktProtocolError
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_NAME = 'permessage-deflate'
+
+# appended by a sync flush, left off the wire and put back to inflate
+TAIL = b'\x00\x00\xff\xff'
+
+MIN_WINDOW_BITS = 8
+MAX_WINDOW_BITS = 15
+# zlib will not make raw deflate streams with a window of 8 bits, so
+# outgoing messages are never compressed with less than this
+MIN_CLIENT_WINDOW_BITS = 9
+
+
+def _window_bits(name, value, minimum=MIN_WINDOW_BITS):
+    try:
+        bits = int(value.strip('"'))
+    except (AttributeError, ValueError):
+        bits = None
+
+    if bits is None or not minimum <= bits <= MAX_WINDOW_BITS:
+        raise WampyError(
+            "permessage-deflate {} must be {} to {}, not {}".format(
+                name, minimum, MAX_WINDOW_BITS, value,
+            )
+        )
+
+    return bits
+
+
+class PerMessageDeflate(object):
+
+    def __init__(
+        self, client_max_window_bits=None, server_max_window_bits=None,
+        client_no_context_takeover=False, server_no_context_takeover=False,
+        threshold=WEBSOCKET_DEFLATE_THRESHOLD,
+        level=zlib.Z_DEFAULT_COMPRESSION,
+    ):
+        """ Ask for the WebSocket to be compressed.
+
+        Pass an instance to a ``Client`` as its ``compression``.
+
+        :Parameters:
+            client_max_window_bits : int
+                The largest window, as a power of 2 from 9 to 15, to
+                compress outgoing messages with. The Router may ask for
+                a smaller one - and should it ask for 8, which ``zlib``
+                cannot compress with, they are sent uncompressed.
+                Defaults to 15.
+            server_max_window_bits : int
+                Ask the Router to compress with a window no larger.
+            client_no_context_takeover : bool
+                Compress each outgoing message afresh, trading size for
+                the memory to keep the window.
+            server_no_context_takeover : bool
+                Ask the Router to do the same.
+            threshold : int
+                Messages smaller than this many bytes are sent as they
+                are. Defaults to ``WEBSOCKET_DEFLATE_THRESHOLD``.
+            level : int
+                The ``zlib`` compression level.
+
+        """
+        if client_max_window_bits is not None:
+            _window_bits(
+                'client_max_window_bits', str(client_max_window_bits),
+                minimum=MIN_CLIENT_WINDOW_BITS,
+            )
+        if server_max_window_bits is not None:
+            _window_bits('server_max_window_bits', str(server_max_window_bits))
+
+        self.client_max_window_bits = client_max_window_bits
+        self.server_max_window_bits = server_max_window_bits
+        self.client_no_context_takeover = client_no_context_takeover
+        self.server_no_context_takeover = server_no_context_takeover
+        self.threshold = threshold
+        self.level = level
+
+    def offer(self):
+        """ Return the value of the ``Sec-WebSocket-Extensions`` header
+        that offers compression to the Router.
+        """
+        params = [EXTENSION_NAME]
+
+        if self.client_max_window_bits is None:
+            # i.e. we'll go along with whatever the Router asks for
+            params.append('client_max_window_bits')
+        else:
+            params.append(
+                'client_max_window_bits={}'.format(self.client_max_window_bits)
+            )
+        if self.server_max_window_bits is not None:
+            params.append(
+                'server_max_window_bits={}'.format(self.server_max_window_bits)
+            )
+        if self.client_no_context_takeover:
+            params.append('client_no_context_takeover')
+        if self.server_no_context_takeover:
+            params.append('server_no_context_takeover')
+
+        return '; '.join(params)
+
+    def accept(self, response):
+        """ Return a ``Deflater`` for the compression that the Router
+        agreed to in its ``Sec-WebSocket-Extensions`` header, or raise
+        ``WampyError`` if it is not what was offered.
+        """
+        name, _, params = response.partition(';')
+        if name.strip().lower() != EXTENSION_NAME or ',' in params:
+            raise WampyError(
+                "the Router agreed to unexpected WebSocket extensions: "
+                "{}".format(response)
+            )
+
+        client_max_window_bits = self.client_max_window_bits or MAX_WINDOW_BITS
+        client_no_context_takeover = self.client_no_context_takeover
+        server_no_context_takeover = False
+        seen = set()
+
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            key = key.strip().lower()
+            if not key:
+                continue
+
+            if key in seen:
+                raise WampyError(
+                    "permessage-deflate {} given twice".format(key)
+                )
+            seen.add(key)
+
+            if key == 'client_max_window_bits':
+                client_max_window_bits = min(
+                    client_max_window_bits, _window_bits(key, value),
+                )
+            elif key == 'server_max_window_bits':
+                # checked, but we can inflate anything with a full window
+                bits = _window_bits(key, value)
+                if (
+                    self.server_max_window_bits is not None and
+                    bits > self.server_max_window_bits
+                ):
+                    raise WampyError(
+                        "the Router wants a window of {} bits, more than "
+                        "the {} asked for".format(
+                            bits, self.server_max_window_bits,
+                        )
+                    )
+            elif key == 'client_no_context_takeover':
+                client_no_context_takeover = True
+            elif key == 'server_no_context_takeover':
+                server_no_context_takeover = True
+            else:
+                raise WampyError(
+                    "unknown permessage-deflate parameter: {}".format(key)
+                )
+
+        if (
+            self.server_no_context_takeover and
+            not server_no_context_takeover
+        ):
+            raise WampyError(
+                "the Router did not agree to server_no_context_takeover"
+            )
+
+        logger.info("WebSocket compression agreed: %s", response)
+        if client_max_window_bits < MIN_CLIENT_WINDOW_BITS:
+            # a larger window than agreed is not allowed, but sending
+            # messages uncompressed is
+            logger.warning(
+                "cannot compress with a window of %s bits: outgoing "
+                "messages will not be compressed", client_max_window_bits,
+            )
+            client_max_window_bits = None
+
+        return Deflater(
+            window_bits=client_max_window_bits,
+            no_context_takeover=client_no_context_takeover,
+            inflate_no_context_takeover=server_no_context_takeover,
+            threshold=self.threshold,
+            level=self.level,
+        )
+
+
+class Deflater(object):
+    """ The compression agreed for a single connection, with the
+    ``zlib`` compressor and decompressor reused for every message unless
+    their context is not to be taken over.
+
+    Without ``window_bits``, incoming messages are inflated but outgoing
+    ones are never compressed.
+
+    """
+
+    def __init__(
+        self, window_bits, no_context_takeover, inflate_no_context_takeover,
+        threshold, level,
+    ):
+        self.window_bits = window_bits
+        self.no_context_takeover = no_context_takeover
+        self.inflate_no_context_takeover = inflate_no_context_takeover
+        self.threshold = threshold
+        self.level = level
+
+        self._compressor = (
+            None if window_bits is None else self._make_compressor()
+        )
+        self._decompressor = zlib.decompressobj(-MAX_WINDOW_BITS)
+
+    def worth_compressing(self, payload):
+        return self.window_bits is not None and len(payload) >= self.threshold
+
+    def _make_compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, -self.window_bits)
+
+    def compress(self, payload):
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        compressor = self._compressor
+        if self.no_context_takeover:
+            self._compressor = self._make_compressor()
+
+        compressed = (
+            compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+        return compressed[:-len(TAIL)]
+
+    def decompress(self, payload, max_length=None):
+        """ Inflate a message, raising ``WebsocktProtocolError`` should
+        it come to more than ``max_length`` bytes - which stops a small
+        message inflating into a huge one.
+        """
+        decompressor = self._decompressor
+        if self.inflate_no_context_takeover:
+            self._decompressor = zlib.decompressobj(-MAX_WINDOW_BITS)
+
+        try:
+            # a byte beyond ``max_length`` is enough to know it is too
+            # long, and 0 is no limit at all
+            inflated = decompressor.decompress(
+                bytes(payload) + TAIL,
+                0 if max_length is None else max_length + 1,
+            )
+        except zlib.error as exc:
+            raise WebsocktProtocolError(
+                "cannot inflate a compressed message: {}".format(exc)
+            )
+
+        if max_length is not None and len(inflated) > max_length:
+            raise WebsocktProtocolError(
+                "compressed message inflates to more than the {} bytes "
+                "allowed".format(max_length)
+            )
+
+        return inflated
@@ -2,14 +2,18 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-import array
 import logging
 import os
-import struct
-from struct import pack, unpack_from
+from struct import pack_into, unpack_from
 
 from wampy.errors import WebsocktProtocolError, IncompleteFrameError
 
+try:
+    # optional C extension, e.g. ``pip install wsaccel``
+    from wsaccel.xormask import XorMaskerSimple
+except ImportError:
+    XorMaskerSimple = None
+
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +26,11 @@ class Frame(object):
     bytes (due to the fact that the protocol allows for a 63bit length
     indicator).
 
-    The primary purpose of fragmentation is to allow sending a message
-    that is of unknown size when the message is started without having
-    to buffer that message - it is *not* supported by wampy.
+    A message may be fragmented over many frames: the first has the
+    message's opcode, the rest are continuation frames, and the last has
+    the FIN bit set. Control frames may come in between fragments, but
+    are never fragmented themselves. The ``WebSocket`` puts messages back
+    together again, see ``wampy.transports.websocket.connection``.
 
     This is how a websocket frame looks according to RFC 6455
 
@@ -114,14 +120,22 @@ class Frame(object):
     LENGTH_16 = 1 << 16  # 0x10000, 65536, 10000000000000000
     MAX_LENGTH = 1 << 63  # 1 x 2**63
 
-    def __init__(self, raw_bytes, payload=None):
-        """ Represent a complete websocket frame """
+    __slots__ = ('_raw_bytes', '_payload', 'opcode')
+
+    def __init__(self, raw_bytes, payload=None, opcode=None):
+        """ Represent a complete websocket frame.
+
+        A ``FrameParser`` has already read the header, so it passes in
+        the ``opcode`` and the ``payload`` (a view over ``raw_bytes``)
+        rather than have them worked out again here.
+
+        """
         self._raw_bytes = raw_bytes
         self._payload = payload
 
-        self.fin_bit = self._raw_bytes[0] >> 7
-        self.opcode = self._raw_bytes[0] & 0xf
-        self.payload_length_indicator = self._raw_bytes[1] & 0b1111111
+        if opcode is None:
+            opcode = raw_bytes[0] & 0xf
+        self.opcode = opcode
 
     def __str__(self):
         return self.payload
@@ -130,109 +144,232 @@ class Frame(object):
     def frame(self):
         return self._raw_bytes
 
+    @property
+    def fin_bit(self):
+        return self._raw_bytes[0] >> 7
+
+    @property
+    def rsv1(self):
+        # set on compressed messages, see websocket.deflate
+        return (self._raw_bytes[0] >> 6) & 1
+
+    @property
+    def payload_length_indicator(self):
+        return self._raw_bytes[1] & 0b1111111
+
+    @property
+    def payload_bytes(self):
+        if self._payload is not None:
+            return self._payload
+        elif self.payload_length_indicator < 126:
+            return self._raw_bytes[2:]
+        elif self.payload_length_indicator == 126:
+            return self._raw_bytes[4:]
+        return self._raw_bytes[10:]
+
     @property
     def payload(self):
+        payload_bytes = self.payload_bytes
+
         try:
-            if self._payload:
-                payload_str = self._payload.decode('utf-8')
-            elif self.payload_length_indicator < 126:
-                payload_str = self._raw_bytes[2:].decode('utf-8')
-            elif self.payload_length_indicator == 126:
-                payload_str = self._raw_bytes[4:].decode('utf-8')
-            else:
-                payload_str = self._raw_bytes[6:].decode('utf-8')
+            # ``str`` rather than ``decode`` so that a ``memoryview`` over
+            # a receive buffer can be decoded without first copying it
+            payload_str = str(payload_bytes, 'utf-8')
         except UnicodeDecodeError:
-            logger.error('cannot decode %s', self.raw_bytes)
+            logger.error('cannot decode %s', bytes(self._raw_bytes))
             raise
 
         return payload_str
 
 
-class FrameFactory(object):
+class FrameParser(object):
+    """ Incrementally parse the frames sent by a server.
 
-    @classmethod
-    def from_bytes(cls, buffered_bytes):
+    The header of a frame is parsed only once, recording the length of
+    the payload to expect, and from then on ``parse`` just waits until
+    the whole frame is available. Nothing is sliced or copied while
+    waiting, so receiving a very large frame over many reads is linear
+    in its size.
+
+    Data frames are returned as ``memoryview`` objects over the bytes
+    given to ``parse``, i.e. the payload is never copied. These are only
+    valid until those bytes are reused, e.g. by the next read into a
+    receive buffer. Control frames are tiny and are copied so that they
+    can be handled later, e.g. a Pong matched against its Ping.
+
+    """
+
+    def __init__(self, max_payload_length=None):
+        """
+        :Parameters:
+            max_payload_length : int
+                Raise ``WebsocktProtocolError`` as soon as the header of
+                a larger frame is seen, rather than buffer it. Defaults
+                to ``None``, i.e. no limit.
+
+        """
+        self.max_payload_length = max_payload_length
+        self.reset()
+
+    def reset(self):
+        self.opcode = None
+        self.header_length = None
+        self.payload_length = None
+        # the minimum number of further bytes needed to make progress
+        self.required_bytes = 2
+
+    @property
+    def frame_length(self):
+        if self.header_length is None:
+            return None
+        return self.header_length + self.payload_length
+
+    def parse(self, buffered_bytes):
+        """ Parse the frame at the start of ``buffered_bytes``.
+
+        :Parameters:
+            buffered_bytes : bytes-like
+                Bytes from the server starting at the first byte of the
+                frame. Any bytes after the frame are ignored.
+
+        :Returns:
+            The complete ``Frame`` or ``None`` if more bytes are needed,
+            in which case ``required_bytes`` says at least how many.
+
+        """
+        available = len(buffered_bytes)
+
+        if self.header_length is None:
+            if not self._parse_header(buffered_bytes, available):
+                return None
+
+        frame_length = self.header_length + self.payload_length
+        if available < frame_length:
+            self.required_bytes = frame_length - available
+            return None
+
+        frame = self._make_frame(buffered_bytes, frame_length)
+        self.reset()
+        return frame
+
+    def _parse_header(self, buffered_bytes, available):
         # the first 2 bytes are *always* used as headers - but sometimes
         # more than 2 bytes are needed.
         # our work must first be to determine the header length.
         # note that here we are reading data from the *server*, so there
         # is *never* a Mask (part of the protocol).
-        if not buffered_bytes or len(buffered_bytes) < 2:
-            raise IncompleteFrameError(required_bytes=1)
+        if available < 2:
+            self.required_bytes = 2 - available
+            return False
 
         opcode = buffered_bytes[0] & 0xf
         if opcode not in Frame.OPCODES:
             raise WebsocktProtocolError('unknown opcode: %s', opcode)
 
-        # binary data interpretation is left up to th application...
-        if opcode == Frame.OPCODE_BINARY:
-            return Frame(raw_bytes=buffered_bytes)
-
-        # Parse the first two buffered_bytes of header
-        fin = buffered_bytes[0] >> 7
-        if fin == 0:
-            raise RuntimeError("Fragmented Frames Not Supported")
+        if buffered_bytes[0] & 0x30:
+            # RSV2 or RSV3, which no extension wampy knows of uses
+            raise WebsocktProtocolError('unexpected RSV bits')
 
         payload_length_indicator = buffered_bytes[1] & 0b1111111
-        if payload_length_indicator == 0:
-            if opcode == Frame.OPCODE_PING:
-                return Ping(raw_bytes=buffered_bytes)
-            elif opcode == Frame.OPCODE_CLOSE:
-                return Close(raw_bytes=buffered_bytes)
-            else:
-                return Frame(raw_bytes=buffered_bytes)
-
-        available_bytes_for_body = buffered_bytes[2:]
-        if len(available_bytes_for_body) < 2:
-            raise IncompleteFrameError(
-                required_bytes=payload_length_indicator
-            )
 
-        # unpack the buffered buffered_bytes into an integer
-        body_length = unpack_from(">h", available_bytes_for_body)[0]
+        if opcode in Frame.CONTROL_FRAMES and (
+            not buffered_bytes[0] & 0x80 or payload_length_indicator > 125
+        ):
+            raise WebsocktProtocolError(
+                'control frames must be unfragmented and at most 125 bytes'
+            )
 
         if payload_length_indicator < 126:
             # then we have enough knowlege about the payload length as it's
             # contained within the 2nd byte of the header - because the
             # trailing 7 bits of the 2 buffered_bytes tells us exactly how long
             # the payload is
-            body_candidate = available_bytes_for_body
-            # in this case body length is represented by the indicator
-            body_length = payload_length_indicator
+            header_length = 2
+            payload_length = payload_length_indicator
 
         elif payload_length_indicator == 126:
             # This is a case where more than 2 bytes are needed for headers.
-            # "Extended payload" length is now used
-            # meaning that we can chop another 2 bytes off from our
-            # `available_bytes_for_body` and be confident that we are left with
-            # the payload
-            body_candidate = available_bytes_for_body[2:]  # require >= 2 bytes
+            # "Extended payload" length is now used, an unsigned 16 bit int.
+            header_length = 4
+            if available < header_length:
+                self.required_bytes = header_length - available
+                return False
+            payload_length = unpack_from("!H", buffered_bytes, 2)[0]
 
-        elif payload_length_indicator == 127:
+        else:
             # This is a case where more than 2 bytes are needed for headers.
-            # "Extended payload length continued" length is now used
-            # chop off Extended Payload bytes
-            body_candidate = available_bytes_for_body[8:]  # require >= 8 bytes
-            # in this case, we know that there are more bytes to receive
-            body_length = struct.unpack("!Q", buffered_bytes[2:10])[0]
-
-        if len(body_candidate) < body_length:
-            required_bytes = body_length - len(body_candidate)
-            logger.debug("missing %s buffered_bytes", required_bytes)
-            raise IncompleteFrameError(
-                required_bytes=required_bytes
+            # "Extended payload length continued" length is now used,
+            # an unsigned 64 bit int.
+            header_length = 10
+            if available < header_length:
+                self.required_bytes = header_length - available
+                return False
+            payload_length = unpack_from("!Q", buffered_bytes, 2)[0]
+
+        if (
+            self.max_payload_length is not None and
+            payload_length > self.max_payload_length
+        ):
+            raise WebsocktProtocolError(
+                'frame of {} bytes is larger than the {} allowed'.format(
+                    payload_length, self.max_payload_length,
+                )
             )
 
-        if opcode == Frame.OPCODE_PING:
-            return Ping(raw_bytes=buffered_bytes)
+        self.opcode = opcode
+        self.header_length = header_length
+        self.payload_length = payload_length
+        return True
+
+    def _make_frame(self, buffered_bytes, frame_length):
+        opcode = self.opcode
+
+        if opcode in Frame.CONTROL_FRAMES:
+            raw_bytes = bytes(buffered_bytes[:frame_length])
+
+            if opcode == Frame.OPCODE_PING:
+                return Ping(raw_bytes=raw_bytes)
+
+            if opcode == Frame.OPCODE_PONG:
+                return Pong(raw_bytes=raw_bytes)
+
+            return Close(raw_bytes=raw_bytes)
+
+        raw_bytes = memoryview(buffered_bytes)[:frame_length]
+        frame_cls = Binary if opcode == Frame.OPCODE_BINARY else Frame
+
+        return frame_cls(
+            raw_bytes=raw_bytes, payload=raw_bytes[self.header_length:],
+            opcode=opcode,
+        )
+
 
-        if opcode == Frame.OPCODE_PONG:
-            return Pong(raw_bytes=buffered_bytes)
+class FrameFactory(object):
+
+    @classmethod
+    def from_bytes(cls, buffered_bytes):
+        """ Parse the first complete frame from ``buffered_bytes``.
 
-        if opcode == Frame.OPCODE_CLOSE:
-            return Close(raw_bytes=buffered_bytes)
+        ``buffered_bytes`` may hold more than one frame, e.g. a slice of
+        a receive buffer, and only the bytes of the first frame are
+        taken, so ``len(frame.frame)`` is the number of bytes consumed.
+        See ``FrameParser`` for parsing a stream of frames.
+
+        :Raises:
+            IncompleteFrameError
+                When the first frame is not yet complete. The exception
+                reports how many more bytes are needed at a minimum.
+
+        """
+        parser = FrameParser()
+        frame = parser.parse(buffered_bytes)
+        if frame is None:
+            logger.debug("missing %s buffered_bytes", parser.required_bytes)
+            raise IncompleteFrameError(
+                required_bytes=parser.required_bytes
+            )
 
-        return Frame(raw_bytes=buffered_bytes, payload=body_candidate)
+        return frame
 
     @classmethod
     def generate_mask(cls, mask_key, data):
@@ -241,8 +378,8 @@ class FrameFactory(object):
         :Parameters:
             mask_key: byte string
                 4 byte string(byte), e.g. '\x10\xc6\xc4\x16'
-            data: str
-                data to mask
+            data: str or bytes
+                data to mask. ``str`` is UTF-8 encoded first.
 
         """
         # Masking of WebSocket traffic from client to server is required
@@ -253,22 +390,107 @@ class FrameFactory(object):
         # for browser vendors to get twitchy, masking was added to remove
         # the possibility of it being used as an attack.
         if data is None:
-            data = ""
+            data = b""
+        elif isinstance(data, str):
+            data = data.encode('utf-8')
 
-        data = bytearray(data, 'utf-8')
+        if XorMaskerSimple is not None:
+            return XorMaskerSimple(mask_key).process(data)
 
-        _m = array.array("B", mask_key)
-        _d = array.array("B", data)
+        length = len(data)
+        if length == 0:
+            return b""
 
-        for i in range(len(_d)):
-            _d[i] ^= _m[i % 4]
-
-        return _d.tobytes()
+        # rather than XOR byte by byte in the interpreter, repeat the key
+        # to the length of the data and XOR the two as (very) big integers,
+        # which CPython does a machine word at a time.
+        mask = (mask_key * (length // 4 + 1))[:length]
+        masked = int.from_bytes(data, 'big') ^ int.from_bytes(mask, 'big')
+        return masked.to_bytes(length, 'big')
 
     @classmethod
-    def generate_bytes(cls, payload, fin_bit, opcode, mask_payload):
+    def generate_bytes(cls, payload, fin_bit, opcode, mask_payload, rsv1=0):
         """ Format data to string (buffered_bytes) to send to server.
+
+        The payload is UTF-8 encoded (if it is a ``str``) exactly once and
+        the header, mask key and masked payload are all written into a
+        single ``bytearray`` of exactly the right size, which is ready to
+        be handed to ``socket.sendall``.
+
+        """
+        payload = cls._encode_payload(payload)
+        length = len(payload)
+        header_length = cls._header_length(length)
+
+        mask_key_length = 4 if mask_payload else 0
+        payload_start = header_length + mask_key_length
+        frame = bytearray(payload_start + length)
+
+        cls._pack_header(frame, length, fin_bit, opcode, mask_payload, rsv1)
+
+        if mask_payload:
+            # we always mask frames from the client to server
+            # use a string of n random buffered_bytes for the mask
+            mask_key = os.urandom(4)
+            frame[header_length:payload_start] = mask_key
+            frame[payload_start:] = cls.generate_mask(
+                mask_key=mask_key, data=payload,
+            )
+        else:
+            frame[payload_start:] = payload
+
+        return frame
+
+    @classmethod
+    def generate_parts(cls, payload, fin_bit, opcode, mask_payload, rsv1=0):
+        """ Like ``generate_bytes``, but return the header (including
+        any mask key) and the payload as two separate buffers for a
+        vectored write, so that a large payload is never copied just to
+        put a few header bytes in front of it.
+
+        An unmasked payload is returned as given, without any copy.
+
         """
+        payload = cls._encode_payload(payload)
+        length = len(payload)
+        header_length = cls._header_length(length)
+
+        mask_key_length = 4 if mask_payload else 0
+        header = bytearray(header_length + mask_key_length)
+
+        cls._pack_header(header, length, fin_bit, opcode, mask_payload, rsv1)
+
+        if mask_payload:
+            mask_key = os.urandom(4)
+            header[header_length:] = mask_key
+            payload = cls.generate_mask(mask_key=mask_key, data=payload)
+
+        return header, payload
+
+    @staticmethod
+    def _encode_payload(payload):
+        if payload is None:
+            return b""
+        if isinstance(payload, str):
+            # note that we ensure that the payload is utf-8 encoded before we
+            # take the length because unicode characters can be >1 bytes in
+            # length and lead to bugs if we just do ``len(payload)``.
+            return payload.encode('utf-8')
+        return payload
+
+    @staticmethod
+    def _header_length(length):
+        if length >= Frame.MAX_LENGTH:
+            raise WebsocktProtocolError("data is too long")
+
+        if length < Frame.LENGTH_7:
+            return 2
+        if length < Frame.LENGTH_16:
+            return 4
+        return 10
+
+    @staticmethod
+    def _pack_header(buffer, length, fin_bit, opcode, mask_payload, rsv1=0):
         # the first byte contains the FIN bit, the 3 RSV bits and the
         # 4 opcode bits and for a client will *always* be 1000 0001 (or 129).
         # so we want the first byte to look like...
@@ -280,15 +502,10 @@ class FrameFactory(object):
         # |N|V|V|V|       |
         # | |1|2|3|       |
         # +-+-+-+-+-------+
-        # note that because all RSV bits are zero, we can ignore them
+        # RSV1 is set only on compressed messages, and RSV2 and RSV3 never
 
-        # this shifts each bit into position and bitwise ORs them together,
-        # using the struct module to pack them as incoming network bytes
-        frame = pack(
-            '!B', (
-                (fin_bit << 7) | opcode
-            )
-        )
+        # this shifts each bit into position and bitwise ORs them together
+        buffer[0] = (fin_bit << 7) | (rsv1 << 6) | opcode
 
         # the second byte - and maybe the 7 after this, we'll use to tell
         # the server how long our payload is.
@@ -309,38 +526,22 @@ class FrameFactory(object):
             mask_bit = 1 << 7
         else:
             mask_bit = 0 << 7
-        # next we have to | this bit with the payload length.
-        # note that we ensure that the payload is utf-8 encoded before we take
-        # the length because unicode characters can be >1 bytes in length and
-        # lead to bugs if we just do ``len(payload)``.
-        length = len(payload.encode('utf-8'))
-
-        if length >= Frame.MAX_LENGTH:
-            raise WebsocktProtocolError("data is too long")
 
-        # the second byte contains the payload length and mask
+        # the second byte contains the payload length and mask, using the
+        # struct module to pack any extended length as network bytes
         if length < Frame.LENGTH_7:
             # we can simply represent payload length with first 7 bits
-            frame += pack('!B', (mask_bit | length))
+            buffer[1] = mask_bit | length
         elif length < Frame.LENGTH_16:
-            frame += pack('!B', (mask_bit | 126)) + pack('!H', length)
+            buffer[1] = mask_bit | 126
+            pack_into('!H', buffer, 2, length)
         else:
-            frame += pack('!B', (mask_bit | 127)) + pack('!Q', length)
-
-        if mask_payload:
-            # we always mask frames from the client to server
-            # use a string of n random buffered_bytes for the mask
-            mask_key = os.urandom(4)
-            mask_data = cls.generate_mask(mask_key=mask_key, data=payload)
-            mask = mask_key + mask_data
-            frame += mask
-        else:
-            frame += bytearray(payload, 'utf-8')
-
-        return bytearray(frame)
+            buffer[1] = mask_bit | 127
+            pack_into('!Q', buffer, 2, length)
 
 
 class Text(Frame):
+    __slots__ = ()
 
     def __init__(self, raw_bytes=None, payload=''):
         raw_bytes = raw_bytes or FrameFactory.generate_bytes(
@@ -352,7 +553,19 @@ class Text(Frame):
         super(Text, self).__init__(raw_bytes=raw_bytes)
 
 
+class Binary(Frame):
+    """ A data frame of bytes, e.g. a MessagePack serialized message,
+    whose ``payload`` is returned as is rather than decoded.
+    """
+    __slots__ = ()
+
+    @property
+    def payload(self):
+        return self.payload_bytes
+
+
 class Ping(Frame):
+    __slots__ = ()
 
     def __init__(self, raw_bytes=None, payload='', mask_payload=False):
         raw_bytes = raw_bytes or FrameFactory.generate_bytes(
@@ -365,6 +578,7 @@ class Ping(Frame):
 
 
 class Pong(Frame):
+    __slots__ = ()
 
     def __init__(self, raw_bytes=None, payload=''):
         raw_bytes = raw_bytes or FrameFactory.generate_bytes(
@@ -377,6 +591,7 @@ class Pong(Frame):
 
 
 class Close(Frame):
+    __slots__ = ()
 
     def __init__(self, raw_bytes=None, payload=''):
         raw_bytes = raw_bytes or FrameFactory.generate_bytes(